@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, ServiceProvider
+from .models import Service, User, ServiceProvider
 
 
 @admin.register(User)
@@ -15,5 +15,13 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(ServiceProvider)
 class ServiceProviderAdmin(admin.ModelAdmin):
     list_display = ('company_name', 'contact_person', 'user', 'availability', 'rating', 'total_reviews')
-    list_filter = ('availability',)
+    list_filter = ('availability', 'services')
     search_fields = ('company_name', 'contact_person', 'user__username')
+    filter_horizontal = ('services',)
+
+
+@admin.register(Service)
+class ServiceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'created_at')
+    search_fields = ('name',)
+    prepopulated_fields = {'slug': ('name',)}
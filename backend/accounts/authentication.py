@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import AUTH_HEADER_TYPES, JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.response_cache import bump_generation, get_generation
+from .models import User
+from .principal import Principal
+
+
+def user_generation(user_id):
+    return f'user:{user_id}'
+
+
+def user_cache_key(user_id, version):
+    return f'user:{user_id}:v{version}'
+
+
+def get_cached_user(user_id):
+    """
+    Load a user through a short-lived cache. Entries are stamped with the
+    user's current generation, so bumping it retires every cached copy at
+    once without having to know their keys.
+    """
+    version = get_generation(user_generation(user_id))
+    key = user_cache_key(user_id, version)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user(user_id):
+    bump_generation(user_generation(user_id))
+
+
+def refresh_user(request):
+    """Replace ``request.user`` with a fresh database read, for views that cannot tolerate a cached copy"""
+    invalidate_user(request.user.pk)
+    user = get_cached_user(request.user.pk)
+    request.user = user
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds the caller's principal from the token's
+    claims and serves the user from cache instead of querying on every call.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None:
+            return None
+        user, validated_token = result
+        principal = self.get_principal(user, validated_token)
+        if principal is not None:
+            request._request._principal = principal
+        return user, validated_token
+
+    def get_principal(self, user, validated_token):
+        """The principal carried by the token, unless the user's role has changed since it was issued"""
+        user_type = validated_token.get('user_type')
+        service_provider_id = validated_token.get('service_provider_id')
+        if user_type != user.user_type:
+            return None
+        if user_type == 'service_provider' and service_provider_id is None:
+            return None
+        return Principal(user.pk, user_type, service_provider_id)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class QueryTokenJWTAuthentication(CachedJWTAuthentication):
+    """
+    Also accepts the access token as ``?token=``, for clients such as the
+    browser's EventSource that cannot set an Authorization header.
+    """
+
+    def get_header(self, request):
+        header = super().get_header(request)
+        token = request.query_params.get('token')
+        if header is None and token:
+            header = f'{AUTH_HEADER_TYPES[0]} {token}'.encode(HTTP_HEADER_ENCODING)
+        return header
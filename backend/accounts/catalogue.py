@@ -0,0 +1,39 @@
+"""The service catalogue behind ``ServiceProvider.services``"""
+import re
+
+from django.utils.text import slugify
+
+from .models import Service
+
+
+def parse_services(text):
+    """Distinct service names in a comma, semicolon or line separated list, first spelling wins"""
+    names = {}
+    for name in re.split(r'[,;\n]+', text or ''):
+        name = re.sub(r'\s+', ' ', name).strip(' .-*')
+        slug = slugify(name)[:100]
+        if slug and slug not in names:
+            names[slug] = name[:100]
+    return names
+
+
+def resolve_services(names):
+    """
+    Catalogue entries for ``{slug: name}``, creating the missing ones. Two
+    writers adding the same new service cannot both insert it.
+    """
+    if not names:
+        return []
+    existing = Service.objects.filter(slug__in=names)
+    missing = set(names) - set(existing.values_list('slug', flat=True))
+    if missing:
+        Service.objects.bulk_create(
+            [Service(slug=slug, name=names[slug]) for slug in missing], ignore_conflicts=True,
+        )
+    return list(Service.objects.filter(slug__in=names))
+
+
+def sync_provider_services(service_provider):
+    """Point a provider's catalogue entries at what its services_offered text lists"""
+    service_provider.services.set(resolve_services(parse_services(service_provider.services_offered)))
+    service_provider._stored_services_offered = service_provider.services_offered
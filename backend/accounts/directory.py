@@ -0,0 +1,18 @@
+"""Cache generations of the public service provider directory"""
+from django.db import transaction
+
+from core.response_cache import bump_generation
+
+# Covers every listing page; bumped whenever any listed provider changes
+DIRECTORY_GENERATION = 'provider-directory'
+
+
+def provider_generation(service_provider_id):
+    return f'provider-directory:{service_provider_id}'
+
+
+def invalidate_provider(service_provider_id):
+    # After commit, so a concurrent read cannot re-cache the old row
+    transaction.on_commit(
+        lambda: bump_generation(DIRECTORY_GENERATION, provider_generation(service_provider_id))
+    )
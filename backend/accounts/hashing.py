@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+from core.pools import BoundedProcessPool
+
+password_pool = BoundedProcessPool(
+    'password_hashing',
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+)
+
+
+def verify_password(raw_password, encoded):
+    """Check a password and report whether its hash should be upgraded"""
+    if not check_password(raw_password, encoded):
+        return False, False
+    return True, identify_hasher(encoded).must_update(encoded)
+
+
+async def ahash_password(raw_password):
+    return await password_pool.run(make_password, raw_password)
+
+
+async def averify_password(raw_password, encoded):
+    return await password_pool.run(verify_password, raw_password, encoded)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.test import AsyncClient, override_settings
+
+from accounts import hashing
+from core.metrics import percentile
+from core.pools import BoundedProcessPool
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput through the ASGI handler as the password hashing pool grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', default='user1')
+        parser.add_argument('--password', default='password123')
+        parser.add_argument('--workers', default='1,2,4', help='Comma-separated pool sizes to compare')
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=32)
+
+    def handle(self, *args, **options):
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        self.stdout.write(f"{'workers':>8} {'logins/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for workers in [int(w) for w in options['workers'].split(',')]:
+            pool = BoundedProcessPool('bench_login', max_workers=workers, max_pending=options['requests'])
+            hashing.password_pool = pool
+            try:
+                asyncio.run(self.login(options))  # spawn the workers before timing
+                elapsed, latencies, errors = asyncio.run(self.run(options))
+            finally:
+                pool.shutdown()
+            latencies.sort()
+            self.stdout.write(
+                f"{workers:>8} {options['requests'] / elapsed:>10.1f} "
+                f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {errors:>7}"
+            )
+
+    async def run(self, options):
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        latencies = []
+        errors = 0
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                status = await self.login(options)
+                latencies.append(time.perf_counter() - started)
+                errors += status != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(options['requests'])))
+        return time.perf_counter() - started, latencies, errors
+
+    async def login(self, options):
+        response = await AsyncClient().post(
+            '/api/auth/login/',
+            {'username': options['username'], 'password': options['password']},
+            content_type='application/json',
+        )
+        return response.status_code
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serviceprovider',
+            name='rating_sum',
+            field=models.IntegerField(default=0, help_text='Sum of all review ratings, maintained incrementally'),
+        ),
+    ]
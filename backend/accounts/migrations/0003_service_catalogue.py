@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_service_provider_rating_sum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Service',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'services',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='serviceprovider',
+            index=models.Index(fields=['availability', 'rating'], name='providers_rating_idx'),
+        ),
+        migrations.AddField(
+            model_name='serviceprovider',
+            name='services',
+            field=models.ManyToManyField(blank=True, db_table='service_provider_services', help_text='Catalogue entries parsed from services_offered', related_name='providers', to='accounts.service'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+import re
+
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def parse_services(text):
+    # A frozen copy of accounts.catalogue.parse_services
+    names = {}
+    for name in re.split(r'[,;\n]+', text or ''):
+        name = re.sub(r'\s+', ' ', name).strip(' .-*')
+        slug = slugify(name)[:100]
+        if slug and slug not in names:
+            names[slug] = name[:100]
+    return names
+
+
+def backfill_services(apps, schema_editor):
+    ServiceProvider = apps.get_model('accounts', 'ServiceProvider')
+    Service = apps.get_model('accounts', 'Service')
+    Through = ServiceProvider.services.through
+
+    parsed = {
+        provider_id: parse_services(text)
+        for provider_id, text in ServiceProvider.objects.values_list('id', 'services_offered').iterator()
+    }
+    names = {}
+    for services in parsed.values():
+        for slug, name in services.items():
+            names.setdefault(slug, name)
+    Service.objects.bulk_create(
+        [Service(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True, batch_size=500,
+    )
+    ids = dict(Service.objects.values_list('slug', 'id'))
+    Through.objects.bulk_create(
+        [
+            Through(serviceprovider_id=provider_id, service_id=ids[slug])
+            for provider_id, services in parsed.items()
+            for slug in services
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_service_catalogue'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_services, migrations.RunPython.noop),
+    ]
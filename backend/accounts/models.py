@@ -24,21 +24,52 @@ class User(AbstractUser):
         return f"{self.username} ({self.user_type})"
 
 
+class Service(models.Model):
+    """An entry of the service catalogue, e.g. Packing or Storage"""
+    name = models.CharField(max_length=100, unique=True)
+    slug = models.SlugField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'services'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
 class ServiceProvider(models.Model):
     """Service Provider profile information"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='service_provider_profile')
     company_name = models.CharField(max_length=255)
     contact_person = models.CharField(max_length=255)
     services_offered = models.TextField(help_text="Comma-separated list of services")
+    services = models.ManyToManyField(
+        Service, related_name='providers', blank=True, db_table='service_provider_services',
+        help_text="Catalogue entries parsed from services_offered",
+    )
     pricing_info = models.TextField(null=True, blank=True)
     availability = models.BooleanField(default=True)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
     total_reviews = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0, help_text="Sum of all review ratings, maintained incrementally")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'service_providers'
+        # The directory lists available providers by rating
+        indexes = [
+            models.Index(fields=['availability', 'rating'], name='providers_rating_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets saves skip re-syncing the catalogue when the text did not change
+        if 'services_offered' in field_names:
+            instance._stored_services_offered = instance.services_offered
+        return instance
     
     def __str__(self):
         return self.company_name
@@ -0,0 +1,20 @@
+from rest_framework import permissions
+
+from .principal import get_principal
+
+
+class IsAdministrator(permissions.BasePermission):
+    """Allows access only to users with the administrator role"""
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and get_principal(request).is_admin)
+
+
+class IsServiceProviderOrAdministrator(permissions.BasePermission):
+    """Allows access only to service providers and administrators"""
+
+    def has_permission(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return False
+        principal = get_principal(request)
+        return principal.is_admin or principal.is_service_provider
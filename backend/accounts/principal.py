@@ -0,0 +1,65 @@
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import ServiceProvider
+
+
+class Principal(NamedTuple):
+    """Who is calling: the user's role and, for providers, their profile ID"""
+    user_id: int
+    user_type: str
+    service_provider_id: Optional[int] = None
+
+    @property
+    def is_admin(self):
+        return self.user_type == 'admin'
+
+    @property
+    def is_service_provider(self):
+        return self.user_type == 'service_provider'
+
+
+def principal_cache_key(user_id):
+    return f'principal:{user_id}'
+
+
+def get_principal_for_user(user):
+    """Resolve a user's principal, cached across requests until the user or their profile changes"""
+    key = principal_cache_key(user.pk)
+    principal = cache.get(key)
+    if principal is None or principal.user_type != user.user_type:
+        service_provider_id = None
+        if user.user_type == 'service_provider':
+            service_provider_id = ServiceProvider.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+        principal = Principal(user.pk, user.user_type, service_provider_id)
+        cache.set(key, principal, settings.PRINCIPAL_CACHE_TIMEOUT)
+    return principal
+
+
+def get_principal(request):
+    """
+    The authenticated caller's principal, resolved once per request and
+    shared by every view, permission and serializer that handles it.
+    Returns None for anonymous requests.
+    """
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_principal'):
+        user = request.user
+        http_request._principal = get_principal_for_user(user) if user.is_authenticated else None
+    return http_request._principal
+
+
+def get_service_provider(principal, user):
+    """Load the provider profile a principal points at, reusing the already-loaded user"""
+    if principal.service_provider_id is None:
+        return None
+    service_provider = ServiceProvider.objects.filter(pk=principal.service_provider_id).first()
+    if service_provider is not None:
+        service_provider.user = user
+    return service_provider
+
+
+def invalidate_principal(user_id):
+    cache.delete(principal_cache_key(user_id))
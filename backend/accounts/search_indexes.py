@@ -0,0 +1,5 @@
+from search.index import register
+
+from .models import ServiceProvider
+
+register(ServiceProvider, (('company_name', 'A'), ('services_offered', 'B'), ('contact_person', 'C')))
@@ -1,8 +1,25 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from core.query_plans import QueryPlan
 from .models import User, ServiceProvider
 
 
+def create_user(password_hash=None, **fields):
+    """
+    User.objects.create_user(), optionally with a password that was already
+    hashed elsewhere (the async registration views hash on a worker pool).
+    """
+    if password_hash is None:
+        return User.objects.create_user(**fields)
+    fields.pop('password', None)
+    user = User(**fields)
+    user.username = User.normalize_username(user.username)
+    user.email = User.objects.normalize_email(user.email)
+    user.password = password_hash
+    user.save()
+    return user
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
     password2 = serializers.CharField(write_only=True, required=True)
@@ -23,7 +40,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password2')
-        user = User.objects.create_user(**validated_data)
+        user = create_user(**validated_data)
         return user
 
 
@@ -37,14 +54,17 @@ class UserSerializer(serializers.ModelSerializer):
 
 class ServiceProviderSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    services = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
     
     class Meta:
         model = ServiceProvider
-        fields = ('id', 'user', 'company_name', 'contact_person', 'services_offered', 
+        fields = ('id', 'user', 'company_name', 'contact_person', 'services_offered', 'services',
                   'pricing_info', 'availability', 'rating', 'total_reviews', 
                   'created_at', 'updated_at')
         read_only_fields = ('id', 'rating', 'total_reviews', 'created_at', 'updated_at')
 
+    query_plan = QueryPlan(select_related=('user',), prefetch_related=('services',))
+
 
 class ServiceProviderRegistrationSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -76,7 +96,7 @@ class ServiceProviderRegistrationSerializer(serializers.Serializer):
             'address': validated_data['address'],
             'user_type': 'service_provider',
         }
-        user = User.objects.create_user(**user_data)
+        user = create_user(password_hash=validated_data.get('password_hash'), **user_data)
         
         service_provider = ServiceProvider.objects.create(
             user=user,
@@ -0,0 +1,57 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Service, ServiceProvider, User
+from .authentication import invalidate_user
+from .catalogue import sync_provider_services
+from .directory import invalidate_provider
+from .principal import invalidate_principal
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Covers profile edits, deactivation and password changes
+    invalidate_user(instance.pk)
+    invalidate_principal(instance.pk)
+    if instance.user_type == 'service_provider':
+        # Providers embed their user in the public directory
+        for service_provider_id in ServiceProvider.objects.filter(user_id=instance.pk).values_list('id', flat=True):
+            invalidate_provider(service_provider_id)
+
+
+@receiver(post_save, sender=ServiceProvider)
+@receiver(post_delete, sender=ServiceProvider)
+def service_provider_changed(sender, instance, **kwargs):
+    invalidate_principal(instance.user_id)
+    invalidate_provider(instance.pk)
+
+
+@receiver(post_save, sender=ServiceProvider)
+def sync_services(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created or instance.services_offered != getattr(instance, '_stored_services_offered', None):
+        sync_provider_services(instance)
+
+
+@receiver(m2m_changed, sender=ServiceProvider.services.through)
+def provider_services_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_provider(instance.pk)
+    elif action == 'pre_clear':
+        # clear() passes no pk_set, and the links are gone afterwards
+        for service_provider_id in instance.providers.values_list('id', flat=True):
+            invalidate_provider(service_provider_id)
+    elif action in ('post_add', 'post_remove'):
+        for service_provider_id in pk_set:
+            invalidate_provider(service_provider_id)
+
+
+@receiver(post_save, sender=Service)
+@receiver(pre_delete, sender=Service)
+def service_changed(sender, instance, **kwargs):
+    # A renamed or removed service shows up on every provider offering it
+    for service_provider_id in instance.providers.values_list('id', flat=True):
+        invalidate_provider(service_provider_id)
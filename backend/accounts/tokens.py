@@ -0,0 +1,15 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .principal import get_principal_for_user
+
+
+class PrincipalRefreshToken(RefreshToken):
+    """Refresh token whose claims (and those of its access tokens) carry the user's principal"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        principal = get_principal_for_user(user)
+        token['user_type'] = principal.user_type
+        token['service_provider_id'] = principal.service_provider_id
+        return token
@@ -1,63 +1,148 @@
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import status, generics, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
-from .models import User, ServiceProvider
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_backends, user_login_failed
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from core.pools import PoolSaturated
+from core.query_plans import QueryPlanMixin
+from core.response_cache import CachedResponseMixin
+from core.views import AsyncAPIView
+from .models import Service, User, ServiceProvider
+from .authentication import refresh_user
+from .catalogue import parse_services
+from .directory import DIRECTORY_GENERATION, provider_generation
+from .hashing import ahash_password, averify_password
+from .principal import get_principal, get_principal_for_user, get_service_provider
+from .tokens import PrincipalRefreshToken
 from .serializers import (
     UserRegistrationSerializer, UserSerializer, 
     ServiceProviderSerializer, ServiceProviderRegistrationSerializer
 )
 
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def register_user(request):
+class RegisterUserView(AsyncAPIView):
     """Register a new user"""
-    serializer = UserRegistrationSerializer(data=request.data)
-    if serializer.is_valid():
-        user = serializer.save()
-        refresh = RefreshToken.for_user(user)
-        return Response({
+
+    async def post(self, request):
+        serializer = UserRegistrationSerializer(data=self.get_data(request))
+        if not await sync_to_async(serializer.is_valid)():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            password_hash = await ahash_password(serializer.validated_data['password'])
+        except PoolSaturated:
+            return busy_response()
+        response_data = await sync_to_async(self.register)(serializer, password_hash)
+        return self.respond(response_data, status=status.HTTP_201_CREATED)
+
+    def register(self, serializer, password_hash):
+        user = serializer.save(password_hash=password_hash)
+        refresh = PrincipalRefreshToken.for_user(user)
+        return {
             'user': UserSerializer(user).data,
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-        }, status=status.HTTP_201_CREATED)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        }
 
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def register_service_provider(request):
+class RegisterServiceProviderView(AsyncAPIView):
     """Register a new service provider"""
-    serializer = ServiceProviderRegistrationSerializer(data=request.data)
-    if serializer.is_valid():
-        service_provider = serializer.save()
-        refresh = RefreshToken.for_user(service_provider.user)
-        return Response({
+
+    async def post(self, request):
+        serializer = ServiceProviderRegistrationSerializer(data=self.get_data(request))
+        if not await sync_to_async(serializer.is_valid)():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            password_hash = await ahash_password(serializer.validated_data['password'])
+        except PoolSaturated:
+            return busy_response()
+        response_data = await sync_to_async(self.register)(serializer, password_hash)
+        return self.respond(response_data, status=status.HTTP_201_CREATED)
+
+    def register(self, serializer, password_hash):
+        service_provider = serializer.save(password_hash=password_hash)
+        refresh = PrincipalRefreshToken.for_user(service_provider.user)
+        return {
             'service_provider': ServiceProviderSerializer(service_provider).data,
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-        }, status=status.HTTP_201_CREATED)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        }
 
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def login(request):
+class LoginView(AsyncAPIView):
     """User login"""
-    username = request.data.get('username')
-    password = request.data.get('password')
-    
-    if not username or not password:
-        return Response(
-            {'error': 'Username and password are required'}, 
-            status=status.HTTP_400_BAD_REQUEST
+
+    async def post(self, request):
+        data = self.get_data(request) or {}
+        username = data.get('username')
+        password = data.get('password')
+        
+        if not username or not password:
+            return self.respond(
+                {'error': 'Username and password are required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            user = await self.authenticate(request, username, password)
+        except PoolSaturated:
+            return busy_response()
+        if user:
+            response_data = await sync_to_async(self.login)(user)
+            return self.respond(response_data, status=status.HTTP_200_OK)
+        
+        return self.respond(
+            {'error': 'Invalid credentials'}, 
+            status=status.HTTP_401_UNAUTHORIZED
         )
-    
-    user = authenticate(username=username, password=password)
-    if user:
-        refresh = RefreshToken.for_user(user)
+
+    async def authenticate(self, request, username, password):
+        """
+        django.contrib.auth.authenticate(): each configured backend in turn,
+        with ModelBackend's password check run on the hashing pool and other
+        backends on a thread. Sends user_login_failed when none accepts.
+        """
+        for backend in get_backends():
+            try:
+                if type(backend).authenticate is ModelBackend.authenticate:
+                    user = await self.authenticate_model_backend(backend, username, password)
+                else:
+                    user = await sync_to_async(backend.authenticate)(request, username=username, password=password)
+            except PermissionDenied:
+                # The backend vetoes the login outright
+                break
+            if user is not None:
+                user.backend = f'{type(backend).__module__}.{type(backend).__qualname__}'
+                return user
+        await sync_to_async(user_login_failed.send)(
+            sender='django.contrib.auth',
+            credentials={'username': username, 'password': '********************'},
+            request=request,
+        )
+        return None
+
+    async def authenticate_model_backend(self, backend, username, password):
+        """ModelBackend.authenticate() with the password check run on the hashing pool"""
+        user = await User.objects.filter(**{User.USERNAME_FIELD: username}).afirst()
+        if user is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords
+            await ahash_password(password)
+            return None
+        valid, must_update = await averify_password(password, user.password)
+        if not valid or not backend.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = await ahash_password(password)
+            await user.asave(update_fields=['password'])
+        return user
+
+    def login(self, user):
+        refresh = PrincipalRefreshToken.for_user(user)
         user_data = UserSerializer(user).data
         
         # Include service provider info if applicable
@@ -67,34 +152,32 @@ def login(request):
             'access': str(refresh.access_token),
         }
         
-        if user.user_type == 'service_provider':
-            try:
-                service_provider = ServiceProvider.objects.get(user=user)
-                response_data['service_provider'] = ServiceProviderSerializer(service_provider).data
-            except ServiceProvider.DoesNotExist:
-                pass
-        
-        return Response(response_data, status=status.HTTP_200_OK)
-    
-    return Response(
-        {'error': 'Invalid credentials'}, 
-        status=status.HTTP_401_UNAUTHORIZED
+        service_provider = get_service_provider(get_principal_for_user(user), user)
+        if service_provider is not None:
+            response_data['service_provider'] = ServiceProviderSerializer(service_provider).data
+        return response_data
+
+
+def busy_response():
+    return JsonResponse(
+        {'error': 'Server is busy, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': '1'},
     )
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_current_user(request):
-    """Get current authenticated user"""
+    """Get current authenticated user (``?fresh=true`` bypasses the user cache)"""
+    if request.query_params.get('fresh') in ('1', 'true'):
+        refresh_user(request)
     serializer = UserSerializer(request.user)
     response_data = {'user': serializer.data}
     
-    if request.user.user_type == 'service_provider':
-        try:
-            service_provider = ServiceProvider.objects.get(user=request.user)
-            response_data['service_provider'] = ServiceProviderSerializer(service_provider).data
-        except ServiceProvider.DoesNotExist:
-            pass
+    service_provider = get_service_provider(get_principal(request), request.user)
+    if service_provider is not None:
+        response_data['service_provider'] = ServiceProviderSerializer(service_provider).data
     
     return Response(response_data)
 
@@ -106,20 +189,64 @@ class UserListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if self.request.user.user_type != 'admin':
+        if not get_principal(self.request).is_admin:
             return User.objects.none()
         return super().get_queryset()
 
 
-class ServiceProviderListView(generics.ListAPIView):
-    """List all service providers"""
-    queryset = ServiceProvider.objects.filter(availability=True)
+class ServiceProviderListView(CachedResponseMixin, QueryPlanMixin, generics.ListAPIView):
+    """
+    List service providers, best rated first. ``?services=packing,storage``
+    keeps providers offering every listed service, ``?min_rating=4`` those
+    rated at least that, and ``?availability=false|any`` widens the default
+    of available providers only.
+    """
     serializer_class = ServiceProviderSerializer
     permission_classes = [permissions.AllowAny]
+    query_plan = ServiceProviderSerializer.query_plan
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = ServiceProvider.objects.order_by('-rating', 'id')
+        
+        availability = params.get('availability', 'true').lower()
+        if availability in ('true', '1'):
+            queryset = queryset.filter(availability=True)
+        elif availability in ('false', '0'):
+            queryset = queryset.filter(availability=False)
+        elif availability != 'any':
+            raise ValidationError({'availability': 'Expected true, false or any.'})
+        
+        if params.get('min_rating'):
+            try:
+                min_rating = Decimal(params['min_rating'])
+            except InvalidOperation:
+                min_rating = None
+            # Decimal also parses NaN and Infinity, which the database cannot compare
+            if min_rating is None or not min_rating.is_finite():
+                raise ValidationError({'min_rating': 'A number is required.'})
+            queryset = queryset.filter(rating__gte=min_rating)
+        
+        if params.get('services'):
+            slugs = set(parse_services(params['services']))
+            service_ids = list(Service.objects.filter(slug__in=slugs).order_by().values_list('id', flat=True))
+            if len(service_ids) < len(slugs):
+                return queryset.none()
+            # One join on the indexed link table per service
+            for service_id in service_ids:
+                queryset = queryset.filter(services=service_id)
+        return queryset
 
+    def get_cache_generations(self):
+        return [DIRECTORY_GENERATION]
 
-class ServiceProviderDetailView(generics.RetrieveAPIView):
+
+class ServiceProviderDetailView(CachedResponseMixin, QueryPlanMixin, generics.RetrieveAPIView):
     """Get service provider details"""
     queryset = ServiceProvider.objects.all()
     serializer_class = ServiceProviderSerializer
     permission_classes = [permissions.AllowAny]
+    query_plan = ServiceProviderSerializer.query_plan
+
+    def get_cache_generations(self):
+        return [provider_generation(self.kwargs['pk'])]
@@ -26,6 +26,12 @@ class Booking(models.Model):
     class Meta:
         db_table = 'bookings'
         ordering = ['-created_at']
+        # Keyset pagination scans (created_at, id) within each role's filter
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='bookings_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='bookings_user_created_idx'),
+            models.Index(fields=['service_provider', '-created_at', '-id'], name='bookings_provider_created_idx'),
+        ]
     
     def __str__(self):
         return f"Booking {self.id}: {self.user.username} - {self.service_provider.company_name}"
@@ -2,18 +2,30 @@ from rest_framework import serializers
 from .models import Booking
 from accounts.serializers import UserSerializer, ServiceProviderSerializer
 from relocations.serializers import RelocationSerializer
+from core.query_plans import QueryPlan
+from core.batch import BatchSerializerMixin
+from core.serializers import ExpandableFieldsMixin
 
 
-class BookingSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    service_provider = ServiceProviderSerializer(read_only=True)
-    relocation = RelocationSerializer(read_only=True)
-    
+class BookingSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Booking
         fields = ('id', 'user', 'service_provider', 'relocation', 'service_type', 
                   'booking_date', 'status', 'total_amount', 'notes', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        expandable_fields = {
+            'user': UserSerializer,
+            'service_provider': ServiceProviderSerializer,
+            'relocation': RelocationSerializer,
+        }
+        # The bookings endpoint has always returned these nested
+        default_expand = ('user', 'service_provider', 'relocation')
+
+    query_plan = (
+        QueryPlan(select_related=('user',))
+        + ServiceProviderSerializer.query_plan.nested('service_provider')
+        + RelocationSerializer.query_plan.nested('relocation')
+    )
 
 
 class BookingCreateSerializer(serializers.ModelSerializer):
@@ -24,3 +36,7 @@ class BookingCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class BookingBatchSerializer(BatchSerializerMixin, BookingCreateSerializer):
+    """One item of a batch create, validated against preloaded providers and relocations"""
@@ -0,0 +1,11 @@
+from jobs.queue import task
+from relocations.models import Relocation
+
+
+@task(priority=5)
+def mark_relocation_booked(booking_id):
+    """Move a confirmed booking's relocation to booked"""
+    relocation = Relocation.objects.filter(bookings__pk=booking_id, bookings__status='confirmed').first()
+    if relocation is not None and relocation.status != 'booked':
+        relocation.status = 'booked'
+        relocation.save(update_fields=['status', 'updated_at'])
@@ -1,12 +1,40 @@
+from django.db import transaction
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from core.pagination import PaginationModeMixin
+from accounts.models import ServiceProvider
+from accounts.principal import get_principal
+from core.batch import BatchCreateMixin
+from core.conditional import ConditionalViewSetMixin
+from core.exports import ExportMixin
+from core.query_plans import QueryPlanMixin
 from .models import Booking
-from .serializers import BookingSerializer, BookingCreateSerializer
+from relocations.models import Relocation
+from .serializers import BookingSerializer, BookingCreateSerializer, BookingBatchSerializer
+from .tasks import mark_relocation_booked
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(
+    ConditionalViewSetMixin, QueryPlanMixin, PaginationModeMixin, BatchCreateMixin, ExportMixin, viewsets.ModelViewSet,
+):
     permission_classes = [permissions.IsAuthenticated]
+    query_plan = BookingSerializer.query_plan
+    batch_serializer_class = BookingBatchSerializer
+    export_fields = {
+        'id': 'id',
+        'customer': 'user__username',
+        'service_provider': 'service_provider__company_name',
+        'relocation_id': 'relocation_id',
+        'origin': 'relocation__origin',
+        'destination': 'relocation__destination',
+        'service_type': 'service_type',
+        'booking_date': 'booking_date',
+        'status': 'status',
+        'total_amount': 'total_amount',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -14,29 +42,40 @@ class BookingViewSet(viewsets.ModelViewSet):
         return BookingSerializer
     
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return Booking.objects.all()
-        elif user.user_type == 'service_provider':
-            from accounts.models import ServiceProvider
-            try:
-                service_provider = ServiceProvider.objects.get(user=user)
-                return Booking.objects.filter(service_provider=service_provider)
-            except ServiceProvider.DoesNotExist:
+        elif principal.is_service_provider:
+            if principal.service_provider_id is None:
                 return Booking.objects.none()
+            return Booking.objects.filter(service_provider_id=principal.service_provider_id)
         else:
-            return Booking.objects.filter(user=user)
+            return Booking.objects.filter(user_id=principal.user_id)
+    
+    def get_batch_querysets(self):
+        principal = get_principal(self.request)
+        relocations = Relocation.objects.select_related('user')
+        if not principal.is_admin:
+            # Bookings can only be made for the caller's own relocations
+            relocations = relocations.filter(user_id=principal.user_id)
+        return {
+            'service_provider': ServiceProvider.objects.select_related('user'),
+            'relocation': relocations,
+        }
+    
+    def build_batch_instance(self, validated_data):
+        return Booking(user=self.request.user, **validated_data)
     
     @action(detail=True, methods=['post'])
     def confirm(self, request, pk=None):
         """Confirm a booking"""
         booking = self.get_object()
         if booking.status == 'pending':
-            booking.status = 'confirmed'
-            booking.save()
-            # Update relocation status
-            booking.relocation.status = 'booked'
-            booking.relocation.save()
+            with transaction.atomic():
+                booking.status = 'confirmed'
+                booking.save()
+                # Update relocation status
+                mark_relocation_booked.delay(booking_id=booking.pk)
             return Response({'message': 'Booking confirmed successfully'})
         return Response({'error': 'Booking cannot be confirmed'}, status=status.HTTP_400_BAD_REQUEST)
     
@@ -0,0 +1,37 @@
+import asyncio
+import weakref
+
+from django.conf import settings
+
+from .metrics import metrics
+
+
+class DatabaseLimiter:
+    """
+    Caps how many async requests may run database work at the same time, so
+    a burst of concurrent clients waits on the event loop instead of opening
+    a connection each. Semaphores are per event loop.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def __aenter__(self):
+        semaphore = self._semaphore()
+        if semaphore.locked():
+            metrics.incr('async_db.waited')
+        await semaphore.acquire()
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore().release()
+
+
+db_limiter = DatabaseLimiter(settings.ASYNC_DB_CONCURRENCY)
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.db import router, transaction
+from django.dispatch import Signal
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+# Sent with the model as sender, the created ``instances`` and ``using`` after a
+# batch insert, which bypasses post_save
+batch_created = Signal()
+
+
+class PreloadedRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves against the objects a batch preloaded
+    into ``context['preloaded'][field_name]`` instead of querying per item.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = preloaded.get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class BatchSerializerMixin:
+    """For ModelSerializers validating batch items: related fields resolve from preloaded objects"""
+    serializer_related_field = PreloadedRelatedField
+
+
+class BatchCreateMixin:
+    """
+    Adds ``POST <prefix>/batch/`` taking ``{"items": [...]}``. Every item is
+    validated before anything is written; related objects are loaded with
+    one query per relation from ``get_batch_querysets()``, and the rows are
+    inserted with ``bulk_create`` in a single transaction. If any item is
+    invalid nothing is created and the response lists each item's errors.
+    """
+    batch_serializer_class = None
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Create many objects in one transaction"""
+        items = request.data.get('items') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'items must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        max_items = settings.BATCH_CREATE_MAX_ITEMS
+        if len(items) > max_items:
+            return Response({'error': f'At most {max_items} items per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+        context = self.get_serializer_context()
+        context['preloaded'] = self.preload_related(items)
+        instances = []
+        results = []
+        for index, item in enumerate(items):
+            serializer = self.batch_serializer_class(data=item, context=context)
+            if serializer.is_valid():
+                instances.append(self.build_batch_instance(serializer.validated_data))
+                results.append({'index': index, 'valid': True})
+            else:
+                results.append({'index': index, 'valid': False, 'errors': serializer.errors})
+
+        if len(instances) < len(items):
+            return Response({'created': 0, 'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.batch_serializer_class.Meta.model
+        with transaction.atomic():
+            created = model.objects.bulk_create(instances)
+            batch_created.send(sender=model, instances=created, using=router.db_for_write(model))
+        serializer = self.get_serializer(created, many=True)
+        return Response({'created': len(created), 'results': serializer.data}, status=status.HTTP_201_CREATED)
+
+    def get_batch_querysets(self):
+        """Querysets, by field name, that items may reference"""
+        return {}
+
+    def preload_related(self, items):
+        preloaded = {}
+        for field_name, queryset in self.get_batch_querysets().items():
+            ids = set()
+            for item in items:
+                value = item.get(field_name) if isinstance(item, dict) else None
+                if isinstance(value, (int, str)) and not isinstance(value, bool) and str(value).isdigit():
+                    ids.add(int(value))
+            preloaded[field_name] = queryset.in_bulk(ids) if ids else {}
+        return preloaded
+
+    def build_batch_instance(self, validated_data):
+        return self.batch_serializer_class.Meta.model(**validated_data)
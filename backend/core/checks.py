@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .query_plans import QueryPlanMixin, assert_query_plan_covers
+
+
+@register()
+def check_query_plans(app_configs, **kwargs):
+    """Every nested relation a plan-aware view renders must be in its query plan"""
+    # Import the views so their classes are registered
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+
+    errors = {}
+    for view_class in QueryPlanMixin.registry:
+        for action in ('list', 'retrieve'):
+            try:
+                assert_query_plan_covers(view_class, action=action)
+            except AssertionError as exc:
+                errors.setdefault(str(exc), Error(str(exc), obj=view_class, id='core.E001'))
+    return list(errors.values())
+
+
+# Cache backends whose entries live in one process's memory
+PROCESS_LOCAL_CACHES = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Token revocation, cached principals, response generations and job
+    invalidations are all cache writes, which only reach other processes
+    through a shared cache
+    """
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        'The default cache is local to each process, so invalidations made by one web worker or by '
+        'run_jobs never reach the others: deactivated users and changed passwords keep authenticating, '
+        'roles and cached responses stay stale until they expire.',
+        hint='Point CACHES["default"] at Redis, Memcached or the database cache, '
+             'or run a single web process with JOBS_RUN_INLINE=True and no run_jobs.',
+        id='core.E002',
+    )]
@@ -0,0 +1,155 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+def newest(values):
+    """The latest of the validator's timestamps, ignoring empty relations"""
+    return max((value for value in values if value is not None), default=None)
+
+
+def related_model(model, path):
+    """The model reached from ``model`` by following the lookup ``path``, or None"""
+    for name in path.split('__'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+        if model is None:
+            return None
+    return model
+
+
+class ConditionalViewSetMixin:
+    """
+    Conditional requests for ModelViewSets, answered from a cheap validator
+    before anything is serialized: ``max(updated_at)`` and the row count for
+    lists, the row's ``updated_at`` for details. Both also take the newest
+    ``updated_at`` of every related object the response renders, so editing
+    a nested object produces a new ETag. GETs honour If-None-Match and
+    If-Modified-Since with 304; update and destroy honour If-Match with 412.
+    """
+    modified_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Joins for many-valued relations repeat rows, hence the distinct count
+        validator = queryset.select_related(None).prefetch_related(None).order_by().aggregate(
+            last_modified=Max(self.modified_field), count=Count('pk', distinct=True),
+            **self.get_related_validators(),
+        )
+        count = validator.pop('count')
+        last_modified = newest(validator.values())
+        etag = self.make_list_etag(count, last_modified)
+        return self.conditional(request, etag, last_modified, super().list, args, kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        validator = self.get_object_validator(self.get_related_validators())
+        if validator['last_modified'] is None:
+            return super().retrieve(request, *args, **kwargs)
+        last_modified = newest(validator.values())
+        etag = self.make_detail_etag(validator['last_modified'], last_modified)
+        return self.conditional(request, etag, last_modified, super().retrieve, args, kwargs)
+
+    def update(self, request, *args, **kwargs):
+        failed = self.check_if_match(request)
+        if failed is not None:
+            return failed
+        response = super().update(request, *args, **kwargs)
+        instance = getattr(self, '_updated_instance', None)
+        if instance is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = self.make_detail_etag(getattr(instance, self.modified_field))
+        return response
+
+    def destroy(self, request, *args, **kwargs):
+        failed = self.check_if_match(request)
+        if failed is not None:
+            return failed
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self._updated_instance = serializer.instance
+
+    def get_object_validator(self, aggregates=None):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+        return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).order_by().aggregate(
+            last_modified=Max(self.modified_field), **(aggregates or {}),
+        )
+
+    def get_related_validators(self):
+        """``Max(updated_at)`` over each relation the response renders whose model tracks changes"""
+        if not hasattr(self, 'get_query_plan'):
+            return {}
+        plan = self.get_query_plan()
+        aggregates = {}
+        for path in plan.select_related + plan.prefetch_related:
+            model = related_model(self.get_queryset().model, path)
+            if model is not None and any(f.name == self.modified_field for f in model._meta.concrete_fields):
+                aggregates[f'related_{len(aggregates)}'] = Max(f'{path}__{self.modified_field}')
+        return aggregates
+
+    def make_list_etag(self, count, last_modified):
+        # The query string carries page, filters and ?expand=; the user scopes the rows
+        request = self.request
+        return make_etag(count, last_modified, request.get_full_path(), request.accepted_media_type, request.user.pk)
+
+    def make_detail_etag(self, row_modified, last_modified=None):
+        """
+        ``"<state>.<representation>"``: the state part identifies the row and
+        is all If-Match compares, so an ETag fetched with any query string or
+        media type can be sent back; the representation part tells those
+        renderings, and the related objects they include, apart for caches.
+        """
+        request = self.request
+        state = make_etag(row_modified, request.path, request.user.pk).strip('"')
+        representation = make_etag(
+            last_modified or row_modified, request.get_full_path(), request.accepted_media_type,
+        ).strip('"')
+        return quote_etag(f'{state}.{representation}')
+
+    def conditional(self, request, etag, last_modified, handler, args, kwargs):
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            return etag in parse_etags(if_none_match) or if_none_match.strip() == '*'
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_modified_since is not None and last_modified is not None:
+            return int(last_modified.timestamp()) <= if_modified_since
+        return False
+
+    def check_if_match(self, request):
+        """A 412 response when If-Match does not name the current representation"""
+        if_match = request.META.get('HTTP_IF_MATCH')
+        if not if_match:
+            return None
+        last_modified = self.get_object_validator()['last_modified']
+        if last_modified is None:
+            # Let the handler produce its usual 404
+            return None
+        state = self.make_detail_etag(last_modified).strip('"').split('.')[0]
+        if if_match.strip() == '*' or any(etag.strip('"').split('.')[0] == state for etag in parse_etags(if_match)):
+            return None
+        return Response(
+            {'detail': 'The resource has changed since it was last fetched.'},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+        )
@@ -0,0 +1,64 @@
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from accounts.tokens import PrincipalRefreshToken
+from core.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync read path on a WSGI deployment with the async read path '
+        'on the ASGI deployment under concurrent clients. Start both servers first, e.g. '
+        '`manage.py runserver 8000` and `uvicorn relocation_system.asgi:application --port 8001`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi', default='http://127.0.0.1:8000', help='Base URL of the WSGI deployment')
+        parser.add_argument('--asgi', default='http://127.0.0.1:8001', help='Base URL of the ASGI deployment')
+        parser.add_argument('--username', default='admin', help='User whose token the clients send')
+        parser.add_argument('--resources', default='relocations,bookings,shipments,documents')
+        parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated client counts')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per resource and client count')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f"No user named {options['username']!r}")
+        token = str(PrincipalRefreshToken.for_user(user).access_token)
+
+        self.stdout.write(f"{'resource':<12} {'clients':>7} {'path':<5} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for resource in options['resources'].split(','):
+            for concurrency in [int(c) for c in options['concurrency'].split(',')]:
+                for label, url in (
+                    ('wsgi', f"{options['wsgi']}/api/{resource}/"),
+                    ('asgi', f"{options['asgi']}/api/async/{resource}/"),
+                ):
+                    elapsed, latencies, errors = self.run(url, token, concurrency, options['requests'])
+                    self.stdout.write(
+                        f"{resource:<12} {concurrency:>7} {label:<5} {options['requests'] / elapsed:>8.1f} "
+                        f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {errors:>6}"
+                    )
+
+    def run(self, url, token, concurrency, total):
+        def fetch(_):
+            request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(total)))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, _ in results)
+        return elapsed, latencies, sum(not ok for _, ok in results)
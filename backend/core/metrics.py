@@ -0,0 +1,57 @@
+import threading
+from collections import defaultdict, deque
+
+
+class Metrics:
+    """
+    In-process counters, gauges and latency timings. Each worker process
+    keeps its own numbers; scrape every process to get the full picture.
+    """
+
+    def __init__(self, reservoir_size=1024):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._gauges = {}
+        self._timings = defaultdict(lambda: deque(maxlen=reservoir_size))
+        self._timing_counts = defaultdict(int)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self._timings[name].append(seconds)
+            self._timing_counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            timings = {}
+            for name, samples in self._timings.items():
+                ordered = sorted(samples)
+                timings[name] = {
+                    'count': self._timing_counts[name],
+                    'p50': percentile(ordered, 50),
+                    'p99': percentile(ordered, 99),
+                    'max': ordered[-1] if ordered else None,
+                }
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'timings': timings,
+            }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+metrics = Metrics()
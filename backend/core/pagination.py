@@ -0,0 +1,111 @@
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on ``(created_at, id)``, newest first. Each page
+    is a range scan from the previous page's last row, so deep pages cost
+    the same as the first one and no COUNT query runs.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor[0])
+
+        queryset = queryset.order_by('-created_at', '-id')
+        if self.cursor:
+            _, created_at, pk = self.cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by('created_at', 'id')
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = bool(rows) and (reverse or has_more)
+        self.has_previous = bool(rows) and (has_more if reverse else self.cursor is not None)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            reverse, created_at, pk = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            cursor = bool(int(reverse)), parse_datetime(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if cursor[1] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, reverse, row):
+        token = f"{int(reverse)}|{row.created_at.isoformat()}|{row.pk}"
+        encoded = base64.urlsafe_b64encode(token.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class PaginationModeMixin:
+    """
+    Lets a view opt into keyset pagination, either for every request with
+    ``pagination_mode = 'cursor'`` or per request with ``?pagination=cursor``
+    (any request carrying a ``cursor`` is also served in cursor mode).
+    """
+    pagination_mode = 'page'
+    cursor_pagination_class = KeysetPagination
+
+    def get_pagination_mode(self):
+        params = self.request.query_params
+        if KeysetPagination.cursor_query_param in params:
+            return 'cursor'
+        return params.get('pagination', self.pagination_mode)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.get_pagination_mode() == 'cursor':
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
@@ -0,0 +1,89 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .metrics import metrics
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when a bounded pool has no free slot"""
+
+
+def _initialize_worker():
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'relocation_system.settings')
+    django.setup()
+
+
+class BoundedProcessPool:
+    """
+    A process pool for CPU-bound work that accepts at most ``max_workers +
+    max_pending`` tasks at once and rejects the rest with PoolSaturated, so
+    callers can shed load instead of queueing without bound. Workers are
+    spawned lazily and have Django set up.
+    """
+
+    def __init__(self, name, max_workers, max_pending):
+        self.name = name
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._in_flight = 0
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_initialize_worker,
+                )
+            return self._executor
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            metrics.incr(f'{self.name}.rejected')
+            raise PoolSaturated(f'{self.name} pool is saturated')
+        self._track(1)
+        started = time.monotonic()
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._track(-1)
+            self._slots.release()
+            raise
+
+        def done(future):
+            self._track(-1)
+            self._slots.release()
+            metrics.observe(f'{self.name}.latency', time.monotonic() - started)
+            exception = future.exception()
+            metrics.incr(f'{self.name}.failed' if exception else f'{self.name}.completed')
+            if isinstance(exception, BrokenProcessPool):
+                # A worker died; start a fresh pool for the next task
+                self.shutdown(wait=False)
+
+        future.add_done_callback(done)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def _track(self, delta):
+        with self._lock:
+            self._in_flight += delta
+            metrics.gauge(f'{self.name}.in_flight', self._in_flight)
+        if delta > 0:
+            metrics.incr(f'{self.name}.submitted')
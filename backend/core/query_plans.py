@@ -0,0 +1,125 @@
+from rest_framework import serializers
+
+from .serializers import EXPAND_ALL, ExpandableFieldsMixin
+
+
+class QueryPlan:
+    """select_related / prefetch_related paths a serializer needs to render without extra queries"""
+
+    def __init__(self, select_related=(), prefetch_related=()):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+    def __add__(self, other):
+        return QueryPlan(
+            select_related=self.select_related + other.select_related,
+            prefetch_related=self.prefetch_related + other.prefetch_related,
+        )
+
+    def nested(self, prefix):
+        """The same plan reached through the relation ``prefix``"""
+        return QueryPlan(
+            select_related=(prefix,) + tuple(f'{prefix}__{p}' for p in self.select_related),
+            prefetch_related=tuple(f'{prefix}__{p}' for p in self.prefetch_related),
+        )
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def restrict(self, relations):
+        """
+        Trim every path to its longest prefix found in ``relations``, dropping
+        joins for relations the serializer will not render.
+        """
+        def trim(paths):
+            kept = []
+            for path in paths:
+                parts = path.split('__')
+                while parts and '__'.join(parts) not in relations:
+                    parts.pop()
+                if parts and '__'.join(parts) not in kept:
+                    kept.append('__'.join(parts))
+            return tuple(kept)
+        return QueryPlan(select_related=trim(self.select_related), prefetch_related=trim(self.prefetch_related))
+
+    def covers(self, path, many=False):
+        """Whether the plan loads the relation at ``path`` up front"""
+        paths = self.prefetch_related if many else self.select_related + self.prefetch_related
+        return any(p == path or p.startswith(path + '__') for p in paths)
+
+
+def serializer_relations(serializer, prefix=''):
+    """
+    Yield ``(path, many)`` for every relation the serializer renders by
+    following a foreign key, one-to-one or many-to-many from the instance.
+    """
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        path = prefix + field.source.replace('.', '__')
+        if isinstance(field, serializers.ListSerializer):
+            yield path, True
+            yield from serializer_relations(field.child, path + '__')
+        elif isinstance(field, serializers.BaseSerializer):
+            yield path, False
+            yield from serializer_relations(field, path + '__')
+        elif isinstance(field, serializers.ManyRelatedField):
+            yield path, True
+
+
+def missing_relations(plan, serializer):
+    """Relations rendered by ``serializer`` that ``plan`` does not load"""
+    missing = []
+    for path, many in serializer_relations(serializer):
+        if not plan.covers(path, many=many):
+            missing.append(path)
+    return missing
+
+
+def assert_query_plan_covers(view_class, action='list', serializer=None):
+    """
+    Fail when the serializer used by ``view_class`` for ``action`` renders a
+    relation its ``query_plan`` does not select or prefetch, with every
+    expandable relation expanded. Intended for tests; the same check runs as
+    part of ``manage.py check``.
+    """
+    if serializer is None:
+        view = view_class(action=action, request=None, format_kwarg=None, kwargs={})
+        serializer_class = view.get_serializer_class()
+        kwargs = {'context': {}}
+        if issubclass(serializer_class, ExpandableFieldsMixin):
+            kwargs['expand'] = EXPAND_ALL
+        serializer = serializer_class(**kwargs)
+    missing = missing_relations(view_class.query_plan, serializer)
+    assert not missing, (
+        f"{view_class.__name__}.query_plan does not cover {', '.join(missing)} "
+        f"rendered by {type(serializer).__name__}"
+    )
+
+
+class QueryPlanMixin:
+    """
+    Applies ``query_plan`` to every queryset a view reads through
+    ``filter_queryset``, which covers list, retrieve, update and destroy.
+    The plan is trimmed to the relations the request's serializer renders, so
+    unexpanded relations are not joined.
+    """
+    query_plan = QueryPlan()
+
+    # Views registered for the query plan system check
+    registry = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        QueryPlanMixin.registry.append(cls)
+
+    def get_query_plan(self):
+        relations = {path for path, _ in serializer_relations(self.get_serializer())}
+        return self.query_plan.restrict(relations)
+
+    def filter_queryset(self, queryset):
+        return self.get_query_plan().apply(super().filter_queryset(queryset))
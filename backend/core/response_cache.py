@@ -0,0 +1,87 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+
+from .metrics import metrics
+
+
+def generation_key(name):
+    return f'generation:{name}'
+
+
+def get_generation(name):
+    """
+    The current value of a cache-wide counter that entries built from some
+    data are stamped with; bumping it retires them all without knowing
+    their keys. Counters start, and restart after eviction, at the current
+    time in nanoseconds, above any value they held before.
+    """
+    return cache.get_or_set(generation_key(name), time.time_ns, None)
+
+
+def bump_generation(*names):
+    """Retire every cache entry stamped with the named generations"""
+    for name in names:
+        try:
+            cache.incr(generation_key(name))
+        except ValueError:
+            cache.add(generation_key(name), time.time_ns(), None)
+
+
+class CachedResponseMixin:
+    """
+    Serves successful GET responses of a public view from cache. Entries are
+    keyed by the URL, the negotiated media type and the current number of
+    each generation returned by ``get_cache_generations()``, so bumping a
+    generation invalidates exactly the responses that depend on it. Responses
+    carry an ETag and Cache-Control, and matching If-None-Match gets a 304.
+    """
+    cache_timeout = 300
+    cache_max_age = 60
+
+    def get_cache_generations(self):
+        raise NotImplementedError
+
+    def get_response_cache_key(self, request):
+        generations = ','.join(f'{name}={get_generation(name)}' for name in self.get_cache_generations())
+        url = request.get_full_path()
+        return 'response:' + hashlib.md5(
+            f'{url}|{request.accepted_media_type}|{generations}'.encode()
+        ).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            metrics.incr('response_cache.miss')
+            # finalize_response() stores the rendered result under this key
+            self._response_cache_key = key
+            return super().get(request, *args, **kwargs)
+        metrics.incr('response_cache.hit')
+        content, content_type, etag = entry
+        return self.cached_response(request, content, content_type, etag)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, '_response_cache_key', None)
+        if key is None or response.status_code != 200 or getattr(response, 'streaming', False):
+            return response
+        if hasattr(response, 'render'):
+            response.render()
+        etag = quote_etag(hashlib.md5(response.content).hexdigest())
+        cache.set(key, (response.content, response['Content-Type'], etag), self.cache_timeout)
+        return self.cached_response(request, response.content, response['Content-Type'], etag)
+
+    def cached_response(self, request, content, content_type, etag):
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={self.cache_max_age}'
+        patch_vary_headers(response, ('Accept',))
+        return response
@@ -0,0 +1,68 @@
+from rest_framework import serializers
+
+
+class _ExpandAll(dict):
+    """Expansion tree that expands every relation at every depth (``?expand=*``)"""
+
+    def __contains__(self, key):
+        return True
+
+    def __getitem__(self, key):
+        return self
+
+
+EXPAND_ALL = _ExpandAll()
+
+
+def parse_expand(value):
+    """Turn ``'booking.relocation,user'`` into ``{'booking': {'relocation': {}}, 'user': {}}``"""
+    if isinstance(value, str):
+        value = value.split(',')
+    tree = {}
+    for path in value:
+        path = path.strip()
+        if path == '*':
+            return EXPAND_ALL
+        node = tree
+        for name in filter(None, path.split('.')):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    Renders the relations listed in ``Meta.expandable_fields`` as primary keys
+    unless the client asks for them with ``?expand=``, e.g.
+    ``?expand=booking.relocation,user``. ``Meta.default_expand`` lists the
+    relations a top-level serializer expands when the parameter is absent.
+    """
+
+    def __init__(self, *args, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._expand = expand
+
+    @property
+    def expand(self):
+        if self._expand is None:
+            request = self.context.get('request')
+            param = request.query_params.get('expand') if request is not None else None
+            root = self.root
+            is_root = root is self or (isinstance(root, serializers.ListSerializer) and root.child is self)
+            if param is not None and is_root:
+                self._expand = parse_expand(param)
+            else:
+                self._expand = parse_expand(getattr(self.Meta, 'default_expand', ()))
+        return self._expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expand = self.expand
+        for name, serializer_class in self.Meta.expandable_fields.items():
+            if name in expand:
+                kwargs = {'read_only': True}
+                if issubclass(serializer_class, ExpandableFieldsMixin):
+                    kwargs['expand'] = expand[name]
+                fields[name] = serializer_class(**kwargs)
+            else:
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return fields
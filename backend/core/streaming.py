@@ -0,0 +1,28 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+
+async def aiterate(chunks):
+    """
+    Drive a synchronous chunk generator from the event loop one chunk at a
+    time. Django's ASGI handler would otherwise read a sync iterator into a
+    list before sending anything.
+    """
+    done = object()
+    while True:
+        chunk = await sync_to_async(next)(chunks, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def streaming_response(request, chunks, **kwargs):
+    """A StreamingHttpResponse over ``chunks`` that stays incremental under both WSGI and ASGI"""
+    if is_asgi(request):
+        chunks = aiterate(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
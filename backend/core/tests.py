@@ -0,0 +1,221 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import permissions, serializers, viewsets
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from accounts.models import ServiceProvider, User
+from bookings.models import Booking
+from documents.models import Document
+from payments.models import Payment
+from relocations.models import Relocation
+from reviews.models import Review
+from shipments.models import Shipment
+from .conditional import ConditionalViewSetMixin
+from .query_plans import QueryPlan, QueryPlanMixin, assert_query_plan_covers
+
+
+class ProviderBookingsSerializer(serializers.ModelSerializer):
+    bookings = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = ServiceProvider
+        fields = ('id', 'company_name', 'bookings', 'updated_at')
+
+    query_plan = QueryPlan(prefetch_related=('bookings',))
+
+
+class ProviderBookingsViewSet(ConditionalViewSetMixin, QueryPlanMixin, viewsets.ReadOnlyModelViewSet):
+    """Renders a many-valued relation whose model tracks changes, which the shipped views do not"""
+    queryset = ServiceProvider.objects.order_by('id')
+    serializer_class = ProviderBookingsSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_plan = ProviderBookingsSerializer.query_plan
+
+
+class ConditionalRequestTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('customer', password='pass12345')
+        provider_user = User.objects.create_user('mover', password='pass12345', user_type='service_provider')
+        cls.provider = ServiceProvider.objects.create(
+            user=provider_user, company_name='Movers', contact_person='Ann', services_offered='Packing',
+        )
+        cls.relocation = Relocation.objects.create(
+            user=cls.customer, origin='Nairobi', destination='Mombasa', inventory='Boxes', moving_date=date(2026, 5, 1),
+        )
+        cls.booking = Booking.objects.create(
+            user=cls.customer, service_provider=cls.provider, relocation=cls.relocation,
+            service_type='Packing', booking_date=timezone.now(), total_amount='100.00',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+        self.list_url = '/api/bookings/'
+        self.detail_url = f'/api/bookings/{self.booking.pk}/'
+
+    def test_list_answers_not_modified_until_a_row_changes(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.booking.notes = 'Fragile'
+        self.booking.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_follows_related_objects(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.provider.company_name = 'Better Movers'
+        self.provider.save()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_follows_deletions(self):
+        Booking.objects.create(
+            user=self.customer, service_provider=self.provider, relocation=self.relocation,
+            service_type='Storage', booking_date=timezone.now() - timedelta(days=1), total_amount='50.00',
+        )
+        etag = self.client.get(self.list_url)['ETag']
+        self.booking.delete()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_depends_on_the_query_string(self):
+        expanded = self.client.get(self.list_url)['ETag']
+        collapsed = self.client.get(self.list_url, {'expand': ''})['ETag']
+        self.assertNotEqual(expanded, collapsed)
+
+    def test_list_if_modified_since(self):
+        last_modified = self.client.get(self.list_url)['Last-Modified']
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        earlier = http_date((self.booking.updated_at - timedelta(minutes=1)).timestamp())
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=earlier).status_code, 200)
+
+    def test_detail_representations_have_their_own_etags(self):
+        expanded = self.client.get(self.detail_url)['ETag']
+        collapsed = self.client.get(self.detail_url, {'expand': ''})['ETag']
+        self.assertNotEqual(expanded, collapsed)
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=expanded).status_code, 304)
+        self.provider.save()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=expanded).status_code, 200)
+
+    def test_if_match_accepts_any_representation_of_the_current_state(self):
+        etag = self.client.get(self.detail_url, {'expand': ''})['ETag']
+        # Related changes do not make the row's own ETag stale
+        self.provider.save()
+        response = self.client.patch(self.detail_url, {'notes': 'Fragile'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response = self.client.patch(self.detail_url, {'notes': 'Heavy'}, format='json', HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_match_rejects_a_stale_state(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        Booking.objects.filter(pk=self.booking.pk).update(notes='Changed elsewhere', updated_at=timezone.now())
+        response = self.client.patch(self.detail_url, {'notes': 'Mine'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.delete(self.detail_url, HTTP_IF_MATCH=etag).status_code, 412)
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.notes, 'Changed elsewhere')
+        self.assertEqual(self.client.delete(self.detail_url, HTTP_IF_MATCH='*').status_code, 204)
+
+    def test_many_valued_relations_count_rows_once(self):
+        for days in (1, 2, 3):
+            Booking.objects.create(
+                user=self.customer, service_provider=self.provider, relocation=self.relocation,
+                service_type='Storage', booking_date=timezone.now() - timedelta(days=days), total_amount='50.00',
+            )
+        view = ProviderBookingsViewSet.as_view({'get': 'list'})
+        factory = APIRequestFactory()
+
+        def get(**headers):
+            request = factory.get('/providers/', **headers)
+            force_authenticate(request, user=self.customer)
+            return view(request)
+
+        make_list_etag = ConditionalViewSetMixin.make_list_etag
+        with mock.patch.object(ProviderBookingsViewSet, 'make_list_etag', autospec=True,
+                               side_effect=make_list_etag) as spy:
+            etag = get()['ETag']
+        # One provider, however many bookings the join brings along
+        self.assertEqual(spy.call_args.args[1], 1)
+        Booking.objects.filter(pk=self.booking.pk).update(updated_at=timezone.now())
+        self.assertEqual(get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class QueryCountTests(TestCase):
+    """A page of twenty rows costs the same queries as a page of one"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('customer', password='pass12345')
+        provider_user = User.objects.create_user('mover', password='pass12345', user_type='service_provider')
+        cls.provider = ServiceProvider.objects.create(
+            user=provider_user, company_name='Movers', contact_person='Ann', services_offered='Packing',
+        )
+        cls.relocation = Relocation.objects.create(
+            user=cls.customer, origin='Nairobi', destination='Mombasa', inventory='Boxes', moving_date=date(2026, 5, 1),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def booking(self, n):
+        return Booking.objects.create(
+            user=self.customer, service_provider=self.provider, relocation=self.relocation,
+            service_type='Packing', booking_date=timezone.now() - timedelta(days=n), total_amount='100.00',
+        )
+
+    def payment(self, n):
+        return Payment.objects.create(booking=self.booking(n), amount='100.00', payment_method='mpesa')
+
+    def shipment(self, n):
+        return Shipment.objects.create(booking=self.booking(n), tracking_number=f'TRK{n:04d}')
+
+    def review(self, n):
+        return Review.objects.create(user=self.customer, service_provider=self.provider, booking=self.booking(n), rating=4)
+
+    def document(self, n):
+        return Document.objects.create(
+            user=self.customer, relocation=self.relocation, document_name=f'Scan {n}', file_path=f'documents/scan-{n}.txt',
+        )
+
+    def assertQueriesIndependentOfPageSize(self, url, create, query=None):
+        # Warm per-user caches so both measurements see the same state
+        self.client.get(url, query)
+        create(0)
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get(url, query)
+        self.assertEqual(len(response.json()['results']), 1)
+        for n in range(1, 20):
+            create(n)
+        with self.assertNumQueries(len(single)):
+            response = self.client.get(url, query)
+        self.assertEqual(len(response.json()['results']), 20)
+
+    def test_list_queries_do_not_grow_with_the_page(self):
+        endpoints = [
+            ('/api/bookings/', self.booking),
+            ('/api/payments/', self.payment),
+            ('/api/shipments/', self.shipment),
+            ('/api/reviews/', self.review),
+            ('/api/documents/', self.document),
+        ]
+        for url, create in endpoints:
+            for query in (None, {'expand': ''}):
+                with self.subTest(url=url, query=query):
+                    for model in (Review, Document, Shipment, Payment, Booking):
+                        model.objects.all().delete()
+                    self.assertQueriesIndependentOfPageSize(url, create, query)
+
+    def test_query_plans_cover_the_serializers(self):
+        for view_class in QueryPlanMixin.registry:
+            if view_class.__module__ != __name__:
+                with self.subTest(view=view_class.__name__):
+                    assert_query_plan_covers(view_class)
@@ -0,0 +1,126 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from accounts.permissions import IsAdministrator
+from .async_db import db_limiter
+from .metrics import metrics as process_metrics
+
+
+class AsyncAPIView(View):
+    """
+    Base for native async JSON endpoints served by the ASGI application.
+    Like DRF's APIView it is exempt from CSRF, since callers authenticate
+    with tokens rather than session cookies.
+    """
+    http_method_names = ['post', 'options']
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    def get_data(self, request):
+        """The request payload as a dict, from a JSON body or form fields"""
+        if request.content_type == 'application/json':
+            try:
+                data = json.loads(request.body or b'{}')
+            except ValueError:
+                return None
+            return data if isinstance(data, dict) else None
+        return request.POST
+
+    def respond(self, data, status=200, headers=None):
+        return JsonResponse(data, status=status, headers=headers)
+
+
+class AsyncReadView(View):
+    """
+    Async list and retrieve for a DRF viewset. Authentication, permissions,
+    scoping, filtering and serialization are the viewset's own; the query is
+    awaited under the shared database limiter instead of holding a worker
+    thread. Lists use page-number pagination.
+    """
+    http_method_names = ['get', 'options']
+    viewset_class = None
+
+    async def get(self, request, pk=None):
+        action = 'list' if pk is None else 'retrieve'
+        try:
+            viewset, drf_request = await sync_to_async(self.initialize)(request, action)
+        except exceptions.APIException as exc:
+            return self.error_response(exc, getattr(exc, 'authenticate_header', None))
+
+        queryset, serializer_class, context = await sync_to_async(self.prepare)(viewset)
+        if pk is None:
+            return await self.list(drf_request, queryset, serializer_class, context)
+        return await self.retrieve(pk, queryset, serializer_class, context)
+
+    def initialize(self, request, action):
+        """Run the viewset's authentication and permission checks for ``request``"""
+        viewset = self.viewset_class(action_map={'get': action}, format_kwarg=None, args=(), kwargs={})
+        drf_request = viewset.initialize_request(request)
+        viewset.request = drf_request
+        viewset.headers = {}
+        try:
+            viewset.initial(drf_request)
+        except (exceptions.NotAuthenticated, exceptions.AuthenticationFailed) as exc:
+            exc.authenticate_header = viewset.get_authenticate_header(drf_request)
+            raise
+        return viewset, drf_request
+
+    def prepare(self, viewset):
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        return queryset, viewset.get_serializer_class(), viewset.get_serializer_context()
+
+    async def list(self, request, queryset, serializer_class, context):
+        page_size = api_settings.PAGE_SIZE
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+        except ValueError:
+            return self.error_response(exceptions.NotFound('Invalid page.'))
+        offset = (page - 1) * page_size
+        async with db_limiter:
+            count = await queryset.acount()
+            rows = [obj async for obj in queryset[offset:offset + page_size]]
+        if page > 1 and not rows:
+            return self.error_response(exceptions.NotFound('Invalid page.'))
+
+        url = request.build_absolute_uri()
+        previous_url = None
+        if page > 1:
+            previous_url = remove_query_param(url, 'page') if page == 2 else replace_query_param(url, 'page', page - 1)
+        return JsonResponse({
+            'count': count,
+            'next': replace_query_param(url, 'page', page + 1) if offset + page_size < count else None,
+            'previous': previous_url,
+            'results': serializer_class(rows, many=True, context=context).data,
+        })
+
+    async def retrieve(self, pk, queryset, serializer_class, context):
+        async with db_limiter:
+            obj = await queryset.filter(pk=pk).afirst()
+        if obj is None:
+            return self.error_response(exceptions.NotFound())
+        return JsonResponse(serializer_class(obj, context=context).data)
+
+    def error_response(self, exc, authenticate_header=None):
+        response = JsonResponse({'detail': exc.detail}, status=exc.status_code)
+        if authenticate_header:
+            response['WWW-Authenticate'] = authenticate_header
+        return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdministrator])
+def metrics(request):
+    """Counters, gauges and latency timings of the process serving this request"""
+    return Response(process_metrics.snapshot())
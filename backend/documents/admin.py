@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Document
+from .models import Document, UploadSession
 
 
 @admin.register(Document)
@@ -7,3 +7,10 @@ class DocumentAdmin(admin.ModelAdmin):
     list_display = ('document_name', 'user', 'document_type', 'relocation', 'uploaded_at')
     list_filter = ('document_type', 'uploaded_at')
     search_fields = ('document_name', 'user__username')
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'filename', 'received', 'size', 'status', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('filename', 'user__username')
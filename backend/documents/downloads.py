@@ -0,0 +1,134 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+
+from core.streaming import is_asgi, streaming_response
+
+# Bytes read per chunk when Python streams a file itself
+BLOCK_SIZE = 256 * 1024
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileContentNegotiation(DefaultContentNegotiation):
+    """Lets clients that ask for the file's own type (e.g. ``Accept: application/pdf``) through; errors stay JSON"""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            return renderers[0], renderers[0].media_type
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    The ``(start, end)`` byte span, end inclusive, of a single-range
+    ``Range`` header; ``None`` to serve the whole file (no header, or one
+    this does not handle); ``False`` when the range cannot be satisfied.
+    """
+    match = RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def file_chunks(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def serve_file(request, field, filename=None):
+    """
+    Respond with the file stored in ``field``: 304 when the client's ETag
+    is current, handed to the front proxy when ``DOCUMENT_SENDFILE`` names
+    one, otherwise streamed from disk with single-range support.
+    """
+    path = field.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    etag = file_etag(stat)
+    filename = filename or os.path.basename(field.name)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, no-cache',
+        'Content-Disposition': f"attachment; filename*=UTF-8''{quote(filename)}",
+    }
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match)):
+        return HttpResponseNotModified(headers={'ETag': etag, 'Cache-Control': headers['Cache-Control']})
+
+    backend = settings.DOCUMENT_SENDFILE
+    if backend:
+        # The proxy reads the file and answers Range itself
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if backend == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = quote(settings.DOCUMENT_SENDFILE_PREFIX + field.name)
+        else:
+            response['X-Sendfile'] = path
+        return response
+
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if byte_range is not None and if_range and if_range.strip() != etag:
+        # The client's partial copy is stale; send the whole file
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416, headers=headers)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    if byte_range is None:
+        if is_asgi(request):
+            response = streaming_response(request, file_chunks(path, 0, stat.st_size), content_type=content_type)
+            response['Content-Length'] = stat.st_size
+        else:
+            # WSGI servers can send this with sendfile()
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    start, end = byte_range
+    length = end - start + 1
+    response = streaming_response(request, file_chunks(path, start, length), status=206, content_type=content_type)
+    for name, value in headers.items():
+        response[name] = value
+    response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Content-Length'] = length
+    return response
@@ -0,0 +1,71 @@
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+
+from documents.models import Blob, Document
+from documents.previews import discard_previews
+from documents.storage import document_storage
+
+
+class Command(BaseCommand):
+    help = 'Delete document blobs no document references any more with their renditions, and leftover temporary files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=settings.BLOB_GC_GRACE_HOURS,
+            help='Keep unreferenced blobs stored or matched more recently than this',
+        )
+        parser.add_argument('--recount', action='store_true', help='Recompute reference counts from documents first')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.recount()
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        unreferenced = Blob.objects.filter(ref_count__lte=0, touched_at__lt=cutoff)
+        reclaimed = freed = 0
+        for blob in unreferenced.iterator():
+            if options['dry_run']:
+                reclaimed += 1
+                freed += blob.size
+                continue
+            # Conditional delete: a document may have picked the blob up since it was listed.
+            # The row stays locked until the file is gone, so a concurrent store() of the
+            # same content waits and then writes the file again.
+            with transaction.atomic():
+                deleted, _ = unreferenced.filter(pk=blob.pk).delete()
+                if deleted and not Blob.objects.filter(name=blob.name).exists():
+                    document_storage.purge(blob.name)
+                    discard_previews(blob.name)
+                    reclaimed += 1
+                    freed += blob.size
+
+        temporary = document_storage.path(os.path.join(document_storage.blob_dir, 'tmp'))
+        if os.path.isdir(temporary) and not options['dry_run']:
+            oldest = time.time() - options['grace_hours'] * 3600
+            for entry in os.scandir(temporary):
+                if entry.is_file() and entry.stat().st_mtime < oldest:
+                    os.remove(entry.path)
+
+        verb = 'Would reclaim' if options['dry_run'] else 'Reclaimed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {reclaimed} blob(s), {freed} bytes'))
+
+    def recount(self):
+        counts = dict(
+            Document.objects.values('file_path').annotate(n=Count('id')).values_list('file_path', 'n')
+        )
+        drifted = []
+        for blob in Blob.objects.only('id', 'name', 'ref_count').iterator():
+            count = counts.get(blob.name, 0)
+            if blob.ref_count != count:
+                blob.ref_count = count
+                drifted.append(blob)
+        Blob.objects.bulk_update(drifted, ['ref_count'], batch_size=500)
+        self.stdout.write(f'Recounted references, {len(drifted)} blob(s) had drifted')
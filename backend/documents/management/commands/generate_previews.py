@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from documents.models import Document
+from documents.previews import render_previews
+
+
+class Command(BaseCommand):
+    help = 'Render thumbnails and previews for image documents still pending (e.g. when the pool was full)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry documents whose rendering failed')
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+        rendered = failed = 0
+        for document in Document.objects.filter(preview_status__in=statuses).only('id', 'file_path').iterator():
+            try:
+                thumbnail, preview = render_previews(document.file_path.path, document.file_path.name)
+            except Exception as exc:
+                self.stderr.write(f'Document {document.pk}: {exc}')
+                Document.objects.filter(pk=document.pk).update(preview_status='failed')
+                failed += 1
+                continue
+            Document.objects.filter(pk=document.pk).update(preview_status='ready', thumbnail=thumbnail, preview=preview)
+            rendered += 1
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} document(s), {failed} failed'))
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from documents.models import UploadSession
+from documents.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = 'Delete upload sessions that have not received a chunk within UPLOAD_SESSION_EXPIRY_HOURS, with their part files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.UPLOAD_SESSION_EXPIRY_HOURS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        purged = 0
+        for session in UploadSession.objects.filter(status='open', updated_at__lt=cutoff).iterator():
+            discard_upload(session)
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} abandoned upload sessions'))
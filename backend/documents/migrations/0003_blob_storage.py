@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:01
+
+from django.db import migrations, models
+import documents.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_upload_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Path of the file in storage', max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField()),
+                ('ref_count', models.IntegerField(default=0, help_text='Documents whose file is this blob')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('touched_at', models.DateTimeField(auto_now_add=True, help_text='Last time an upload stored or matched this blob')),
+            ],
+            options={
+                'db_table': 'blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='file_path',
+            field=models.FileField(max_length=255, storage=documents.storage.get_document_storage, upload_to='documents/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_document_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='writing_until',
+            field=models.DateTimeField(blank=True, help_text='Lease of the request writing a chunk', null=True),
+        ),
+    ]
@@ -1,6 +1,11 @@
+import os
+import uuid
+
+from django.conf import settings
 from django.db import models
 from accounts.models import User
 from relocations.models import Relocation
+from .storage import get_document_storage
 
 
 class Document(models.Model):
@@ -13,12 +18,22 @@ class Document(models.Model):
         ('other', 'Other'),
     ]
     
+    PREVIEW_STATUS_CHOICES = [
+        ('none', 'Not Previewable'),
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='documents')
     relocation = models.ForeignKey(Relocation, on_delete=models.CASCADE, related_name='documents', null=True, blank=True)
     document_name = models.CharField(max_length=255)
     document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPE_CHOICES, default='other')
-    file_path = models.FileField(upload_to='documents/')
+    file_path = models.FileField(upload_to='documents/', storage=get_document_storage, max_length=255)
     description = models.TextField(null=True, blank=True)
+    preview_status = models.CharField(max_length=20, choices=PREVIEW_STATUS_CHOICES, default='none')
+    thumbnail = models.FileField(max_length=255, null=True, blank=True)
+    preview = models.FileField(max_length=255, null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -26,5 +41,64 @@ class Document(models.Model):
         db_table = 'documents'
         ordering = ['-uploaded_at']
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which blob the stored row references
+        if 'file_path' in field_names:
+            instance._stored_file = instance.file_path.name
+        return instance
+    
     def __str__(self):
         return f"{self.document_name} - {self.user.username}"
+
+
+class Blob(models.Model):
+    """A unique file in content-addressed document storage"""
+    name = models.CharField(max_length=255, unique=True, help_text="Path of the file in storage")
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField()
+    ref_count = models.IntegerField(default=0, help_text="Documents whose file is this blob")
+    created_at = models.DateTimeField(auto_now_add=True)
+    touched_at = models.DateTimeField(auto_now_add=True, help_text="Last time an upload stored or matched this blob")
+    
+    class Meta:
+        db_table = 'blobs'
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} references)"
+
+
+class UploadSession(models.Model):
+    """A resumable upload in progress; its bytes accumulate in a part file under MEDIA_ROOT"""
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('completed', 'Completed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    relocation = models.ForeignKey(Relocation, on_delete=models.CASCADE, related_name='upload_sessions', null=True, blank=True)
+    document_name = models.CharField(max_length=255)
+    document_type = models.CharField(max_length=20, choices=Document.DOCUMENT_TYPE_CHOICES, default='other')
+    description = models.TextField(null=True, blank=True)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField(help_text="Total bytes the client will send")
+    received = models.BigIntegerField(default=0)
+    crc32 = models.BigIntegerField(default=0, help_text="Running CRC-32 of the bytes received so far")
+    writing_until = models.DateTimeField(null=True, blank=True, help_text="Lease of the request writing a chunk")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    document = models.OneToOneField(Document, on_delete=models.SET_NULL, related_name='upload_session', null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'upload_sessions'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Upload {self.id}: {self.received}/{self.size} bytes"
+    
+    @property
+    def part_path(self):
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', f'{self.id}.part')
@@ -0,0 +1,103 @@
+import logging
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from core.pools import BoundedProcessPool, PoolSaturated
+from .models import Document
+
+logger = logging.getLogger(__name__)
+
+PREVIEWABLE_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/tiff', 'image/bmp'}
+
+preview_pool = BoundedProcessPool(
+    'document_previews',
+    max_workers=settings.DOCUMENT_PREVIEW_WORKERS,
+    max_pending=settings.DOCUMENT_PREVIEW_MAX_PENDING,
+)
+
+
+def is_previewable(name):
+    return mimetypes.guess_type(name)[0] in PREVIEWABLE_TYPES
+
+
+def preview_names(source_name):
+    """Where the renditions of ``source_name`` live; content-addressed sources share them"""
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    return f'previews/{stem}-thumb.jpg', f'previews/{stem}-preview.jpg'
+
+
+def discard_previews(source_name):
+    """Remove the renditions of ``source_name`` once nothing can reference it any more"""
+    for name in preview_names(source_name):
+        default_storage.delete(name)
+
+
+def render_previews(source_path, source_name):
+    """
+    Write a thumbnail and a web-sized progressive JPEG preview of an image
+    and return their storage names. Runs in a pool worker.
+    """
+    from PIL import Image, ImageOps
+
+    names = preview_names(source_name)
+    targets = [default_storage.path(name) for name in names]
+    if all(os.path.exists(target) for target in targets):
+        return names
+
+    sizes = (settings.DOCUMENT_THUMBNAIL_SIZE, settings.DOCUMENT_PREVIEW_SIZE)
+    with Image.open(source_path) as image:
+        # Let the JPEG decoder downscale while decoding when it can
+        image.draft('RGB', (sizes[1], sizes[1]))
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        os.makedirs(os.path.dirname(targets[0]), exist_ok=True)
+        for size, target in sorted(zip(sizes, targets), reverse=True):
+            image.thumbnail((size, size), Image.LANCZOS)
+            temporary = f'{target}.{os.getpid()}.tmp'
+            image.save(temporary, 'JPEG', quality=80, optimize=True, progressive=True)
+            os.replace(temporary, target)
+    return names
+
+
+def record_previews(document_id, future):
+    """Pool callback: store the outcome of a render on the document"""
+    try:
+        thumbnail, preview = future.result()
+    except Exception:
+        logger.exception('Preview rendering failed for document %s', document_id)
+        Document.objects.filter(pk=document_id).update(preview_status='failed')
+    else:
+        Document.objects.filter(pk=document_id).update(preview_status='ready', thumbnail=thumbnail, preview=preview)
+    finally:
+        # Callbacks run on the pool's own thread, which holds its own connection
+        close_old_connections()
+
+
+def submit_previews(document_id, source_name):
+    """Queue rendering; when the pool is full the document stays pending for generate_previews"""
+    try:
+        future = preview_pool.submit(render_previews, Document.file_path.field.storage.path(source_name), source_name)
+    except PoolSaturated:
+        return False
+    future.add_done_callback(lambda future: record_previews(document_id, future))
+    return True
+
+
+def schedule_previews(document):
+    """Mark an image document pending and render its previews once the save commits"""
+    name = document.file_path.name
+    if not name or not is_previewable(name):
+        Document.objects.filter(pk=document.pk).update(preview_status='none', thumbnail=None, preview=None)
+        return
+    existing = Document.objects.filter(file_path=name, preview_status='ready').exclude(pk=document.pk).values(
+        'thumbnail', 'preview',
+    ).first()
+    if existing:
+        # Same blob as a document that already has renditions
+        Document.objects.filter(pk=document.pk).update(preview_status='ready', **existing)
+        return
+    Document.objects.filter(pk=document.pk).update(preview_status='pending', thumbnail=None, preview=None)
+    transaction.on_commit(lambda: submit_previews(document.pk, name))
@@ -0,0 +1,5 @@
+from search.index import register
+
+from .models import Document
+
+register(Document, (('document_name', 'A'), ('description', 'B'), ('document_type', 'C')))
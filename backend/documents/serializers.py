@@ -1,24 +1,49 @@
+import os
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.text import get_valid_filename
 from rest_framework import serializers
-from .models import Document
+from .models import Document, UploadSession
+from accounts.principal import get_principal
 from accounts.serializers import UserSerializer
 from relocations.serializers import RelocationSerializer
+from core.query_plans import QueryPlan
 
 
 class DocumentSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     relocation = RelocationSerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Document
         fields = ('id', 'user', 'relocation', 'document_name', 'document_type', 
-                  'file_path', 'file_url', 'description', 'uploaded_at', 'updated_at')
-        read_only_fields = ('id', 'uploaded_at', 'updated_at')
+                  'file_path', 'file_url', 'preview_status', 'thumbnail_url', 'preview_url',
+                  'description', 'uploaded_at', 'updated_at')
+        read_only_fields = ('id', 'preview_status', 'uploaded_at', 'updated_at')
+
+    query_plan = QueryPlan(select_related=('user',)) + RelocationSerializer.query_plan.nested('relocation')
     
     def get_file_url(self, obj):
         request = self.context.get('request')
-        if obj.file_path and hasattr(obj.file_path, 'url'):
-            return request.build_absolute_uri(obj.file_path.url) if request else None
+        if obj.file_path and request:
+            return request.build_absolute_uri(reverse('document-download', args=[obj.pk]))
+        return None
+    
+    def get_thumbnail_url(self, obj):
+        return self.rendition_url(obj, 'thumbnail')
+    
+    def get_preview_url(self, obj):
+        return self.rendition_url(obj, 'preview')
+    
+    def rendition_url(self, obj, field_name):
+        # Served by the authenticated document actions, never from MEDIA_URL
+        request = self.context.get('request')
+        if getattr(obj, field_name) and request:
+            return request.build_absolute_uri(reverse(f'document-{field_name}', args=[obj.pk]))
         return None
 
 
@@ -30,3 +55,39 @@ class DocumentCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    crc32 = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = UploadSession
+        fields = ('id', 'relocation', 'document_name', 'document_type', 'description', 'filename',
+                  'size', 'received', 'crc32', 'status', 'document', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'received', 'status', 'document', 'created_at', 'updated_at')
+    
+    def get_crc32(self, obj):
+        return f'{obj.crc32:08x}'
+    
+    def validate_filename(self, value):
+        filename = get_valid_filename(os.path.basename(value))
+        if not filename:
+            raise serializers.ValidationError('Invalid file name')
+        return filename
+    
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Size must be positive')
+        if value > settings.DOCUMENT_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'Documents are limited to {settings.DOCUMENT_UPLOAD_MAX_SIZE} bytes')
+        return value
+    
+    def validate_relocation(self, value):
+        request = self.context['request']
+        if value is not None and value.user_id != request.user.pk and not get_principal(request).is_admin:
+            raise serializers.ValidationError('Relocation not found')
+        return value
+    
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return super().create(validated_data)
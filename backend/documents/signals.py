@@ -0,0 +1,34 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Blob, Document
+from .previews import discard_previews, schedule_previews
+from .storage import document_storage
+
+
+def adjust_ref_count(name, delta):
+    if name:
+        Blob.objects.filter(name=name).update(ref_count=F('ref_count') + delta)
+
+
+@receiver(post_save, sender=Document)
+def document_saved(sender, instance, **kwargs):
+    previous = getattr(instance, '_stored_file', None)
+    current = instance.file_path.name
+    if previous != current:
+        adjust_ref_count(current, 1)
+        adjust_ref_count(previous, -1)
+        instance._stored_file = current
+        schedule_previews(instance)
+
+
+@receiver(post_delete, sender=Document)
+def document_deleted(sender, instance, **kwargs):
+    name = getattr(instance, '_stored_file', instance.file_path.name)
+    adjust_ref_count(name, -1)
+    # Blob renditions go with the blob in gc_blobs; files from before blob storage have no Blob row
+    legacy = name and not name.startswith(f'{document_storage.blob_dir}/')
+    if legacy and not Document.objects.filter(file_path=name).exists():
+        transaction.on_commit(lambda: discard_previews(name))
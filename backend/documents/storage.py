@@ -0,0 +1,93 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+# Bytes hashed and written at a time
+BLOCK_SIZE = 256 * 1024
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every file under ``blobs/<ab>/<sha256><ext>``, hashing it while
+    it streams to disk, so identical uploads share one file. Each blob has
+    a row in the ``Blob`` table whose reference count the document signals
+    maintain; ``delete()`` leaves the file in place and the ``gc_blobs``
+    command removes blobs nothing references any more.
+    """
+    blob_dir = 'blobs'
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content, so an existing file is the same file
+        return name
+
+    def _save(self, name, content):
+        directory = self.path(os.path.join(self.blob_dir, 'tmp'))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as temporary:
+            if hasattr(content, 'seek'):
+                content.seek(0)
+            for chunk in content.chunks(BLOCK_SIZE):
+                digest.update(chunk)
+                temporary.write(chunk)
+                size += len(chunk)
+        return self.store(temporary.name, digest.hexdigest(), size, os.path.splitext(name)[1])
+
+    def adopt(self, path, name):
+        """Move the file at ``path`` (on the same filesystem) into storage without copying it"""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+                digest.update(block)
+                size += len(block)
+        return self.store(path, digest.hexdigest(), size, os.path.splitext(name)[1])
+
+    def store(self, path, sha256, size, extension):
+        """Rename ``path`` to the blob for ``sha256``, or drop it when that blob already exists"""
+        name = f'{self.blob_dir}/{sha256[:2]}/{sha256}{extension.lower()}'
+        target = self.path(name)
+        with transaction.atomic():
+            # Writing the row first locks it against gc_blobs, which deletes the
+            # row and purges the file in one transaction; the file is only
+            # checked once garbage collection can no longer remove it
+            register_blob(name, sha256, size)
+            if os.path.exists(target):
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(path, target)
+        return name
+
+    def delete(self, name):
+        if not name.startswith(f'{self.blob_dir}/'):
+            super().delete(name)
+
+    def purge(self, name):
+        """Remove a blob's file; only garbage collection should call this"""
+        super().delete(name)
+
+
+def register_blob(name, sha256, size):
+    from .models import Blob
+
+    # Touching the blob keeps garbage collection off it until the document referencing it is saved
+    if Blob.objects.filter(name=name).update(touched_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            Blob.objects.create(name=name, sha256=sha256, size=size)
+    except IntegrityError:
+        Blob.objects.filter(name=name).update(touched_at=timezone.now())
+
+
+document_storage = ContentAddressedStorage()
+
+
+def get_document_storage():
+    return document_storage
@@ -0,0 +1,181 @@
+import io
+import os
+import shutil
+import tempfile
+import zlib
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from .models import Blob, Document, UploadSession
+from .previews import preview_names
+from .storage import document_storage
+from .uploads import write_chunk
+
+
+class MediaRootMixin:
+    """Runs each test against an empty MEDIA_ROOT"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class UploadSessionTests(MediaRootMixin, TestCase):
+    content = b'0123456789abcdefghij'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('uploader', password='pass12345')
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/documents/uploads/', {
+            'document_name': 'Inventory', 'filename': 'inventory.txt', 'size': len(self.content),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.session_url = f"/api/documents/uploads/{response.json()['id']}/"
+        self.session = UploadSession.objects.get(pk=response.json()['id'])
+
+    def put(self, start, end):
+        return self.client.generic(
+            'PUT', self.session_url, self.content[start:end], content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end - 1}/{len(self.content)}',
+        )
+
+    def test_chunks_in_order_complete_the_document(self):
+        self.assertEqual(self.put(0, 8).json()['received'], 8)
+        self.assertEqual(self.put(8, 20).json()['received'], 20)
+        crc32 = f'{zlib.crc32(self.content):08x}'
+        response = self.client.post(f'{self.session_url}complete/', {'crc32': crc32}, format='json')
+        self.assertEqual(response.status_code, 201)
+        document = Document.objects.get(pk=response.json()['id'])
+        with document.file_path.open('rb') as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertFalse(os.path.exists(self.session.part_path))
+
+    def test_out_of_order_chunk_reports_where_to_resume(self):
+        self.put(0, 8)
+        response = self.put(12, 20)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['received'], 8)
+        # A retried chunk the server already has is refused the same way
+        self.assertEqual(self.put(0, 8).status_code, 409)
+        self.assertEqual(self.client.get(self.session_url).json()['received'], 8)
+        self.put(8, 20)
+        response = self.client.post(f'{self.session_url}complete/', {'crc32': f'{zlib.crc32(self.content):08x}'},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_incomplete_upload_cannot_complete(self):
+        self.put(0, 8)
+        response = self.client.post(f'{self.session_url}complete/', format='json')
+        self.assertEqual(response.status_code, 409)
+
+    def test_checksum_mismatch_is_refused(self):
+        self.put(0, 20)
+        response = self.client.post(f'{self.session_url}complete/', {'crc32': '00000001'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_session_being_written_is_left_alone(self):
+        self.put(0, 8)
+        UploadSession.objects.filter(pk=self.session.pk).update(writing_until=timezone.now() + timedelta(minutes=1))
+        response = self.put(8, 20)
+        self.assertEqual(response.status_code, 409)
+        with open(self.session.part_path, 'rb') as part:
+            self.assertEqual(part.read(), self.content[:8])
+
+    def test_expired_lease_is_taken_over(self):
+        self.put(0, 8)
+        UploadSession.objects.filter(pk=self.session.pk).update(writing_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.put(8, 20).status_code, 200)
+        self.session.refresh_from_db()
+        self.assertEqual((self.session.received, self.session.writing_until), (20, None))
+
+    def test_only_one_writer_claims_an_offset(self):
+        session = UploadSession.objects.get(pk=self.session.pk)
+        stale = UploadSession.objects.get(pk=self.session.pk)
+        self.assertEqual(write_chunk(session, 0, io.BytesIO(self.content[:8]), 8)[:2], (True, 8))
+        # A second request that read the session before the first one finished
+        self.assertFalse(write_chunk(stale, 0, io.BytesIO(b'XXXXXXXX'), 8)[0])
+        with open(self.session.part_path, 'rb') as part:
+            self.assertEqual(part.read(), self.content[:8])
+
+
+class BlobStorageTests(MediaRootMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pass12345')
+
+    def document(self, content, name='scan.txt'):
+        return Document.objects.create(
+            user=self.user, document_name='Scan', file_path=ContentFile(content, name=name),
+        )
+
+    def ref_count(self, name):
+        return Blob.objects.get(name=name).ref_count
+
+    def gc(self):
+        call_command('gc_blobs', stdout=io.StringIO())
+
+    def test_identical_content_shares_one_blob(self):
+        first = self.document(b'passport')
+        second = self.document(b'passport', name='copy.txt')
+        self.assertEqual(first.file_path.name, second.file_path.name)
+        self.assertTrue(first.file_path.name.startswith('blobs/'))
+        self.assertEqual(Blob.objects.count(), 1)
+        self.assertEqual(self.ref_count(first.file_path.name), 2)
+
+    def test_replace_moves_the_reference(self):
+        document = self.document(b'first draft')
+        old_name = document.file_path.name
+        document.file_path = ContentFile(b'second draft', name='scan.txt')
+        document.save()
+        self.assertEqual((self.ref_count(old_name), self.ref_count(document.file_path.name)), (0, 1))
+        # Saving other fields does not count the same file again
+        document = Document.objects.get(pk=document.pk)
+        document.description = 'Signed'
+        document.save()
+        self.assertEqual(self.ref_count(document.file_path.name), 1)
+
+    def test_delete_releases_the_reference_and_keeps_the_file(self):
+        document = self.document(b'visa')
+        kept = self.document(b'visa', name='other.txt')
+        name = document.file_path.name
+        document.delete()
+        self.assertEqual(self.ref_count(name), 1)
+        kept.delete()
+        self.assertEqual(self.ref_count(name), 0)
+        self.assertTrue(document_storage.exists(name))
+
+    def test_gc_purges_unreferenced_blobs_past_the_grace_period(self):
+        orphan = self.document(b'orphan')
+        name = orphan.file_path.name
+        renditions = preview_names(name)
+        for rendition in renditions:
+            default_storage.save(rendition, ContentFile(b'jpeg'))
+        referenced = self.document(b'referenced').file_path.name
+        orphan.delete()
+        # Recently stored or matched blobs wait out the grace period
+        self.gc()
+        self.assertTrue(document_storage.exists(name))
+        Blob.objects.update(touched_at=timezone.now() - timedelta(days=2))
+        self.gc()
+        self.assertFalse(Blob.objects.filter(name=name).exists())
+        self.assertFalse(document_storage.exists(name))
+        self.assertFalse(any(default_storage.exists(rendition) for rendition in renditions))
+        self.assertTrue(document_storage.exists(referenced))
+        self.assertEqual(self.ref_count(referenced), 1)
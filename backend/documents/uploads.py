@@ -0,0 +1,99 @@
+import os
+import re
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from .models import Document, UploadSession
+from .storage import document_storage
+
+# Bytes read from the request and written to disk at a time
+BLOCK_SIZE = 64 * 1024
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+def parse_content_range(value):
+    """``(start, end, total)`` from a ``Content-Range: bytes start-end/total`` header, or ``None``"""
+    match = CONTENT_RANGE.match(value.strip())
+    if match is None:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == '*' else int(total)
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    Copy ``length`` bytes from ``stream`` into the session's part file at
+    ``offset``, a block at a time, extending the running CRC-32. If the
+    client goes away mid-chunk, the bytes that did arrive are kept so the
+    next attempt resumes after them. Returns ``(accepted, received, crc32)``;
+    ``accepted`` is false when another request moved the session first or
+    is writing to it, in which case the part file is left untouched.
+    """
+    # Claim the session at this offset before touching the file, so two
+    # requests for the same chunk cannot both write it
+    lease = timezone.now() + timedelta(seconds=settings.UPLOAD_CHUNK_LEASE_SECONDS)
+    claimed = UploadSession.objects.filter(
+        Q(writing_until__isnull=True) | Q(writing_until__lt=timezone.now()),
+        pk=session.pk, status='open', received=offset,
+    ).update(writing_until=lease)
+    if not claimed:
+        return False, session.received, session.crc32
+
+    path = session.part_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    crc = session.crc32
+    written = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as part:
+        part.seek(offset)
+        part.truncate()
+        try:
+            while written < length:
+                block = stream.read(min(BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                part.write(block)
+                crc = zlib.crc32(block, crc)
+                written += len(block)
+        except (OSError, UnreadablePostError):
+            pass
+
+    received = offset + written
+    # Fails only if the lease ran out and another request took over
+    accepted = UploadSession.objects.filter(pk=session.pk, received=offset, writing_until=lease).update(
+        received=received, crc32=crc, writing_until=None, updated_at=timezone.now(),
+    )
+    return bool(accepted), received, crc
+
+
+def finalize_upload(session):
+    """Move the completed part file into document storage and create its Document"""
+    # Hashed and renamed into place rather than copied; an identical blob is reused
+    name = document_storage.adopt(session.part_path, session.filename)
+    with transaction.atomic():
+        document = Document.objects.create(
+            user_id=session.user_id,
+            relocation_id=session.relocation_id,
+            document_name=session.document_name,
+            document_type=session.document_type,
+            description=session.description,
+            file_path=name,
+        )
+        session.status = 'completed'
+        session.document = document
+        session.save(update_fields=['status', 'document', 'updated_at'])
+    return document
+
+
+def discard_upload(session):
+    try:
+        os.remove(session.part_path)
+    except FileNotFoundError:
+        pass
+    session.delete()
@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DocumentViewSet
+from .views import DocumentViewSet, UploadSessionViewSet
 
 router = DefaultRouter()
+# Ahead of the documents themselves, whose detail route would otherwise match 'uploads'
+router.register(r'uploads', UploadSessionViewSet, basename='upload-session')
 router.register(r'', DocumentViewSet, basename='document')
 
 urlpatterns = [
@@ -1,10 +1,21 @@
-from rest_framework import viewsets, permissions
-from .models import Document
-from .serializers import DocumentSerializer, DocumentCreateSerializer
+import os
 
+from django.conf import settings
+from rest_framework import mixins, viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from accounts.principal import get_principal
+from core.conditional import ConditionalViewSetMixin
+from core.query_plans import QueryPlanMixin
+from .models import Document, UploadSession
+from .serializers import DocumentSerializer, DocumentCreateSerializer, UploadSessionSerializer
+from .downloads import FileContentNegotiation, serve_file
+from .uploads import discard_upload, finalize_upload, parse_content_range, write_chunk
 
-class DocumentViewSet(viewsets.ModelViewSet):
+
+class DocumentViewSet(ConditionalViewSetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    query_plan = DocumentSerializer.query_plan
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -12,12 +23,136 @@ class DocumentViewSet(viewsets.ModelViewSet):
         return DocumentSerializer
     
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return Document.objects.all()
-        return Document.objects.filter(user=user)
+        return Document.objects.filter(user_id=principal.user_id)
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
+    
+    @action(detail=True, methods=['get'], content_negotiation_class=FileContentNegotiation)
+    def download(self, request, pk=None):
+        """Download the document's file"""
+        document = self.get_object()
+        response = None
+        if document.file_path:
+            # Stored under a content hash, so name the download after the document
+            extension = os.path.splitext(document.file_path.name)[1]
+            response = serve_file(request, document.file_path, filename=f'{document.document_name}{extension}')
+        if response is None:
+            return Response({'error': 'File not found'}, status=status.HTTP_404_NOT_FOUND)
+        return response
+    
+    @action(detail=True, methods=['get'], content_negotiation_class=FileContentNegotiation)
+    def thumbnail(self, request, pk=None):
+        """Download the document's thumbnail"""
+        return self.serve_rendition(request, 'thumbnail')
+    
+    @action(detail=True, methods=['get'], content_negotiation_class=FileContentNegotiation)
+    def preview(self, request, pk=None):
+        """Download the document's web-sized preview"""
+        return self.serve_rendition(request, 'preview')
+    
+    def serve_rendition(self, request, field_name):
+        # Renditions of passport and visa scans are as private as the document
+        document = self.get_object()
+        rendition = getattr(document, field_name)
+        response = None
+        if rendition:
+            response = serve_file(request, rendition, filename=f'{document.document_name}-{field_name}.jpg')
+        if response is None:
+            return Response({'error': 'File not found'}, status=status.HTTP_404_NOT_FOUND)
+        return response
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    Resumable chunked document uploads. Open a session with the file's
+    name and size, PUT the bytes in order with ``Content-Range`` (or
+    ``?offset=``), then POST ``complete/`` to create the Document. After an
+    interruption, GET the session and continue from ``received``.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        principal = get_principal(self.request)
+        if principal.is_admin:
+            return UploadSession.objects.all()
+        return UploadSession.objects.filter(user_id=principal.user_id)
+    
+    def update(self, request, pk=None):
+        """Append a chunk of the file"""
+        session = self.get_object()
+        if session.status != 'open':
+            return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+        
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length <= 0:
+            return Response({'error': 'Chunk body required'}, status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {'error': f'Chunks are limited to {settings.UPLOAD_CHUNK_MAX_SIZE} bytes'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        
+        content_range = request.META.get('HTTP_CONTENT_RANGE')
+        if content_range:
+            parsed = parse_content_range(content_range)
+            if parsed is None or parsed[1] - parsed[0] + 1 != length or parsed[2] not in (None, session.size):
+                return Response({'error': 'Invalid Content-Range'}, status=status.HTTP_400_BAD_REQUEST)
+            offset = parsed[0]
+        else:
+            try:
+                offset = int(request.query_params.get('offset', session.received))
+            except ValueError:
+                return Response({'error': 'offset must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if offset != session.received:
+            # Tell the client where to resume from
+            return Response(
+                {'error': 'Chunk does not start where the upload left off', 'received': session.received},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if offset + length > session.size:
+            return Response({'error': 'Chunk extends past the declared size'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        accepted, received, crc32 = write_chunk(session, offset, request.stream, length)
+        if not accepted:
+            session.refresh_from_db(fields=['received'])
+            return Response(
+                {'error': 'Another request is writing to or wrote to this upload first', 'received': session.received},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({'received': received, 'size': session.size, 'crc32': f'{crc32:08x}'})
+    
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+    
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Finish the upload and create the document"""
+        session = self.get_object()
+        if session.status != 'open':
+            return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+        if session.received != session.size:
+            return Response(
+                {'error': 'Upload is incomplete', 'received': session.received, 'size': session.size},
+                status=status.HTTP_409_CONFLICT,
+            )
+        expected = request.data.get('crc32')
+        if expected and str(expected).lower().lstrip('0') != f'{session.crc32:x}'.lstrip('0'):
+            return Response(
+                {'error': 'Checksum mismatch', 'crc32': f'{session.crc32:08x}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        document = finalize_upload(session)
+        serializer = DocumentSerializer(document, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,97 @@
+import multiprocessing
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.checks import Tags
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import purge_finished, requeue_abandoned
+from jobs.worker import Worker, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the database queue on a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.JOBS_WORKER_PROCESSES,
+            help='Worker processes to run; 1 runs the worker in this process',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.JOBS_POLL_INTERVAL,
+            help='Seconds an idle worker waits before looking for due jobs again',
+        )
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due')
+
+    def handle(self, *args, **options):
+        # Workers are separate processes from the web server, so they need the shared cache
+        self.check(tags=[Tags.caches], include_deployment_checks=True)
+        self.maintain()
+        processes = max(1, options['processes'])
+        self.stdout.write(f'Running jobs on {processes} process(es)')
+        if processes == 1:
+            # No supervisor in this case, so the worker keeps up the maintenance
+            worker = Worker(
+                poll_interval=options['poll_interval'], burst=options['burst'],
+                maintain=self.maintain, maintenance_interval=settings.JOBS_MAINTENANCE_INTERVAL,
+            )
+            processed = worker.run()
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s)'))
+            return
+        self.supervise(processes, options['poll_interval'], options['burst'])
+
+    def supervise(self, processes, poll_interval, burst):
+        """Keep ``processes`` workers alive, restarting any that die, until signalled"""
+        context = multiprocessing.get_context('spawn')
+        stopping = False
+
+        def stop(*args):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        # Children open their own connections
+        connections.close_all()
+
+        host = socket.gethostname()
+        workers = {}
+        last_maintenance = time.monotonic()
+        while True:
+            for slot in range(processes):
+                process = workers.get(slot)
+                if stopping or (process is not None and (process.is_alive() or (burst and process.exitcode == 0))):
+                    continue
+                if process is not None:
+                    self.stderr.write(f'Worker {slot} exited with {process.exitcode}, restarting')
+                process = context.Process(
+                    target=run_worker, args=(f'{host}:{slot}', poll_interval, burst), daemon=True,
+                )
+                process.start()
+                workers[slot] = process
+
+            alive = [process for process in workers.values() if process.is_alive()]
+            if stopping:
+                for process in alive:
+                    process.terminate()
+                for process in alive:
+                    process.join()
+                break
+            if not alive and burst:
+                break
+
+            if time.monotonic() - last_maintenance >= settings.JOBS_MAINTENANCE_INTERVAL:
+                self.maintain()
+                connections.close_all()
+                last_maintenance = time.monotonic()
+            time.sleep(1)
+        self.stdout.write(self.style.SUCCESS('Workers stopped'))
+
+    def maintain(self):
+        requeued = requeue_abandoned()
+        if requeued:
+            self.stderr.write(f'Recovered {requeued} abandoned job(s)')
+        purge_finished()
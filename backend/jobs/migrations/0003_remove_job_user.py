@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_user'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='job',
+            name='user',
+        ),
+    ]
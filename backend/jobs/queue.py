@@ -0,0 +1,165 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.metrics import metrics
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class Task:
+    """A function registered with the job queue; call it directly or ``.delay()`` it"""
+
+    def __init__(self, fn, name, priority=0, max_attempts=None):
+        self.fn = fn
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.__doc__ = fn.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)
+
+    def delay(self, **kwargs):
+        return enqueue(self.name, kwargs)
+
+    def __repr__(self):
+        return f'<Task {self.name}>'
+
+
+def task(name=None, priority=0, max_attempts=None):
+    """
+    Register a function as a job, under ``<module>.<function>`` unless
+    ``name`` is given. Arguments are passed as JSON, so pass ids rather than
+    model instances.
+    """
+    def decorator(fn):
+        registered = Task(fn, name or f'{fn.__module__}.{fn.__name__}', priority, max_attempts)
+        registry[registered.name] = registered
+        return registered
+    return decorator
+
+
+def enqueue(name, kwargs=None, priority=None, run_at=None, max_attempts=None):
+    """
+    Queue the task ``name``. The job row is written in the caller's
+    transaction, so workers only see it once that transaction commits and
+    never see it if it rolls back. With JOBS_RUN_INLINE the job runs in this
+    process right after the commit instead.
+    """
+    registered = registry.get(name)
+    if registered is None:
+        raise LookupError(f'No task registered as {name!r}')
+    job = Job.objects.create(
+        name=name,
+        kwargs=kwargs or {},
+        priority=registered.priority if priority is None else priority,
+        max_attempts=max_attempts or registered.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+    metrics.incr('jobs.enqueued')
+    if settings.JOBS_RUN_INLINE:
+        transaction.on_commit(lambda: run_job(job.pk, 'inline'))
+    return job
+
+
+def claim(worker, pk=None):
+    """
+    Atomically take the most urgent due job (or job ``pk``) for ``worker``.
+    The claim is a conditional UPDATE, so two workers racing for the same
+    row cannot both win; the loser moves on to the next candidate.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status='queued', run_at__lte=now)
+    if pk is not None:
+        candidates = [pk]
+    else:
+        candidates = list(due.order_by('-priority', 'run_at', 'id').values_list('pk', flat=True)[:settings.JOBS_CLAIM_BATCH])
+    for candidate in candidates:
+        claimed = due.filter(pk=candidate).update(
+            status='running', locked_by=worker, locked_at=now, started_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate)
+    return None
+
+
+def execute(job):
+    """
+    Run a claimed job. The task and the job's success are committed in one
+    transaction, so a task that only writes to the database takes effect
+    exactly once even if the worker dies part way through.
+    """
+    metrics.observe('jobs.latency', (job.started_at - job.run_at).total_seconds())
+    registered = registry.get(job.name)
+    try:
+        if registered is None:
+            raise LookupError(f'No task registered as {job.name!r}')
+        with transaction.atomic():
+            registered.fn(**job.kwargs)
+            Job.objects.filter(pk=job.pk).update(status='succeeded', finished_at=timezone.now(), last_error='')
+    except Exception:
+        retry_or_fail(job, traceback.format_exc())
+        return False
+    metrics.observe('jobs.duration', (timezone.now() - job.started_at).total_seconds())
+    metrics.incr('jobs.succeeded')
+    return True
+
+
+def retry_or_fail(job, error):
+    if job.attempts < job.max_attempts:
+        delay = backoff(job.attempts)
+        logger.warning('Job %s (%s) failed, retrying in %.0fs', job.pk, job.name, delay)
+        Job.objects.filter(pk=job.pk).update(
+            status='queued', run_at=timezone.now() + timedelta(seconds=delay), locked_by='', locked_at=None,
+            last_error=error,
+        )
+        metrics.incr('jobs.retried')
+    else:
+        logger.error('Job %s (%s) failed after %s attempts', job.pk, job.name, job.attempts)
+        Job.objects.filter(pk=job.pk).update(status='failed', finished_at=timezone.now(), last_error=error)
+        metrics.incr('jobs.failed')
+
+
+def backoff(attempts):
+    """Seconds before retry number ``attempts``: exponential, capped, with jitter"""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.75, 1.25)
+
+
+def run_job(pk, worker):
+    """Claim and run one specific job, if nobody else has"""
+    job = claim(worker, pk=pk)
+    if job is not None:
+        execute(job)
+
+
+def requeue_abandoned():
+    """
+    Hand back jobs whose worker died mid-run (their lease expired). Jobs out
+    of attempts are failed instead. Returns the number of rows touched.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+    abandoned = Job.objects.filter(status='running', locked_at__lt=cutoff)
+    error = 'Worker stopped before finishing the job'
+    failed = abandoned.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=timezone.now(), last_error=error,
+    )
+    requeued = abandoned.update(status='queued', run_at=timezone.now(), locked_by='', locked_at=None, last_error=error)
+    return failed + requeued
+
+
+def purge_finished():
+    """Delete succeeded jobs, and failed ones, older than JOBS_RETENTION_HOURS"""
+    cutoff = timezone.now() - timedelta(hours=settings.JOBS_RETENTION_HOURS)
+    deleted, _ = Job.objects.filter(Q(status='succeeded') | Q(status='failed'), finished_at__lt=cutoff).delete()
+    return deleted
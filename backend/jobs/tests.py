@@ -0,0 +1,122 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import backoff, claim, enqueue, execute, requeue_abandoned, task
+from .worker import Worker
+
+calls = []
+
+
+@task(name='jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='jobs.tests.explode')
+def explode():
+    raise RuntimeError('boom')
+
+
+@override_settings(JOBS_RUN_INLINE=False, JOBS_RETRY_BACKOFF=10, JOBS_RETRY_BACKOFF_MAX=60, JOBS_LEASE_SECONDS=300)
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_takes_a_job_once(self):
+        job = enqueue('jobs.tests.record', {'value': 1})
+        self.assertEqual(claim('worker-a', pk=job.pk).locked_by, 'worker-a')
+        # The loser of the race sees the row already running
+        self.assertIsNone(claim('worker-b', pk=job.pk))
+        self.assertIsNone(claim('worker-b'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('running', 1))
+
+    def test_claim_moves_on_when_a_candidate_is_taken(self):
+        first = enqueue('jobs.tests.record', {'value': 1}, priority=5)
+        second = enqueue('jobs.tests.record', {'value': 2})
+        update = QuerySet.update
+        raced = []
+
+        def racing_update(queryset, **kwargs):
+            # Another worker takes the most urgent job between listing and claiming
+            if not raced:
+                raced.append(update(Job.objects.filter(pk=first.pk), status='running', locked_by='worker-b'))
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=racing_update):
+            self.assertEqual(claim('worker-a').pk, second.pk)
+        first.refresh_from_db()
+        self.assertEqual(first.locked_by, 'worker-b')
+
+    def test_claim_skips_jobs_not_yet_due(self):
+        enqueue('jobs.tests.record', {'value': 1}, run_at=timezone.now() + timedelta(minutes=1))
+        self.assertIsNone(claim('worker-a'))
+
+    def test_claim_prefers_priority(self):
+        enqueue('jobs.tests.record', {'value': 1})
+        urgent = enqueue('jobs.tests.record', {'value': 2}, priority=10)
+        self.assertEqual(claim('worker-a').pk, urgent.pk)
+
+    def test_execute_marks_success(self):
+        job = enqueue('jobs.tests.record', {'value': 7})
+        self.assertTrue(execute(claim('worker-a', pk=job.pk)))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(calls, [7])
+
+    def test_failures_back_off_then_fail(self):
+        job = enqueue('jobs.tests.explode', max_attempts=3)
+        for attempt in (1, 2):
+            before = timezone.now()
+            self.assertFalse(execute(claim('worker-a', pk=job.pk)))
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts, job.locked_by), ('queued', attempt, ''))
+            self.assertIn('RuntimeError: boom', job.last_error)
+            # 10s doubling per attempt, within the jitter
+            delay = (job.run_at - before).total_seconds()
+            self.assertGreaterEqual(delay, 10 * 2 ** (attempt - 1) * 0.75 - 1)
+            self.assertLessEqual(delay, 10 * 2 ** (attempt - 1) * 1.25 + 1)
+            self.assertIsNone(claim('worker-a', pk=job.pk))
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        self.assertFalse(execute(claim('worker-a', pk=job.pk)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(claim('worker-a'))
+
+    def test_backoff_is_capped(self):
+        self.assertLessEqual(backoff(20), 60 * 1.25)
+
+    def test_expired_lease_is_requeued(self):
+        job = enqueue('jobs.tests.record', {'value': 1})
+        claim('worker-a', pk=job.pk)
+        self.assertEqual(requeue_abandoned(), 0)
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=301))
+        self.assertEqual(requeue_abandoned(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.locked_at), ('queued', '', None))
+        self.assertEqual(claim('worker-b').pk, job.pk)
+
+    def test_expired_lease_out_of_attempts_fails(self):
+        job = enqueue('jobs.tests.record', {'value': 1}, max_attempts=1)
+        claim('worker-a', pk=job.pk)
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=301))
+        self.assertEqual(requeue_abandoned(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+
+    @mock.patch('jobs.worker.connections')
+    @mock.patch('jobs.worker.close_old_connections')
+    def test_worker_runs_maintenance(self, close_old_connections, connections):
+        maintain = mock.Mock()
+        enqueue('jobs.tests.record', {'value': 1})
+        processed = Worker('worker-a', burst=True, maintain=maintain, maintenance_interval=0).run()
+        self.assertEqual(processed, 1)
+        self.assertEqual(maintain.call_count, 2)
+        self.assertEqual(calls, [1])
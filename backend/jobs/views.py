@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.db.models import Count, Min
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from accounts.permissions import IsAdministrator
+from core.metrics import percentile
+from .models import Job
+
+
+@api_view(['GET'])
+@permission_classes([IsAdministrator])
+def stats(request):
+    """Queue depth by status and job latency over the last ``?minutes=`` (default 15), read from the queue table"""
+    try:
+        minutes = max(1, int(request.query_params.get('minutes', 15)))
+    except ValueError:
+        minutes = 15
+    now = timezone.now()
+    counts = dict(Job.objects.order_by().values_list('status').annotate(total=Count('id')))
+    oldest_due = Job.objects.filter(status='queued', run_at__lte=now).aggregate(oldest=Min('run_at'))['oldest']
+    started = Job.objects.filter(started_at__gte=now - timedelta(minutes=minutes)).order_by('-started_at')
+    latencies = sorted(
+        (started_at - run_at).total_seconds()
+        for started_at, run_at in started.values_list('started_at', 'run_at')[:5000]
+    )
+    return Response({
+        'counts': {status: counts.get(status, 0) for status, _ in Job.STATUS_CHOICES},
+        'oldest_due_seconds': (now - oldest_due).total_seconds() if oldest_due else 0,
+        'latency': {
+            'window_minutes': minutes,
+            'count': len(latencies),
+            'p50': percentile(latencies, 50),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None,
+        },
+    })
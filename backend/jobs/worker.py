@@ -0,0 +1,65 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Claims and runs jobs one at a time until stopped. SIGTERM and SIGINT let
+    the current job finish before the loop exits. In burst mode the worker
+    also exits as soon as no job is due. ``maintain``, when given, is called
+    every ``maintenance_interval`` seconds between jobs.
+    """
+
+    def __init__(self, name=None, poll_interval=1.0, burst=False, maintain=None, maintenance_interval=60):
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.maintain = maintain
+        self.maintenance_interval = maintenance_interval
+        self.stopping = threading.Event()
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def run(self):
+        # Imported here so a spawned worker process can set Django up first
+        from .queue import claim, execute
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        processed = 0
+        last_maintenance = time.monotonic()
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                if self.maintain is not None and time.monotonic() - last_maintenance >= self.maintenance_interval:
+                    self.maintain()
+                    last_maintenance = time.monotonic()
+                job = claim(self.name)
+                if job is None:
+                    if self.burst:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                execute(job)
+                processed += 1
+        finally:
+            connections.close_all()
+        logger.info('Worker %s stopped after %s job(s)', self.name, processed)
+        return processed
+
+
+def run_worker(name, poll_interval, burst):
+    """Entry point of a worker process started by run_jobs"""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'relocation_system.settings')
+    django.setup()
+    Worker(name, poll_interval, burst).run()
@@ -31,6 +31,11 @@ class Payment(models.Model):
     class Meta:
         db_table = 'payments'
         ordering = ['-created_at']
+        # Keyset pagination scans (created_at, id); users reach their payments through bookings(user)
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='payments_created_idx'),
+            models.Index(fields=['booking', '-created_at', '-id'], name='payments_booking_created_idx'),
+        ]
     
     def __str__(self):
         return f"Payment {self.id}: {self.amount} - {self.status}"
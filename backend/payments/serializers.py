@@ -1,16 +1,18 @@
 from rest_framework import serializers
 from .models import Payment
 from bookings.serializers import BookingSerializer
+from core.serializers import ExpandableFieldsMixin
 
 
-class PaymentSerializer(serializers.ModelSerializer):
-    booking = BookingSerializer(read_only=True)
-    
+class PaymentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = ('id', 'booking', 'amount', 'payment_date', 'payment_method', 
                   'status', 'transaction_id', 'notes', 'created_at', 'updated_at')
         read_only_fields = ('id', 'payment_date', 'created_at', 'updated_at')
+        expandable_fields = {'booking': BookingSerializer}
+
+    query_plan = BookingSerializer.query_plan.nested('booking')
 
 
 class PaymentCreateSerializer(serializers.ModelSerializer):
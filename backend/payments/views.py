@@ -1,10 +1,28 @@
 from rest_framework import viewsets, permissions
+from core.pagination import PaginationModeMixin
+from accounts.principal import get_principal
+from core.conditional import ConditionalViewSetMixin
+from core.exports import ExportMixin
+from core.query_plans import QueryPlanMixin
 from .models import Payment
 from .serializers import PaymentSerializer, PaymentCreateSerializer
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ConditionalViewSetMixin, QueryPlanMixin, PaginationModeMixin, ExportMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    query_plan = PaymentSerializer.query_plan
+    export_fields = {
+        'id': 'id',
+        'booking_id': 'booking_id',
+        'customer': 'booking__user__username',
+        'service_provider': 'booking__service_provider__company_name',
+        'amount': 'amount',
+        'payment_method': 'payment_method',
+        'status': 'status',
+        'transaction_id': 'transaction_id',
+        'payment_date': 'payment_date',
+        'created_at': 'created_at',
+    }
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -12,8 +30,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
         return PaymentSerializer
     
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return Payment.objects.all()
         # Users can see payments for their bookings
-        return Payment.objects.filter(booking__user=user)
+        return Payment.objects.filter(booking__user_id=principal.user_id)
@@ -0,0 +1,26 @@
+"""
+Async read endpoints served by the ASGI application, mirroring the list and
+retrieve routes of the corresponding viewsets.
+"""
+from django.urls import path
+
+from bookings.views import BookingViewSet
+from core.views import AsyncReadView
+from documents.views import DocumentViewSet
+from relocations.views import RelocationViewSet
+from shipments.views import ShipmentViewSet
+
+resources = {
+    'relocations': RelocationViewSet,
+    'bookings': BookingViewSet,
+    'shipments': ShipmentViewSet,
+    'documents': DocumentViewSet,
+}
+
+urlpatterns = []
+for prefix, viewset_class in resources.items():
+    view = AsyncReadView.as_view(viewset_class=viewset_class)
+    urlpatterns += [
+        path(f'{prefix}/', view, name=f'async-{prefix}-list'),
+        path(f'{prefix}/<int:pk>/', view, name=f'async-{prefix}-detail'),
+    ]
@@ -35,6 +35,9 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'corsheaders',
     'django_filters',
+    'core',
+    'jobs',
+    'search',
     'accounts',
     'relocations',
     'bookings',
@@ -136,6 +139,141 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resumable document uploads: largest document accepted, largest single
+# chunk, and hours an unfinished upload session is kept. A request writing a
+# chunk holds the session for UPLOAD_CHUNK_LEASE_SECONDS at most, after which
+# a retry may take over from a writer that died
+DOCUMENT_UPLOAD_MAX_SIZE = 100 * 1024 * 1024
+UPLOAD_CHUNK_MAX_SIZE = 8 * 1024 * 1024
+UPLOAD_SESSION_EXPIRY_HOURS = 24
+UPLOAD_CHUNK_LEASE_SECONDS = 600
+
+# Hours an unreferenced document blob is kept before gc_blobs deletes it
+BLOB_GC_GRACE_HOURS = 24
+
+# Document downloads: leave unset to stream files from Django, or let the
+# front proxy send them with 'x-accel-redirect' (nginx; map
+# DOCUMENT_SENDFILE_PREFIX to MEDIA_ROOT in an internal location) or
+# 'x-sendfile' (Apache mod_xsendfile, lighttpd)
+DOCUMENT_SENDFILE = os.environ.get('DOCUMENT_SENDFILE') or None
+DOCUMENT_SENDFILE_PREFIX = '/protected-media/'
+
+# Caching
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Per-process memory by default; point this at Redis or Memcached when running
+# more than one worker so invalidation reaches every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'relocation-system',
+    },
+    # Memoized quotations, kept apart so their volume cannot cull the
+    # version and generation counters in the default cache. Entries are
+    # keyed by everything that prices them, so they may live for a day.
+    'quotes': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'relocation-system-quotes',
+        'TIMEOUT': 86400,
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# Seconds a caller's resolved role and provider profile stay cached
+PRINCIPAL_CACHE_TIMEOUT = 300
+
+# Seconds an authenticated user stays cached between JWT-authenticated calls
+USER_CACHE_TIMEOUT = 60
+
+# Seconds a shipment's tracking payload stays cached; saves refresh it eagerly
+TRACKING_CACHE_TIMEOUT = 3600
+
+# Shipment event streams (SSE): seconds events are kept in the database for
+# Last-Event-ID resume (`manage.py prune_stream_events` deletes older ones), most missed events replayed before a stream restarts
+# from a snapshot, seconds between each process's polls for new events, events
+# queued per slow subscriber before its stream is closed, seconds between
+# keep-alive comments, and seconds before a stream ends so the client
+# reconnects (and resumes) through the load balancer.
+SHIPMENT_EVENTS_RETENTION = 3600
+SHIPMENT_EVENTS_MAX_REPLAY = 1000
+SHIPMENT_EVENTS_POLL_INTERVAL = 0.5
+SHIPMENT_EVENTS_MAX_PENDING = 100
+SHIPMENT_EVENTS_HEARTBEAT = 15
+SHIPMENT_EVENTS_MAX_STREAM_SECONDS = 300
+
+# Shipment location history: most pings accepted per ingestion request, and
+# the default window (seconds) and most points a history read returns
+SHIPMENT_PINGS_MAX_BATCH = 1000
+SHIPMENT_HISTORY_INTERVAL = 300
+SHIPMENT_HISTORY_MAX_POINTS = 2000
+
+# Most entries accepted by one bulk shipment status update
+SHIPMENT_STATUS_MAX_BATCH = 500
+
+# Most items accepted by one batch create (relocations, bookings)
+BATCH_CREATE_MAX_ITEMS = 200
+
+# Rows fetched per database round trip, and written per chunk, by streaming exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Password hashing runs on a bounded process pool so login spikes do not pin
+# request workers; requests beyond workers + pending are rejected with 503.
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', os.cpu_count() or 2))
+PASSWORD_HASHING_MAX_PENDING = int(os.environ.get('PASSWORD_HASHING_MAX_PENDING', 64))
+
+# Thumbnails and previews of image documents are rendered on their own
+# bounded process pool after upload; documents that do not fit stay pending
+# for `manage.py generate_previews`. Sizes are the longest edge in pixels.
+DOCUMENT_PREVIEW_WORKERS = int(os.environ.get('DOCUMENT_PREVIEW_WORKERS', 1))
+DOCUMENT_PREVIEW_MAX_PENDING = int(os.environ.get('DOCUMENT_PREVIEW_MAX_PENDING', 32))
+DOCUMENT_THUMBNAIL_SIZE = 256
+DOCUMENT_PREVIEW_SIZE = 1280
+
+# Quotations: route distance is the great-circle distance times the route
+# factor; moves within a city, or to a city missing from the reference table,
+# are priced at the local distance. Providers without a rate card, and
+# relocations not booked with one, are quoted at the default rates.
+QUOTATION_ROUTE_FACTOR = 1.25
+QUOTATION_LOCAL_DISTANCE_KM = 25
+QUOTATION_PEAK_MONTHS = (6, 7, 8, 12)
+QUOTATION_DEFAULT_RATES = {
+    'base_fee': '300.00',
+    'rate_per_km': '1.200',
+    'rate_per_cubic_meter': '35.00',
+    'rate_per_kg': '0.150',
+    'minimum_charge': '500.00',
+    'peak_multiplier': '1.15',
+}
+# Single quotes are memoized per process (LRU of this many entries) in front
+# of the 'quotes' cache
+QUOTATION_MEMO_SIZE = 10000
+# Largest quantity of one inventory entry ("20 boxes"); larger ones are
+# rejected when a relocation is written and priced at this quantity otherwise
+QUOTATION_MAX_ITEM_QUANTITY = 1000
+# Relocations per batch quote request, and relocation x provider cells
+QUOTATION_BATCH_MAX_ITEMS = 5000
+QUOTATION_BATCH_MAX_CELLS = 1000000
+
+# Background jobs live in the `jobs` table and run under `manage.py run_jobs`.
+# Failed jobs retry with exponential backoff (base and cap in seconds); a
+# running job whose worker has been silent for the lease is handed back.
+# JOBS_RUN_INLINE runs each job in the enqueuing process after commit instead,
+# for development without a worker; run_jobs refuses to start on a
+# process-local cache, where workers' invalidations would not reach the web.
+JOBS_RUN_INLINE = os.environ.get('JOBS_RUN_INLINE', str(DEBUG)) == 'True'
+JOBS_WORKER_PROCESSES = int(os.environ.get('JOBS_WORKER_PROCESSES', os.cpu_count() or 2))
+JOBS_POLL_INTERVAL = float(os.environ.get('JOBS_POLL_INTERVAL', 1.0))
+JOBS_CLAIM_BATCH = 10
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BACKOFF = 10
+JOBS_RETRY_BACKOFF_MAX = 3600
+JOBS_LEASE_SECONDS = 600
+JOBS_MAINTENANCE_INTERVAL = 60
+JOBS_RETENTION_HOURS = 72
+
+# Maximum concurrent database operations from async views per process
+ASYNC_DB_CONCURRENCY = int(os.environ.get('ASYNC_DB_CONCURRENCY', 10))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -147,7 +285,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -157,6 +295,7 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
+        'search.filters.FullTextSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
 }
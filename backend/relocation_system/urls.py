@@ -3,8 +3,6 @@ URL configuration for relocation_system project.
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,7 +13,10 @@ urlpatterns = [
     path('api/shipments/', include('shipments.urls')),
     path('api/documents/', include('documents.urls')),
     path('api/reviews/', include('reviews.urls')),
+    path('api/metrics/', include('core.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/async/', include('relocation_system.async_urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# MEDIA_ROOT holds only private documents and their renditions, which are
+# served by the authenticated document actions, so it is not exposed here
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Relocation
+from .models import Relocation, RateCard
 
 
 @admin.register(Relocation)
@@ -7,3 +7,9 @@ class RelocationAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'origin', 'destination', 'moving_date', 'status', 'estimated_cost')
     list_filter = ('status', 'moving_date')
     search_fields = ('origin', 'destination', 'user__username')
+
+
+@admin.register(RateCard)
+class RateCardAdmin(admin.ModelAdmin):
+    list_display = ('service_provider', 'base_fee', 'rate_per_km', 'rate_per_cubic_meter', 'rate_per_kg', 'updated_at')
+    search_fields = ('service_provider__company_name',)
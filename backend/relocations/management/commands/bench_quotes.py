@@ -0,0 +1,120 @@
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from relocations.models import Relocation, RateCard
+from relocations.memo import quote_memo
+from relocations.quotes import (
+    compute_quote, default_rate_card, locate, parse_inventory, price, profile, quote, rate_card_for, to_money,
+)
+from relocations.reference_data import CITY_COORDINATES, ITEM_CLASSES
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare quoting relocations one call at a time with the vectorized batch path: many relocations '
+        'at one rate card, and one relocation against many providers. With --database, also time the '
+        'calculate_quotation endpoint\'s work, one relocation at a time, against a batch quote over stored relocations (changes are rolled back). '
+        'Also reports the cost of a repeated, memoized quote.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--relocations', type=int, default=5000, help='Synthetic relocations to quote')
+        parser.add_argument('--providers', type=int, default=500, help='Synthetic provider rate cards')
+        parser.add_argument('--database', action='store_true', help='Also benchmark against stored relocations')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        relocations = [self.synthetic_relocation(rng) for _ in range(options['relocations'])]
+        cards = [self.synthetic_rate_card(rng) for _ in range(options['providers'])]
+        card = default_rate_card()
+
+        self.stdout.write(f"{'case':<32} {'per-call s':>10} {'batch s':>9} {'speed-up':>9}")
+        self.compare(
+            f'{len(relocations)} relocations x 1 card',
+            lambda: [compute_quote(relocation, card) for relocation in relocations],
+            lambda: price(profile(relocations), [card]),
+        )
+        self.compare(
+            f'1 relocation x {len(cards)} cards',
+            lambda: [compute_quote(relocations[0], rate_card) for rate_card in cards],
+            lambda: price(profile(relocations[:1]), cards),
+        )
+        self.repeat_quote(relocations[0], card)
+        if options['database']:
+            self.compare_database(options['relocations'])
+
+    def repeat_quote(self, relocation, card, repeats=10000):
+        quote_memo.clear()
+        started = time.perf_counter()
+        quote(relocation, card)
+        first = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(repeats):
+            quote(relocation, card)
+        repeated = (time.perf_counter() - started) / repeats
+        self.stdout.write(f'Repeat quote: first {first * 1e6:.0f} us, memoized {repeated * 1e6:.1f} us')
+
+    def compare(self, label, per_call, batch):
+        timings = []
+        for run in (per_call, batch):
+            # Start both paths from cold parse and geocoding caches
+            parse_inventory.cache_clear()
+            locate.cache_clear()
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(f'{label:<32} {timings[0]:>10.3f} {timings[1]:>9.3f} {timings[0] / timings[1]:>8.1f}x')
+
+    def compare_database(self, count):
+        ids = list(Relocation.objects.order_by('id').values_list('id', flat=True)[:count])
+        if not ids:
+            self.stderr.write('No stored relocations to quote')
+            return
+
+        def per_call():
+            # What POST /calculate_quotation/ does for each relocation
+            for relocation in Relocation.objects.filter(pk__in=ids):
+                relocation.estimated_cost = quote(relocation, rate_card_for(relocation)).estimated_cost
+                relocation.save(update_fields=['estimated_cost', 'updated_at'])
+
+        def batch():
+            rows = list(Relocation.objects.filter(pk__in=ids).only(
+                'id', 'origin', 'destination', 'moving_date', 'inventory',
+            ))
+            now = timezone.now()
+            for relocation, cost in zip(rows, price(profile(rows), [default_rate_card()])[:, 0]):
+                relocation.estimated_cost = to_money(cost)
+                relocation.updated_at = now
+            Relocation.objects.bulk_update(rows, ['estimated_cost', 'updated_at'], batch_size=500)
+
+        quote_memo.clear()
+        with transaction.atomic():
+            self.compare(f'{len(ids)} stored relocations, saved', per_call, batch)
+            transaction.set_rollback(True)
+
+    def synthetic_relocation(self, rng):
+        items = rng.sample(sorted(ITEM_CLASSES), rng.randint(3, 10))
+        inventory = ', '.join(f'{rng.randint(1, 4)} {item}' if rng.random() < 0.5 else item for item in items)
+        return Relocation(
+            origin=rng.choice(list(CITY_COORDINATES)).title(),
+            destination=rng.choice(list(CITY_COORDINATES)).title(),
+            moving_date=date(2026, rng.randint(1, 12), rng.randint(1, 28)),
+            inventory=inventory,
+        )
+
+    def synthetic_rate_card(self, rng):
+        return RateCard(
+            base_fee=Decimal(rng.randint(150, 600)),
+            rate_per_km=Decimal(str(round(rng.uniform(0.6, 2.0), 3))),
+            rate_per_cubic_meter=Decimal(str(round(rng.uniform(20, 60), 2))),
+            rate_per_kg=Decimal(str(round(rng.uniform(0.05, 0.3), 3))),
+            minimum_charge=Decimal(rng.randint(300, 900)),
+            peak_multiplier=Decimal(str(round(rng.uniform(1.0, 1.3), 2))),
+        )
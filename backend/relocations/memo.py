@@ -0,0 +1,72 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.metrics import metrics
+
+
+class QuoteMemo:
+    """
+    Memoized quotes: a bounded LRU in each process in front of the shared
+    cache, through which web processes and job workers reuse each other's
+    quotes. Keys end with the rate card's version, so a changed card is
+    never priced from a stale entry in any process.
+    """
+
+    def __init__(self, name, max_size, cache_alias):
+        self.name = name
+        self.max_size = max_size
+        self.cache_alias = cache_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is not None:
+            metrics.incr(f'{self.name}.hit')
+            return value
+        value = caches[self.cache_alias].get(self.cache_key(key))
+        if value is not None:
+            metrics.incr(f'{self.name}.shared_hit')
+            self._remember(key, value)
+            return value
+        metrics.incr(f'{self.name}.miss')
+        return None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        caches[self.cache_alias].set(self.cache_key(key), value)
+
+    def forget_rate_card(self, rate_card_id):
+        """Drop this process's entries priced with a rate card that changed or was deleted"""
+        with self._lock:
+            stale = [key for key in self._entries if key[-1][0] == rate_card_id]
+            for key in stale:
+                del self._entries[key]
+            metrics.gauge(f'{self.name}.size', len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            metrics.gauge(f'{self.name}.size', 0)
+
+    def cache_key(self, key):
+        return f'{self.name}:' + hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                metrics.incr(f'{self.name}.evicted')
+            metrics.gauge(f'{self.name}.size', len(self._entries))
+
+
+quote_memo = QuoteMemo('quotes.memo', settings.QUOTATION_MEMO_SIZE, 'quotes')
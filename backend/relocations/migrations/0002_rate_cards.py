@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_service_provider_rating_sum'),
+        ('relocations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base_fee', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('rate_per_km', models.DecimalField(decimal_places=3, max_digits=8)),
+                ('rate_per_cubic_meter', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('rate_per_kg', models.DecimalField(decimal_places=3, max_digits=8)),
+                ('minimum_charge', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('peak_multiplier', models.DecimalField(decimal_places=2, default=1, help_text='Applied to moves in peak months', max_digits=4)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('service_provider', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rate_card', to='accounts.serviceprovider')),
+            ],
+            options={
+                'db_table': 'rate_cards',
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:36
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relocations', '0002_rate_cards'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ratecard',
+            name='base_fee',
+            field=models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='ratecard',
+            name='minimum_charge',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='ratecard',
+            name='peak_multiplier',
+            field=models.DecimalField(decimal_places=2, default=1, help_text='Applied to moves in peak months', max_digits=4, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AlterField(
+            model_name='ratecard',
+            name='rate_per_cubic_meter',
+            field=models.DecimalField(decimal_places=2, max_digits=8, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='ratecard',
+            name='rate_per_kg',
+            field=models.DecimalField(decimal_places=3, max_digits=8, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='ratecard',
+            name='rate_per_km',
+            field=models.DecimalField(decimal_places=3, max_digits=8, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
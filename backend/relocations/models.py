@@ -1,5 +1,6 @@
+from django.core.validators import MinValueValidator
 from django.db import models
-from accounts.models import User
+from accounts.models import ServiceProvider, User
 
 
 class Relocation(models.Model):
@@ -27,3 +28,25 @@ class Relocation(models.Model):
     
     def __str__(self):
         return f"Relocation {self.id}: {self.origin} to {self.destination}"
+
+
+class RateCard(models.Model):
+    """A service provider's prices, applied by the quotation engine"""
+    service_provider = models.OneToOneField(ServiceProvider, on_delete=models.CASCADE, related_name='rate_card')
+    base_fee = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    rate_per_km = models.DecimalField(max_digits=8, decimal_places=3, validators=[MinValueValidator(0)])
+    rate_per_cubic_meter = models.DecimalField(max_digits=8, decimal_places=2, validators=[MinValueValidator(0)])
+    rate_per_kg = models.DecimalField(max_digits=8, decimal_places=3, validators=[MinValueValidator(0)])
+    minimum_charge = models.DecimalField(max_digits=10, decimal_places=2, default=0, validators=[MinValueValidator(0)])
+    peak_multiplier = models.DecimalField(
+        max_digits=4, decimal_places=2, default=1, validators=[MinValueValidator(1)],
+        help_text="Applied to moves in peak months",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'rate_cards'
+    
+    def __str__(self):
+        return f"Rate card for {self.service_provider.company_name}"
@@ -0,0 +1,296 @@
+import hashlib
+import math
+import re
+from collections import Counter
+from decimal import Decimal
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from .memo import quote_memo
+from .models import RateCard, Relocation
+from .reference_data import CITY_ALIASES, CITY_COORDINATES, ITEM_CLASSES, MISC_ITEM
+
+EARTH_RADIUS_KM = 6371.0
+
+RATE_FIELDS = ('base_fee', 'rate_per_km', 'rate_per_cubic_meter', 'rate_per_kg', 'minimum_charge', 'peak_multiplier')
+
+
+def normalize_place(place):
+    return re.sub(r'\s+', ' ', place.strip().lower())
+
+
+def _index_cities():
+    by_name = {}
+    for key, coordinates in CITY_COORDINATES.items():
+        by_name.setdefault(key.split(',')[0], coordinates)
+    return by_name
+
+
+CITIES_BY_NAME = _index_cities()
+
+
+@lru_cache(maxsize=4096)
+def locate(place):
+    """Coordinates of ``place`` ("Houston, TX", "houston", "NYC"), or None when it is not in the table"""
+    place = normalize_place(place)
+    if place in CITY_COORDINATES:
+        return CITY_COORDINATES[place]
+    name = place.split(',')[0].strip()
+    name = CITY_ALIASES.get(name, name)
+    return CITIES_BY_NAME.get(name)
+
+
+def _index_items():
+    aliases = {}
+    for name, (volume, weight, other_names) in ITEM_CLASSES.items():
+        for alias in (name,) + other_names:
+            aliases[alias] = name
+    # Longest first, so "dining table" wins over "table"
+    return aliases, sorted(aliases, key=len, reverse=True)
+
+
+ITEM_ALIASES, ITEM_ALIASES_BY_LENGTH = _index_items()
+
+# "2 sofas", "2x sofa", "2 x sofa", but not "1990s lamp"
+QUANTITY_BEFORE = re.compile(r'^(\d+)(?:\s*x\b|\s)\s*(.+)$')
+QUANTITY_AFTER = re.compile(r'^(.+?)\s*(?:\bx\s*(\d+)|\((\d+)\)|:\s*(\d+))$')
+
+
+def item_class(name):
+    """The item class a free-text inventory entry belongs to, or None"""
+    name = re.sub(r'[^a-z. ]+', ' ', name).strip()
+    name = re.sub(r'\s+', ' ', name)
+    for candidate in (name, name[:-2] if name.endswith('es') else None, name[:-1] if name.endswith('s') else None):
+        if candidate and candidate in ITEM_ALIASES:
+            return ITEM_ALIASES[candidate]
+    padded = f' {name} '
+    for alias in ITEM_ALIASES_BY_LENGTH:
+        if f' {alias} ' in padded or f' {alias}s ' in padded:
+            return ITEM_ALIASES[alias]
+    return None
+
+
+class Inventory(NamedTuple):
+    volume_m3: float
+    weight_kg: float
+    items: tuple
+
+
+def inventory_entries(text):
+    """``(description, quantity digits or None)`` for each entry of an inventory"""
+    for entry in re.split(r'[,;\n]+', text.lower()):
+        entry = entry.strip(' .-*\t')
+        if not entry:
+            continue
+        match = QUANTITY_BEFORE.match(entry)
+        if match:
+            yield match.group(2), match.group(1)
+            continue
+        match = QUANTITY_AFTER.match(entry)
+        if match:
+            yield match.group(1), next(group for group in match.groups()[1:] if group)
+        else:
+            yield entry, None
+
+
+def quantity_exceeds_limit(digits):
+    # Compared as text first: int() refuses very long digit strings
+    digits = digits.lstrip('0') or '0'
+    limit = settings.QUOTATION_MAX_ITEM_QUANTITY
+    return len(digits) > len(str(limit)) or int(digits) > limit
+
+
+def validate_inventory(text):
+    """Reject entries with more of one item than QUOTATION_MAX_ITEM_QUANTITY"""
+    if any(digits and quantity_exceeds_limit(digits) for entry, digits in inventory_entries(text)):
+        raise ValidationError(
+            f'At most {settings.QUOTATION_MAX_ITEM_QUANTITY} of one item per inventory entry.'
+        )
+
+
+@lru_cache(maxsize=4096)
+def parse_inventory(text):
+    """
+    Total volume and weight of a comma, semicolon or line separated
+    inventory such as "2 sofas, bed, boxes x20". Unrecognised entries count
+    as one miscellaneous item each; quantities above
+    QUOTATION_MAX_ITEM_QUANTITY count as that many.
+    """
+    volume = weight = 0.0
+    items = []
+    for entry, digits in inventory_entries(text):
+        if digits is None:
+            quantity = 1
+        elif quantity_exceeds_limit(digits):
+            quantity = settings.QUOTATION_MAX_ITEM_QUANTITY
+        else:
+            quantity = int(digits)
+        name = item_class(entry)
+        item_volume, item_weight = MISC_ITEM if name is None else ITEM_CLASSES[name][:2]
+        volume += item_volume * quantity
+        weight += item_weight * quantity
+        items.append((name or 'misc', quantity))
+    return Inventory(round(volume, 3), round(weight, 1), tuple(items))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distances between arrays of coordinates in degrees"""
+    lat1, lon1, lat2, lon2 = (np.radians(values) for values in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class Profiles(NamedTuple):
+    """What is priced for each relocation, one array element per relocation"""
+    distance_km: np.ndarray
+    volume_m3: np.ndarray
+    weight_kg: np.ndarray
+    peak: np.ndarray
+    distance_estimated: np.ndarray
+
+
+def profile(relocations):
+    """
+    Route distances, volumes, weights and peak-season flags for objects
+    with ``origin``, ``destination``, ``moving_date`` and ``inventory``.
+    Distances are great-circle distances times QUOTATION_ROUTE_FACTOR; moves
+    within a city, or involving a city missing from the table, are priced at
+    QUOTATION_LOCAL_DISTANCE_KM, and the latter are flagged as estimated.
+    """
+    count = len(relocations)
+    coordinates = np.full((count, 4), np.nan)
+    volume = np.empty(count)
+    weight = np.empty(count)
+    months = np.empty(count, dtype=np.int8)
+    for index, relocation in enumerate(relocations):
+        origin = locate(relocation.origin)
+        destination = locate(relocation.destination)
+        if origin is not None and destination is not None:
+            coordinates[index] = origin + destination
+        inventory = parse_inventory(relocation.inventory)
+        volume[index] = inventory.volume_m3
+        weight[index] = inventory.weight_kg
+        months[index] = relocation.moving_date.month
+
+    distance = haversine_km(*coordinates.T) * settings.QUOTATION_ROUTE_FACTOR
+    estimated = np.isnan(distance)
+    distance = np.fmax(distance, settings.QUOTATION_LOCAL_DISTANCE_KM)
+    peak = np.isin(months, settings.QUOTATION_PEAK_MONTHS)
+    return Profiles(distance, volume, weight, peak, estimated)
+
+
+def rate_columns(rate_cards):
+    return {field: np.array([float(getattr(card, field)) for card in rate_cards]) for field in RATE_FIELDS}
+
+
+def price(profiles, rate_cards):
+    """
+    Quote every relocation in ``profiles`` against every rate card in one
+    vectorized pass. Returns an array of shape (relocations, rate cards).
+    """
+    rates = rate_columns(rate_cards)
+    distance = profiles.distance_km[:, np.newaxis]
+    volume = profiles.volume_m3[:, np.newaxis]
+    weight = profiles.weight_kg[:, np.newaxis]
+    cost = (
+        rates['base_fee']
+        + distance * rates['rate_per_km']
+        + volume * rates['rate_per_cubic_meter']
+        + weight * rates['rate_per_kg']
+    )
+    cost *= np.where(profiles.peak[:, np.newaxis], rates['peak_multiplier'], 1.0)
+    return np.round(np.maximum(cost, rates['minimum_charge']), 2)
+
+
+def default_rate_card():
+    """The platform's rates, for quotations not tied to a provider"""
+    return RateCard(**settings.QUOTATION_DEFAULT_RATES)
+
+
+def rate_card_for(relocation):
+    """The rate card of the provider the relocation is booked with, else the default"""
+    provider_id = relocation.bookings.exclude(status='cancelled').order_by('-created_at').values_list(
+        'service_provider_id', flat=True,
+    ).first()
+    card = RateCard.objects.filter(service_provider_id=provider_id).first() if provider_id else None
+    return card or default_rate_card()
+
+
+def to_money(value):
+    return Decimal(f'{value:.2f}')
+
+
+def storable_cost(cost):
+    """Whether ``cost`` fits Relocation.estimated_cost"""
+    field = Relocation._meta.get_field('estimated_cost')
+    cost = float(cost)
+    return math.isfinite(cost) and abs(cost) < 10 ** (field.max_digits - field.decimal_places)
+
+
+def describe(profiles, index):
+    """What relocation ``index`` of ``profiles`` was priced on, for API responses"""
+    return {
+        'distance_km': round(float(profiles.distance_km[index]), 1),
+        'volume_m3': float(profiles.volume_m3[index]),
+        'weight_kg': float(profiles.weight_kg[index]),
+        'distance_estimated': bool(profiles.distance_estimated[index]),
+    }
+
+
+class Quote(NamedTuple):
+    estimated_cost: Decimal
+    distance_km: float
+    volume_m3: float
+    weight_kg: float
+    distance_estimated: bool
+
+
+@lru_cache(maxsize=4096)
+def inventory_fingerprint(text):
+    """Identifies what an inventory is priced as, so "2 sofas" and "sofa, sofa" share quotes"""
+    counts = Counter()
+    for name, quantity in parse_inventory(text).items:
+        counts[name] += quantity
+    return hashlib.blake2b(repr(sorted(counts.items())).encode(), digest_size=8).hexdigest()
+
+
+def quote_key(relocation, rate_card):
+    """
+    Memo key of a quote: normalized route, moving month, inventory
+    fingerprint and the rate card's id with its rates, so editing a card
+    yields new keys everywhere
+    """
+    return (
+        normalize_place(relocation.origin),
+        normalize_place(relocation.destination),
+        relocation.moving_date.month,
+        inventory_fingerprint(relocation.inventory),
+        (rate_card.pk, tuple(str(getattr(rate_card, field)) for field in RATE_FIELDS)),
+    )
+
+
+def quote(relocation, rate_card=None):
+    """Quote one relocation against one rate card (the default when omitted), memoized"""
+    rate_card = rate_card or default_rate_card()
+    key = quote_key(relocation, rate_card)
+    result = quote_memo.get(key)
+    if result is None:
+        result = compute_quote(relocation, rate_card)
+        quote_memo.set(key, result)
+    return result
+
+
+def compute_quote(relocation, rate_card):
+    profiles = profile([relocation])
+    cost = price(profiles, [rate_card])[0, 0]
+    return Quote(
+        to_money(cost),
+        round(float(profiles.distance_km[0]), 1),
+        float(profiles.volume_m3[0]),
+        float(profiles.weight_kg[0]),
+        bool(profiles.distance_estimated[0]),
+    )
@@ -0,0 +1,142 @@
+"""
+Offline reference tables used by the quotation engine: city coordinates for
+route distances, and the volume and weight of the item classes inventories
+are parsed into.
+"""
+
+# Latitude and longitude in degrees, keyed by normalized "city, region"
+CITY_COORDINATES = {
+    # United States
+    'new york, ny': (40.7128, -74.0060),
+    'los angeles, ca': (34.0522, -118.2437),
+    'chicago, il': (41.8781, -87.6298),
+    'houston, tx': (29.7604, -95.3698),
+    'phoenix, az': (33.4484, -112.0740),
+    'philadelphia, pa': (39.9526, -75.1652),
+    'san antonio, tx': (29.4241, -98.4936),
+    'san diego, ca': (32.7157, -117.1611),
+    'dallas, tx': (32.7767, -96.7970),
+    'austin, tx': (30.2672, -97.7431),
+    'san jose, ca': (37.3382, -121.8863),
+    'jacksonville, fl': (30.3322, -81.6557),
+    'columbus, oh': (39.9612, -82.9988),
+    'charlotte, nc': (35.2271, -80.8431),
+    'indianapolis, in': (39.7684, -86.1581),
+    'san francisco, ca': (37.7749, -122.4194),
+    'seattle, wa': (47.6062, -122.3321),
+    'denver, co': (39.7392, -104.9903),
+    'washington, dc': (38.9072, -77.0369),
+    'boston, ma': (42.3601, -71.0589),
+    'nashville, tn': (36.1627, -86.7816),
+    'detroit, mi': (42.3314, -83.0458),
+    'portland, or': (45.5152, -122.6784),
+    'las vegas, nv': (36.1699, -115.1398),
+    'memphis, tn': (35.1495, -90.0490),
+    'baltimore, md': (39.2904, -76.6122),
+    'milwaukee, wi': (43.0389, -87.9065),
+    'albuquerque, nm': (35.0844, -106.6504),
+    'tucson, az': (32.2226, -110.9747),
+    'sacramento, ca': (38.5816, -121.4944),
+    'kansas city, mo': (39.0997, -94.5786),
+    'atlanta, ga': (33.7490, -84.3880),
+    'miami, fl': (25.7617, -80.1918),
+    'raleigh, nc': (35.7796, -78.6382),
+    'minneapolis, mn': (44.9778, -93.2650),
+    'new orleans, la': (29.9511, -90.0715),
+    'cleveland, oh': (41.4993, -81.6944),
+    'tampa, fl': (27.9506, -82.4572),
+    'orlando, fl': (28.5383, -81.3792),
+    'pittsburgh, pa': (40.4406, -79.9959),
+    'st. louis, mo': (38.6270, -90.1994),
+    'salt lake city, ut': (40.7608, -111.8910),
+    'honolulu, hi': (21.3069, -157.8583),
+    'anchorage, ak': (61.2181, -149.9003),
+    'portland, me': (43.6591, -70.2568),
+    # Elsewhere
+    'toronto, canada': (43.6532, -79.3832),
+    'vancouver, canada': (49.2827, -123.1207),
+    'montreal, canada': (45.5017, -73.5673),
+    'mexico city, mexico': (19.4326, -99.1332),
+    'london, uk': (51.5074, -0.1278),
+    'paris, france': (48.8566, 2.3522),
+    'berlin, germany': (52.5200, 13.4050),
+    'madrid, spain': (40.4168, -3.7038),
+    'rome, italy': (41.9028, 12.4964),
+    'amsterdam, netherlands': (52.3676, 4.9041),
+    'dublin, ireland': (53.3498, -6.2603),
+    'zurich, switzerland': (47.3769, 8.5417),
+    'stockholm, sweden': (59.3293, 18.0686),
+    'dubai, uae': (25.2048, 55.2708),
+    'nairobi, kenya': (-1.2921, 36.8219),
+    'mombasa, kenya': (-4.0435, 39.6682),
+    'lagos, nigeria': (6.5244, 3.3792),
+    'johannesburg, south africa': (-26.2041, 28.0473),
+    'cape town, south africa': (-33.9249, 18.4241),
+    'cairo, egypt': (30.0444, 31.2357),
+    'mumbai, india': (19.0760, 72.8777),
+    'delhi, india': (28.7041, 77.1025),
+    'singapore, singapore': (1.3521, 103.8198),
+    'hong kong, china': (22.3193, 114.1694),
+    'shanghai, china': (31.2304, 121.4737),
+    'tokyo, japan': (35.6762, 139.6503),
+    'seoul, south korea': (37.5665, 126.9780),
+    'sydney, australia': (-33.8688, 151.2093),
+    'melbourne, australia': (-37.8136, 144.9631),
+    'auckland, new zealand': (-36.8485, 174.7633),
+    'sao paulo, brazil': (-23.5505, -46.6333),
+    'buenos aires, argentina': (-34.6037, -58.3816),
+}
+
+# Other spellings of a city name, mapped to the name used above
+CITY_ALIASES = {
+    'nyc': 'new york',
+    'new york city': 'new york',
+    'la': 'los angeles',
+    'sf': 'san francisco',
+    'washington d.c.': 'washington',
+    'saint louis': 'st. louis',
+    'st louis': 'st. louis',
+    'new delhi': 'delhi',
+    'bombay': 'mumbai',
+}
+
+# Item class: (volume in cubic metres, weight in kg, other names). Broad
+# categories such as "furniture" stand for a typical household's worth.
+ITEM_CLASSES = {
+    'box': (0.06, 15, ('carton', 'moving box')),
+    'sofa': (2.0, 60, ('couch', 'sectional', 'loveseat')),
+    'armchair': (0.8, 25, ('recliner',)),
+    'bed': (2.0, 70, ('bed frame',)),
+    'mattress': (0.8, 25, ()),
+    'wardrobe': (2.5, 90, ('closet', 'armoire')),
+    'dresser': (1.0, 50, ('chest of drawers',)),
+    'table': (1.2, 35, ('dining table', 'coffee table')),
+    'chair': (0.3, 7, ('dining chair', 'stool')),
+    'desk': (1.0, 40, ('office desk',)),
+    'bookshelf': (1.0, 35, ('bookcase', 'shelf', 'shelving')),
+    'refrigerator': (1.2, 80, ('fridge', 'freezer')),
+    'washing machine': (0.7, 70, ('washer',)),
+    'dryer': (0.7, 45, ('tumble dryer',)),
+    'dishwasher': (0.5, 45, ()),
+    'stove': (0.6, 60, ('oven', 'cooker', 'range')),
+    'microwave': (0.1, 15, ()),
+    'television': (0.3, 15, ('tv',)),
+    'computer': (0.2, 10, ('pc', 'laptop', 'monitor')),
+    'piano': (3.0, 250, ('upright piano',)),
+    'bicycle': (0.5, 15, ('bike',)),
+    'motorcycle': (2.0, 200, ('motorbike', 'scooter')),
+    'car': (12.0, 1500, ('vehicle',)),
+    'furniture': (10.0, 400, ()),
+    'electronics': (1.5, 80, ()),
+    'appliances': (3.0, 250, ('appliance',)),
+    'clothing': (1.0, 100, ('clothes', 'garments')),
+    'books': (0.6, 150, ()),
+    'kitchen items': (1.0, 120, ('kitchen', 'kitchenware', 'dishes', 'utensils')),
+    'decor': (0.5, 20, ('decorations', 'artwork', 'paintings')),
+    'tools': (0.3, 50, ('toolbox',)),
+    'toys': (0.5, 20, ()),
+    'garden': (1.0, 60, ('garden furniture', 'outdoor furniture')),
+}
+
+# Anything not recognised
+MISC_ITEM = (0.5, 25)
@@ -0,0 +1,5 @@
+from search.index import register
+
+from .models import Relocation
+
+register(Relocation, (('origin', 'A'), ('destination', 'A'), ('inventory', 'B')))
@@ -1,6 +1,12 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Relocation
+from .models import Relocation, RateCard
+from accounts.models import User
+from accounts.principal import get_principal, get_service_provider
 from accounts.serializers import UserSerializer
+from core.batch import BatchSerializerMixin, PreloadedRelatedField
+from core.query_plans import QueryPlan
+from .quotes import validate_inventory
 
 
 class RelocationSerializer(serializers.ModelSerializer):
@@ -12,6 +18,9 @@ class RelocationSerializer(serializers.ModelSerializer):
         fields = ('id', 'user', 'user_id', 'origin', 'destination', 'moving_date', 
                   'inventory', 'status', 'estimated_cost', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        extra_kwargs = {'inventory': {'validators': [validate_inventory]}}
+
+    query_plan = QueryPlan(select_related=('user',))
     
     def create(self, validated_data):
         # Set user from request if not provided
@@ -19,6 +28,68 @@ class RelocationSerializer(serializers.ModelSerializer):
             validated_data['user'] = self.context['request'].user
         else:
             user_id = validated_data.pop('user_id')
-            from accounts.models import User
             validated_data['user'] = User.objects.get(id=user_id)
         return super().create(validated_data)
+
+
+class RelocationBatchSerializer(BatchSerializerMixin, serializers.ModelSerializer):
+    """One item of a batch create; ``user_id`` defaults to the caller"""
+    user_id = PreloadedRelatedField(source='user', queryset=User.objects.all(), required=False)
+    
+    class Meta:
+        model = Relocation
+        fields = ('user_id', 'origin', 'destination', 'moving_date', 'inventory', 'status', 'estimated_cost')
+        extra_kwargs = {'inventory': {'validators': [validate_inventory]}}
+
+
+class RateCardSerializer(serializers.ModelSerializer):
+    """Providers manage their own card; administrators name the provider"""
+    
+    class Meta:
+        model = RateCard
+        fields = ('id', 'service_provider', 'base_fee', 'rate_per_km', 'rate_per_cubic_meter', 'rate_per_kg',
+                  'minimum_charge', 'peak_multiplier', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_at', 'updated_at')
+        extra_kwargs = {'service_provider': {'required': False}}
+    
+    def validate(self, attrs):
+        request = self.context['request']
+        principal = get_principal(request)
+        if self.instance is not None:
+            # A card stays with its provider
+            attrs.pop('service_provider', None)
+            return attrs
+        if not principal.is_admin:
+            attrs['service_provider'] = get_service_provider(principal, request.user)
+        if attrs.get('service_provider') is None:
+            raise serializers.ValidationError({'service_provider': 'This field is required.'})
+        if RateCard.objects.filter(service_provider=attrs['service_provider']).exists():
+            raise serializers.ValidationError({'service_provider': 'This provider already has a rate card.'})
+        return attrs
+
+
+class QuoteBatchSerializer(serializers.Serializer):
+    """
+    Relocations to quote, priced at the default rates or against each of
+    ``service_providers``; ``save`` stores single-rate quotes as estimated_cost
+    """
+    relocations = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=settings.QUOTATION_BATCH_MAX_ITEMS,
+    )
+    service_providers = serializers.ListField(child=serializers.IntegerField(), required=False)
+    save = serializers.BooleanField(default=False)
+    
+    def validate_service_providers(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError('Each service provider may only be listed once.')
+        return value
+    
+    def validate(self, attrs):
+        providers = attrs.get('service_providers') or []
+        if len(attrs['relocations']) * max(1, len(providers)) > settings.QUOTATION_BATCH_MAX_CELLS:
+            raise serializers.ValidationError(
+                f'At most {settings.QUOTATION_BATCH_MAX_CELLS} relocation and provider pairs per request'
+            )
+        if attrs['save'] and len(providers) > 1:
+            raise serializers.ValidationError({'save': 'Only quotes against a single rate card can be saved.'})
+        return attrs
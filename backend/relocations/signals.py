@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .memo import quote_memo
+from .models import RateCard
+
+
+@receiver(post_save, sender=RateCard)
+@receiver(post_delete, sender=RateCard)
+def forget_rate_card_quotes(sender, instance, **kwargs):
+    # Other processes stop matching the old rates through the versioned keys
+    quote_memo.forget_rate_card(instance.pk)
@@ -0,0 +1,111 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import ServiceProvider, User
+from bookings.models import Booking
+from .models import RateCard, Relocation
+from .quotes import parse_inventory, quote
+
+# Moves within a city are priced at QUOTATION_LOCAL_DISTANCE_KM.
+# 300 base + 25 km x 1.2 + 6.6 m3 x 35 + 340 kg x 0.15 = 612.00 at the default rates
+INVENTORY = '2 sofas, bed, 10 boxes'
+
+
+class QuotationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('customer', password='pass12345')
+        provider_user = User.objects.create_user('mover', password='pass12345', user_type='service_provider')
+        cls.provider = ServiceProvider.objects.create(
+            user=provider_user, company_name='Movers', contact_person='Ann', services_offered='Packing',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def relocation(self, inventory=INVENTORY, moving_date=date(2026, 3, 10)):
+        return Relocation.objects.create(
+            user=self.user, origin='Nairobi', destination='Nairobi', inventory=inventory, moving_date=moving_date,
+        )
+
+    def test_known_price_at_the_default_rates(self):
+        relocation = self.relocation()
+        response = self.client.post(f'/api/relocations/{relocation.pk}/calculate_quotation/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(Decimal(str(data['estimated_cost'])), Decimal('612.00'))
+        self.assertEqual((data['distance_km'], data['volume_m3'], data['weight_kg']), (25.0, 6.6, 340.0))
+        self.assertFalse(data['distance_estimated'])
+        relocation.refresh_from_db()
+        self.assertEqual(relocation.estimated_cost, Decimal('612.00'))
+
+    def test_peak_months_apply_the_multiplier(self):
+        self.assertEqual(quote(self.relocation(moving_date=date(2026, 7, 10))).estimated_cost, Decimal('703.80'))
+
+    def test_small_moves_pay_the_minimum_charge(self):
+        self.assertEqual(quote(self.relocation(inventory='box')).estimated_cost, Decimal('500.00'))
+
+    def test_equivalent_inventories_share_a_price(self):
+        self.assertEqual(
+            quote(self.relocation(inventory='sofa, sofa, bed, boxes x10')).estimated_cost,
+            quote(self.relocation()).estimated_cost,
+        )
+
+    def test_parse_inventory_quantities(self):
+        for text in ['2 sofas', '2x sofa', '2 x sofa', 'sofa x2', 'sofa (2)', 'sofa: 2']:
+            with self.subTest(text=text):
+                self.assertEqual(parse_inventory(text).items, (('sofa', 2),))
+        # A year is part of the description, not a quantity
+        self.assertEqual(parse_inventory('1990s lamp').items, (('misc', 1),))
+
+    def test_quantities_are_capped(self):
+        self.assertEqual(parse_inventory('5000 boxes').items, (('box', 1000),))
+        response = self.client.post('/api/relocations/', {
+            'origin': 'Nairobi', 'destination': 'Mombasa', 'moving_date': '2026-03-10',
+            'inventory': 'bed, 99999999999999999999999 boxes',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('inventory', response.json())
+
+    def test_quotes_too_large_to_store_are_refused(self):
+        RateCard.objects.create(
+            service_provider=self.provider, base_fee=0, rate_per_km=0, rate_per_cubic_meter='999999.99',
+            rate_per_kg=0,
+        )
+        relocation = self.relocation(inventory='1000 pianos')
+        Booking.objects.create(
+            user=self.user, service_provider=self.provider, relocation=relocation, service_type='Transportation',
+            booking_date=timezone.now(), total_amount='100.00',
+        )
+        response = self.client.post(f'/api/relocations/{relocation.pk}/calculate_quotation/')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/relocations/quotes/', {
+            'relocations': [relocation.pk], 'service_providers': [self.provider.pk], 'save': True,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('save', response.json())
+        relocation.refresh_from_db()
+        self.assertIsNone(relocation.estimated_cost)
+
+    def test_batch_quotes_reject_repeated_providers(self):
+        relocation = self.relocation()
+        response = self.client.post('/api/relocations/quotes/', {
+            'relocations': [relocation.pk], 'service_providers': [self.provider.pk, self.provider.pk],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('service_providers', response.json())
+
+    def test_rate_cards_reject_negative_rates(self):
+        self.client.force_authenticate(self.provider.user)
+        response = self.client.post('/api/relocations/rate-cards/', {
+            'base_fee': '-1.00', 'rate_per_km': '1.000', 'rate_per_cubic_meter': '10.00', 'rate_per_kg': '0.100',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('base_fee', response.json())
+        self.assertFalse(RateCard.objects.exists())
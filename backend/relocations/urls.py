@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import RelocationViewSet
+from .views import RelocationViewSet, RateCardViewSet
 
 router = DefaultRouter()
+# Ahead of the relocations themselves, whose detail route would otherwise match 'rate-cards'
+router.register(r'rate-cards', RateCardViewSet, basename='rate-card')
 router.register(r'', RelocationViewSet, basename='relocation')
 
 urlpatterns = [
@@ -1,34 +1,148 @@
+import numpy as np
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Relocation
-from .serializers import RelocationSerializer
+from accounts.models import ServiceProvider, User
+from accounts.permissions import IsServiceProviderOrAdministrator
+from accounts.principal import get_principal
+from core.batch import BatchCreateMixin
+from core.conditional import ConditionalViewSetMixin
+from core.query_plans import QueryPlanMixin
+from .models import Relocation, RateCard
+from .quotes import default_rate_card, describe, price, profile, quote, rate_card_for, storable_cost, to_money
+from .serializers import RelocationSerializer, RelocationBatchSerializer, RateCardSerializer, QuoteBatchSerializer
 
 
-class RelocationViewSet(viewsets.ModelViewSet):
+class RelocationViewSet(ConditionalViewSetMixin, QueryPlanMixin, BatchCreateMixin, viewsets.ModelViewSet):
     serializer_class = RelocationSerializer
+    batch_serializer_class = RelocationBatchSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_plan = RelocationSerializer.query_plan
     
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return Relocation.objects.all()
-        return Relocation.objects.filter(user=user)
+        return Relocation.objects.filter(user_id=principal.user_id)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
+    def get_batch_querysets(self):
+        principal = get_principal(self.request)
+        # Only administrators create relocations on behalf of other users
+        users = User.objects.all() if principal.is_admin else User.objects.filter(pk=principal.user_id)
+        return {'user_id': users}
+    
+    def build_batch_instance(self, validated_data):
+        validated_data.setdefault('user', self.request.user)
+        return super().build_batch_instance(validated_data)
+    
     @action(detail=True, methods=['post'])
     def calculate_quotation(self, request, pk=None):
-        """Calculate estimated cost for relocation"""
+        """Quote the relocation, memoized, and store the result in estimated_cost"""
         relocation = self.get_object()
-        # Simple calculation based on distance (mock implementation)
-        # In production, this would use actual distance calculation APIs
-        base_cost = 500.00
-        estimated_cost = base_cost + (len(relocation.inventory.split(',')) * 50)
-        relocation.estimated_cost = estimated_cost
-        relocation.save()
+        result = quote(relocation, rate_card_for(relocation))
+        if not storable_cost(result.estimated_cost):
+            return Response(
+                {'error': 'The quotation is larger than an estimated cost can hold'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        relocation.estimated_cost = result.estimated_cost
+        relocation.save(update_fields=['estimated_cost', 'updated_at'])
         return Response({
-            'estimated_cost': estimated_cost,
+            'estimated_cost': result.estimated_cost,
+            'distance_km': result.distance_km,
+            'volume_m3': result.volume_m3,
+            'weight_kg': result.weight_kg,
+            'distance_estimated': result.distance_estimated,
             'message': 'Quotation calculated successfully'
         })
+    
+    @action(detail=True, methods=['get'])
+    def quotes(self, request, pk=None):
+        """Quote this relocation against every available service provider, cheapest first"""
+        relocation = self.get_object()
+        providers = list(ServiceProvider.objects.filter(availability=True).select_related('rate_card'))
+        default = default_rate_card()
+        cards = [getattr(provider, 'rate_card', None) or default for provider in providers]
+        profiles = profile([relocation])
+        costs = price(profiles, cards)[0]
+        return Response({
+            'relocation': relocation.pk,
+            **describe(profiles, 0),
+            'quotes': [
+                {
+                    'service_provider': providers[index].pk,
+                    'company_name': providers[index].company_name,
+                    'estimated_cost': str(to_money(costs[index])),
+                    'default_rates': cards[index] is default,
+                }
+                for index in np.argsort(costs, kind='stable')
+            ],
+        })
+    
+    @action(detail=False, methods=['post'], url_path='quotes')
+    def batch_quotes(self, request):
+        """Quote many relocations, at the default rates or against each listed provider, in one pass"""
+        serializer = QuoteBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        provider_ids = data.get('service_providers') or [None]
+        cards = [default_rate_card()]
+        if provider_ids != [None]:
+            providers = ServiceProvider.objects.select_related('rate_card').in_bulk(provider_ids)
+            unknown = [provider_id for provider_id in provider_ids if provider_id not in providers]
+            if unknown:
+                return Response({'service_providers': [f'Unknown service provider {provider_id}' for provider_id in unknown]},
+                                status=status.HTTP_400_BAD_REQUEST)
+            cards = [getattr(providers[provider_id], 'rate_card', None) or cards[0] for provider_id in provider_ids]
+        
+        relocations = list(self.get_queryset().filter(pk__in=data['relocations']).order_by('id').only(
+            'id', 'origin', 'destination', 'moving_date', 'inventory',
+        ))
+        profiles = profile(relocations)
+        costs = price(profiles, cards)
+        
+        if data['save'] and relocations:
+            too_large = [relocation.pk for relocation, cost in zip(relocations, costs[:, 0]) if not storable_cost(cost)]
+            if too_large:
+                return Response(
+                    {'save': [f'The quotation of relocation {pk} is larger than an estimated cost can hold' for pk in too_large]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            now = timezone.now()
+            for relocation, cost in zip(relocations, costs[:, 0]):
+                relocation.estimated_cost = to_money(cost)
+                relocation.updated_at = now
+            Relocation.objects.bulk_update(relocations, ['estimated_cost', 'updated_at'], batch_size=500)
+        
+        found = {relocation.pk for relocation in relocations}
+        return Response({
+            'results': [
+                {
+                    'relocation': relocation.pk,
+                    **describe(profiles, index),
+                    'quotes': [
+                        {'service_provider': provider_id, 'estimated_cost': f'{cost:.2f}'}
+                        for provider_id, cost in zip(provider_ids, row)
+                    ],
+                }
+                for index, (relocation, row) in enumerate(zip(relocations, costs.tolist()))
+            ],
+            'missing': sorted(set(data['relocations']) - found),
+        })
+
+
+class RateCardViewSet(viewsets.ModelViewSet):
+    serializer_class = RateCardSerializer
+    permission_classes = [IsServiceProviderOrAdministrator]
+    
+    def get_queryset(self):
+        principal = get_principal(self.request)
+        queryset = RateCard.objects.select_related('service_provider')
+        if principal.is_admin:
+            return queryset
+        return queryset.filter(service_provider_id=principal.service_provider_id)
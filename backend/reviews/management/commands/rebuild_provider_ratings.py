@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import rebuild_provider_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute service provider rating aggregates from their reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        changed = rebuild_provider_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt ratings, {changed} provider(s) had drifted'))
@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_rating_sum(apps, schema_editor):
+    """Seed the running aggregates that Review.save() now maintains incrementally"""
+    Review = apps.get_model('reviews', 'Review')
+    ServiceProvider = apps.get_model('accounts', 'ServiceProvider')
+    totals = Review.objects.order_by().values('service_provider').annotate(
+        rating_sum=Sum('rating'), review_count=Count('id'),
+    )
+    for row in totals:
+        ServiceProvider.objects.filter(pk=row['service_provider']).update(
+            rating_sum=row['rating_sum'],
+            total_reviews=row['review_count'],
+            rating=round(row['rating_sum'] / row['review_count'], 2),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_service_provider_rating_sum'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
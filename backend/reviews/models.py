@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User, ServiceProvider
 from bookings.models import Booking
+from .tasks import update_provider_rating
 
 
 class Review(models.Model):
@@ -21,16 +22,33 @@ class Review(models.Model):
     def __str__(self):
         return f"Review {self.id}: {self.rating} stars for {self.service_provider.company_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the provider's aggregates currently include
+        if 'service_provider_id' in field_names and 'rating' in field_names:
+            instance._stored_rating = (instance.service_provider_id, instance.rating)
+        return instance
+    
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update service provider rating
-        self.update_service_provider_rating()
+        previous = getattr(self, '_stored_rating', None)
+        if previous is None and not self._state.adding:
+            previous = Review.objects.filter(pk=self.pk).values_list('service_provider_id', 'rating').first()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Update service provider rating
+            self.update_service_provider_rating(previous)
     
-    def update_service_provider_rating(self):
-        from django.db.models import Avg
-        reviews = Review.objects.filter(service_provider=self.service_provider)
-        if reviews.exists():
-            avg_rating = reviews.aggregate(Avg('rating'))['rating__avg']
-            self.service_provider.rating = round(avg_rating, 2)
-            self.service_provider.total_reviews = reviews.count()
-            self.service_provider.save()
+    def update_service_provider_rating(self, previous=None):
+        """Queue this review's change to the provider's running rating aggregates"""
+        previous_provider_id, previous_rating = previous or (None, None)
+        if previous_provider_id is None:
+            update_provider_rating.delay(service_provider_id=self.service_provider_id, rating_delta=self.rating, count_delta=1)
+        elif previous_provider_id != self.service_provider_id:
+            update_provider_rating.delay(service_provider_id=previous_provider_id, rating_delta=-previous_rating, count_delta=-1)
+            update_provider_rating.delay(service_provider_id=self.service_provider_id, rating_delta=self.rating, count_delta=1)
+        elif previous_rating != self.rating:
+            update_provider_rating.delay(
+                service_provider_id=self.service_provider_id, rating_delta=self.rating - previous_rating, count_delta=0,
+            )
+        self._stored_rating = (self.service_provider_id, self.rating)
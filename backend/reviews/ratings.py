@@ -0,0 +1,64 @@
+from django.db.models import Case, Count, DecimalField, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from accounts.directory import invalidate_provider
+from accounts.models import ServiceProvider
+
+
+def apply_rating_delta(service_provider_id, rating_delta, count_delta):
+    """
+    Shift a provider's running rating sum and review count and recompute the
+    average in a single atomic UPDATE. The right-hand side reads the row's
+    values before the update, so concurrent reviews cannot lose increments.
+    """
+    new_sum = F('rating_sum') + rating_delta
+    new_count = F('total_reviews') + count_delta
+    ServiceProvider.objects.filter(pk=service_provider_id).update(
+        rating_sum=new_sum,
+        total_reviews=new_count,
+        rating=Case(
+            When(total_reviews__lte=-count_delta, then=Value(0)),
+            default=Cast(
+                Cast(new_sum, FloatField()) / new_count,
+                DecimalField(max_digits=3, decimal_places=2),
+            ),
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        ),
+        updated_at=timezone.now(),
+    )
+    invalidate_provider(service_provider_id)
+
+
+def rebuild_provider_ratings(batch_size=500):
+    """
+    Recompute every provider's rating aggregates from its reviews with one
+    grouped query. Returns the number of providers whose stored values drifted.
+    """
+    from .models import Review
+
+    totals = {
+        row['service_provider']: (row['rating_sum'], row['review_count'])
+        for row in Review.objects.order_by().values('service_provider').annotate(
+            rating_sum=Sum('rating'), review_count=Count('id'),
+        )
+    }
+
+    changed = []
+    providers = ServiceProvider.objects.only('id', 'rating', 'rating_sum', 'total_reviews')
+    for provider in providers.iterator(chunk_size=batch_size):
+        rating_sum, review_count = totals.get(provider.id, (0, 0))
+        rating = round(rating_sum / review_count, 2) if review_count else 0
+        if (provider.rating_sum, provider.total_reviews) != (rating_sum, review_count) \
+                or float(provider.rating) != rating:
+            provider.rating_sum = rating_sum
+            provider.total_reviews = review_count
+            provider.rating = rating
+            changed.append(provider)
+
+    ServiceProvider.objects.bulk_update(
+        changed, ['rating', 'rating_sum', 'total_reviews'], batch_size=batch_size,
+    )
+    for provider in changed:
+        invalidate_provider(provider.id)
+    return len(changed)
@@ -2,18 +2,27 @@ from rest_framework import serializers
 from .models import Review
 from accounts.serializers import UserSerializer, ServiceProviderSerializer
 from bookings.serializers import BookingSerializer
+from core.query_plans import QueryPlan
+from core.serializers import ExpandableFieldsMixin
 
 
-class ReviewSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    service_provider = ServiceProviderSerializer(read_only=True)
-    booking = BookingSerializer(read_only=True)
-    
+class ReviewSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ('id', 'user', 'service_provider', 'booking', 'rating', 
                   'comment', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        expandable_fields = {
+            'user': UserSerializer,
+            'service_provider': ServiceProviderSerializer,
+            'booking': BookingSerializer,
+        }
+
+    query_plan = (
+        QueryPlan(select_related=('user',))
+        + ServiceProviderSerializer.query_plan.nested('service_provider')
+        + BookingSerializer.query_plan.nested('booking')
+    )
 
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
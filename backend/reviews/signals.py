@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Review
+from .tasks import update_provider_rating
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_provider_rating(sender, instance, **kwargs):
+    provider_id, rating = getattr(instance, '_stored_rating', None) or (instance.service_provider_id, instance.rating)
+    update_provider_rating.delay(service_provider_id=provider_id, rating_delta=-rating, count_delta=-1)
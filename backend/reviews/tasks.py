@@ -0,0 +1,8 @@
+from jobs.queue import task
+from .ratings import apply_rating_delta
+
+
+@task()
+def update_provider_rating(service_provider_id, rating_delta, count_delta):
+    """Apply one review's change to its provider's rating aggregates"""
+    apply_rating_delta(service_provider_id, rating_delta, count_delta)
@@ -1,10 +1,14 @@
 from rest_framework import viewsets, permissions
+from accounts.principal import get_principal
+from core.conditional import ConditionalViewSetMixin
+from core.query_plans import QueryPlanMixin
 from .models import Review
 from .serializers import ReviewSerializer, ReviewCreateSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalViewSetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    query_plan = ReviewSerializer.query_plan
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -15,7 +19,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         service_provider_id = self.request.query_params.get('service_provider')
         if service_provider_id:
             return Review.objects.filter(service_provider_id=service_provider_id)
-        user = self.request.user
-        if user.user_type == 'admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return Review.objects.all()
-        return Review.objects.filter(user=user)
+        return Review.objects.filter(user_id=principal.user_id)
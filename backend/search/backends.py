@@ -0,0 +1,100 @@
+"""
+Database-specific halves of the search indexes: FTS5 tables on SQLite,
+``tsvector`` columns with GIN indexes on PostgreSQL. Each index is a table
+``search_<name>`` with one row per indexed object, written with
+INSERT ... SELECT from the object's own table so a sync is one round trip.
+"""
+import re
+
+# Relative weights of the four field classes, as PostgreSQL's ts_rank uses them
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+TEXT_SEARCH_CONFIG = 'english'
+
+
+def search_terms(query):
+    """Words of a user's query; punctuation never reaches the match syntax"""
+    return re.findall(r'[^\W_]+', query.lower())
+
+
+class SQLiteBackend:
+    vendor = 'sqlite'
+
+    def update(self, cursor, index, pks):
+        placeholders = ', '.join(['%s'] * len(pks))
+        cursor.execute(f'DELETE FROM {index.table} WHERE rowid IN ({placeholders})', pks)
+        cursor.execute(self.select_into(index, f'WHERE {index.pk_column} IN ({placeholders})'), pks)
+
+    def delete(self, cursor, index, pks):
+        placeholders = ', '.join(['%s'] * len(pks))
+        cursor.execute(f'DELETE FROM {index.table} WHERE rowid IN ({placeholders})', pks)
+
+    def rebuild(self, cursor, index):
+        cursor.execute(f'DELETE FROM {index.table}')
+        cursor.execute(self.select_into(index, ''))
+        # Merge the b-trees the bulk insert left behind into one
+        cursor.execute(f"INSERT INTO {index.table}({index.table}) VALUES ('optimize')")
+
+    def select_into(self, index, where):
+        columns = ', '.join(index.columns)
+        return (
+            f'INSERT INTO {index.table}(rowid, {columns}) '
+            f'SELECT {index.pk_column}, {columns} FROM {index.source} {where}'
+        )
+
+    def match(self, index, terms):
+        """SQL for the matching ids and for the rank (higher is better) of the outer row"""
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        weights = ', '.join(str(WEIGHTS[weight]) for weight in index.weights)
+        return (
+            f'SELECT rowid FROM {index.table} WHERE {index.table} MATCH %s',
+            f'SELECT -bm25({index.table}, {weights}) FROM {index.table} '
+            f'WHERE {index.table} MATCH %s AND rowid = {index.source}.{index.pk_column}',
+            [expression],
+        )
+
+
+class PostgreSQLBackend:
+    vendor = 'postgresql'
+
+    def update(self, cursor, index, pks):
+        cursor.execute(
+            self.select_into(index, f'WHERE {index.pk_column} = ANY(%s)')
+            + ' ON CONFLICT (object_id) DO UPDATE SET document = EXCLUDED.document',
+            [list(pks)],
+        )
+
+    def delete(self, cursor, index, pks):
+        cursor.execute(f'DELETE FROM {index.table} WHERE object_id = ANY(%s)', [list(pks)])
+
+    def rebuild(self, cursor, index):
+        cursor.execute(f'TRUNCATE {index.table}')
+        cursor.execute(self.select_into(index, ''))
+        cursor.execute(f'ANALYZE {index.table}')
+
+    def select_into(self, index, where):
+        document = ' || '.join(
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+            for column, weight in zip(index.columns, index.weights)
+        )
+        return (
+            f'INSERT INTO {index.table} (object_id, document) '
+            f'SELECT {index.pk_column}, {document} FROM {index.source} {where}'
+        )
+
+    def match(self, index, terms):
+        tsquery = f"to_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+        return (
+            f'SELECT object_id FROM {index.table} WHERE document @@ {tsquery}',
+            f'SELECT ts_rank_cd(document, {tsquery}) FROM {index.table} '
+            f'WHERE object_id = {index.source}.{index.pk_column}',
+            [' & '.join(f'{term}:*' for term in terms)],
+        )
+
+
+BACKENDS = {backend.vendor: backend for backend in (SQLiteBackend(), PostgreSQLBackend())}
+
+
+def backend_for(connection):
+    """The search backend of ``connection``, or None where the database has no full-text index"""
+    return BACKENDS.get(connection.vendor)
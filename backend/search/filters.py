@@ -0,0 +1,18 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .index import index_for
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    ``?q=`` full-text search, ranked best match first, for views whose
+    model has a search index. An explicit ``?ordering=`` still wins.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        index = index_for(queryset.model)
+        if not query or index is None:
+            return queryset
+        return index.search(queryset, query)
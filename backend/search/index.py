@@ -0,0 +1,105 @@
+from django.db import connections, transaction
+from django.db.models import Q
+from django.db.models.expressions import OrderBy, RawSQL
+
+from .backends import backend_for, search_terms
+
+# Most query words matched; the rest of a pasted paragraph adds nothing
+MAX_TERMS = 16
+
+# Ids synced per statement, well inside SQLite's bound parameter limit
+SYNC_BATCH_SIZE = 500
+
+indexes = {}
+
+
+class SearchIndex:
+    """
+    Full-text index of a model's text fields. ``fields`` pairs each field
+    with a weight class, 'A' (most relevant) to 'D'. The index table is
+    created by this app's migrations, which must be extended when an index
+    is added or its fields change.
+    """
+
+    def __init__(self, name, model, fields):
+        self.name = name
+        self.model = model
+        self.field_names = frozenset(field for field, weight in fields)
+        self.columns = [model._meta.get_field(field).column for field, weight in fields]
+        self.weights = [weight for field, weight in fields]
+
+    @property
+    def table(self):
+        return f'search_{self.name}'
+
+    @property
+    def source(self):
+        return self.model._meta.db_table
+
+    @property
+    def pk_column(self):
+        return self.model._meta.pk.column
+
+    def update(self, pks, using='default'):
+        """Reindex the objects with these primary keys from their stored rows"""
+        self._sync('update', pks, using)
+
+    def delete(self, pks, using='default'):
+        self._sync('delete', pks, using)
+
+    def _sync(self, operation, pks, using):
+        connection = connections[using]
+        backend = backend_for(connection)
+        if backend is None:
+            return
+        pks = list(pks)
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            for start in range(0, len(pks), SYNC_BATCH_SIZE):
+                getattr(backend, operation)(cursor, self, pks[start:start + SYNC_BATCH_SIZE])
+
+    def rebuild(self, using='default'):
+        """Reindex every object of the model"""
+        connection = connections[using]
+        backend = backend_for(connection)
+        if backend is None:
+            return
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            backend.rebuild(cursor, self)
+
+    def search(self, queryset, query):
+        """
+        ``queryset`` narrowed to the objects with a word starting with each
+        word of ``query``, best match first
+        """
+        terms = search_terms(query)[:MAX_TERMS]
+        if not terms:
+            return queryset.none()
+        backend = backend_for(connections[queryset.db])
+        if backend is None:
+            # No full-text index on this database: every word in some field
+            for term in terms:
+                condition = Q()
+                for field in self.field_names:
+                    condition |= Q(**{f'{field}__icontains': term})
+                queryset = queryset.filter(condition)
+            return queryset
+        matching, rank, params = backend.match(self, terms)
+        # The existing ordering breaks ties between equally ranked rows
+        ordering = queryset.query.order_by or self.model._meta.ordering or ['pk']
+        return queryset.filter(pk__in=RawSQL(matching, params)).order_by(
+            OrderBy(RawSQL(rank, params), descending=True), *ordering,
+        )
+
+
+def register(model, fields, name=None):
+    """Index ``model``'s ``fields``: ((field name, weight class), ...)"""
+    from .signals import connect
+
+    index = SearchIndex(name or model._meta.db_table, model, fields)
+    indexes[model] = index
+    connect(model)
+    return index
+
+
+def index_for(model):
+    return indexes.get(model)
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from search.backends import backend_for
+from search.index import indexes
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the full-text search indexes from their tables, after bulk loads or writes that '
+        'bypass model signals (fixtures, update(), raw SQL)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Indexes to rebuild (default: all)')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if backend_for(connections[using]) is None:
+            raise CommandError(f'{connections[using].vendor} has no full-text search backend')
+        by_name = {index.name: index for index in indexes.values()}
+        unknown = set(options['names']) - set(by_name)
+        if unknown:
+            raise CommandError(f"Unknown index(es) {', '.join(sorted(unknown))}; choose from {', '.join(sorted(by_name))}")
+
+        for name in options['names'] or sorted(by_name):
+            index = by_name[name]
+            started = time.perf_counter()
+            index.rebuild(using=using)
+            count = index.model._default_manager.using(using).count()
+            self.stdout.write(f'{name}: {count} row(s) in {time.perf_counter() - started:.2f}s')
+        self.stdout.write(self.style.SUCCESS('Search indexes rebuilt'))
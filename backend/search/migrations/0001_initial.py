@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# Index table: (source table, primary key column, ((column, weight class), ...)).
+# A frozen copy of the indexes registered in each app's search_indexes.py.
+INDEXES = {
+    'search_relocations': ('relocations', 'id', (('origin', 'A'), ('destination', 'A'), ('inventory', 'B'))),
+    'search_documents': ('documents', 'id', (('document_name', 'A'), ('description', 'B'), ('document_type', 'C'))),
+    'search_service_providers': (
+        'service_providers', 'id', (('company_name', 'A'), ('services_offered', 'B'), ('contact_person', 'C')),
+    ),
+}
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, (source, pk, fields) in INDEXES.items():
+        columns = [column for column, weight in fields]
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table} USING fts5({', '.join(columns)}, "
+                f"tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table}(rowid, {', '.join(columns)}) SELECT {pk}, {', '.join(columns)} FROM {source}"
+            )
+        elif vendor == 'postgresql':
+            schema_editor.execute(f'CREATE TABLE {table} (object_id bigint PRIMARY KEY, document tsvector NOT NULL)')
+            schema_editor.execute(f'CREATE INDEX {table}_document_idx ON {table} USING gin (document)')
+            document = ' || '.join(
+                f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')" for column, weight in fields
+            )
+            schema_editor.execute(f'INSERT INTO {table} (object_id, document) SELECT {pk}, {document} FROM {source}')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        for table in INDEXES:
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_backfill_services'),
+        ('documents', '0004_document_previews'),
+        ('relocations', '0002_rate_cards'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
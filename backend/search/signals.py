@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.batch import batch_created
+from .index import index_for
+
+
+def connect(model):
+    """
+    Keep ``model``'s index in step with its rows. Receivers are connected
+    per indexed model: a post_delete receiver for every sender would stop
+    Django from fast-deleting rows of any model.
+    """
+    uid = f'search.{model._meta.label_lower}'
+    post_save.connect(index_saved, sender=model, dispatch_uid=uid)
+    post_delete.connect(index_deleted, sender=model, dispatch_uid=uid)
+    batch_created.connect(index_batch, sender=model, dispatch_uid=uid)
+
+
+def index_saved(sender, instance, using, update_fields=None, **kwargs):
+    index = index_for(sender)
+    if index is None:
+        return
+    # Frequent saves of counters and statuses leave the index alone
+    if update_fields is not None and not index.field_names & set(update_fields):
+        return
+    index.update([instance.pk], using=using)
+
+
+def index_deleted(sender, instance, using, **kwargs):
+    index = index_for(sender)
+    if index is not None:
+        index.delete([instance.pk], using=using)
+
+
+def index_batch(sender, instances, using, **kwargs):
+    index = index_for(sender)
+    if index is not None:
+        index.update([instance.pk for instance in instances], using=using)
@@ -0,0 +1,121 @@
+from datetime import date
+
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.batch import batch_created
+from jobs.models import Job
+from relocations.models import Relocation
+from .index import index_for
+
+
+def indexed_ids(model):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT rowid FROM {index_for(model).table} ORDER BY rowid')
+        return [row[0] for row in cursor.fetchall()]
+
+
+class SearchIndexSyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('mover', password='pass12345')
+
+    def relocation(self, **fields):
+        values = {'origin': 'Nairobi', 'destination': 'Mombasa', 'inventory': 'Boxes', 'moving_date': date(2026, 1, 5)}
+        values.update(fields)
+        return Relocation.objects.create(user=self.user, **values)
+
+    def search(self, query):
+        return list(index_for(Relocation).search(Relocation.objects.all(), query))
+
+    def test_save_indexes_new_and_changed_rows(self):
+        relocation = self.relocation()
+        self.assertEqual(self.search('nairobi'), [relocation])
+        relocation.origin = 'Kisumu'
+        relocation.save()
+        self.assertEqual(self.search('nairobi'), [])
+        self.assertEqual(self.search('kisumu'), [relocation])
+
+    def test_save_of_unindexed_fields_leaves_index_alone(self):
+        relocation = self.relocation()
+        # Change the stored row behind the index's back, then save an unrelated field
+        Relocation.objects.filter(pk=relocation.pk).update(origin='Kisumu')
+        relocation.origin = 'Kisumu'
+        relocation.status = 'booked'
+        relocation.save(update_fields=['status'])
+        self.assertEqual(self.search('nairobi'), [relocation])
+        relocation.save(update_fields=['origin', 'status'])
+        self.assertEqual(self.search('kisumu'), [relocation])
+
+    def test_delete_removes_row(self):
+        relocation = self.relocation()
+        pk = relocation.pk
+        relocation.delete()
+        self.assertNotIn(pk, indexed_ids(Relocation))
+
+    def test_batch_created_indexes_bulk_inserts(self):
+        created = Relocation.objects.bulk_create([
+            Relocation(user=self.user, origin=f'Town {n}', destination='Eldoret', inventory='Crates',
+                       moving_date=date(2026, 2, 1))
+            for n in range(3)
+        ])
+        self.assertEqual(self.search('eldoret'), [])
+        batch_created.send(sender=Relocation, instances=created, using='default')
+        self.assertCountEqual(self.search('eldoret'), created)
+
+    def test_unindexed_models_keep_fast_deletes(self):
+        self.assertFalse(post_delete.has_listeners(Job))
+        Job.objects.create(name='jobs.tests.record')
+        # A single DELETE, without loading the rows first
+        with self.assertNumQueries(1):
+            Job.objects.all().delete()
+
+
+class FullTextSearchFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('mover', password='pass12345')
+        moving_date = date(2026, 3, 1)
+        cls.in_inventory = Relocation.objects.create(
+            user=cls.user, origin='Nakuru', destination='Thika', inventory='Piano and boxes', moving_date=moving_date,
+        )
+        cls.in_destination = Relocation.objects.create(
+            user=cls.user, origin='Nakuru', destination='Piano Heights', inventory='Boxes', moving_date=moving_date,
+        )
+        cls.unrelated = Relocation.objects.create(
+            user=cls.user, origin='Nyeri', destination='Thika', inventory='Chairs', moving_date=moving_date,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ids(self, query, **params):
+        response = self.client.get('/api/relocations/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [row['id'] for row in data.get('results', data)]
+
+    def test_ranks_heavier_fields_first(self):
+        self.assertEqual(self.ids('piano'), [self.in_destination.pk, self.in_inventory.pk])
+
+    def test_matches_word_prefixes_of_every_term(self):
+        self.assertEqual(self.ids('pia box'), [self.in_destination.pk, self.in_inventory.pk])
+        self.assertEqual(self.ids('piano chairs'), [])
+
+    def test_explicit_ordering_wins(self):
+        self.assertEqual(self.ids('piano', ordering='created_at'), [self.in_inventory.pk, self.in_destination.pk])
+
+    def test_quotes_and_punctuation_are_not_match_syntax(self):
+        for query in ['"piano', 'piano"*', 'piano OR chairs', 'NEAR(piano', 'piano -boxes', "o'piano", '*', '()']:
+            with self.subTest(query=query):
+                ids = self.ids(query)
+                self.assertNotIn(self.unrelated.pk, ids)
+
+    def test_query_of_only_punctuation_matches_nothing(self):
+        self.assertEqual(self.ids('"*^:()'), [])
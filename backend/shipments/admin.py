@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Shipment
+from .models import Shipment, ShipmentEvent
 
 
 @admin.register(Shipment)
@@ -7,3 +7,10 @@ class ShipmentAdmin(admin.ModelAdmin):
     list_display = ('tracking_number', 'booking', 'status', 'current_location', 'estimated_delivery', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('tracking_number', 'booking__user__username')
+
+
+@admin.register(ShipmentEvent)
+class ShipmentEventAdmin(admin.ModelAdmin):
+    list_display = ('shipment', 'kind', 'status', 'location', 'recorded_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('shipment__tracking_number',)
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Max, Min, Q
+
+from core.metrics import metrics
+
+from .models import ShipmentStreamEvent
+from .serializers import ShipmentTrackingSerializer
+
+logger = logging.getLogger(__name__)
+
+Event = namedtuple('Event', 'id topics name data')
+
+# Events read per poll of the table
+TAIL_BATCH_SIZE = 500
+
+
+def tracking_topic(tracking_number):
+    return f'tracking:{tracking_number}'
+
+
+def booking_topic(booking_id):
+    return f'booking:{booking_id}'
+
+
+def topic_filter(topics):
+    condition = Q(pk__in=[])
+    for topic in topics:
+        kind, _, value = topic.partition(':')
+        if kind == 'tracking':
+            condition |= Q(tracking_number=value)
+        elif kind == 'booking' and value.isdigit():
+            condition |= Q(booking_id=int(value))
+    return condition
+
+
+def to_event(row):
+    return Event(row.id, frozenset((tracking_topic(row.tracking_number), booking_topic(row.booking_id))),
+                 row.name, row.data)
+
+
+class Subscriber:
+    """One stream's mailbox, drained on the event loop that opened it"""
+
+    def __init__(self, topics, loop, max_pending):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.queue = asyncio.Queue(max_pending)
+        self.overflowed = False
+        # Ids the stream's snapshot or replay already covers
+        self.covered = set()
+        self.registered_after = 0
+
+    def deliver(self, event):
+        if event.id in self.covered:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: end the stream and let the client resume from Last-Event-ID
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventHub:
+    """
+    Fan-out of shipment events to the open streams of this process. Events
+    are rows of ``shipment_stream_events``, written in the transaction of the
+    change they announce, so every process sees every change and event ids
+    survive restarts: a client can resume from its ``Last-Event-ID`` on any
+    worker. A tailer thread polls the table and hands each new event to the
+    subscribers whose topics overlap it, once.
+
+    Ids are assigned at insert but become visible at commit, so a lower id
+    can appear after a higher one. The tailer keeps reading above the first
+    missing id until it shows up, or for ``gap_timeout`` seconds in case its
+    transaction rolled back.
+    """
+
+    def __init__(self, poll_interval=0.5, gap_timeout=10, max_pending=100):
+        self.poll_interval = poll_interval
+        self.gap_timeout = gap_timeout
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._tailer = None
+        # Every event up to here has been handed out
+        self._cursor = 0
+
+    async def subscribe(self, topics):
+        """Register a subscriber on the running loop, starting this process's tailer if needed"""
+        if self._tailer is None:
+            await sync_to_async(self.start_tailer, thread_sensitive=False)()
+        subscriber = Subscriber(topics, asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            subscriber.registered_after = self._cursor
+            self._subscribers.add(subscriber)
+            metrics.gauge('shipment_events.subscribers', len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            metrics.gauge('shipment_events.subscribers', len(self._subscribers))
+
+    def backlog(self, subscriber, last_event_id):
+        """
+        The stored events ``subscriber`` missed since ``last_event_id``, or
+        ``None`` when the gap can no longer be replayed and the stream should
+        start from a snapshot; and the newest event id. Events the result
+        accounts for are not delivered to the subscriber again.
+        """
+        bounds = ShipmentStreamEvent.objects.aggregate(oldest=Min('id'), newest=Max('id'))
+        newest = bounds['newest'] or 0
+        # What the tailer may still hand out, but this read already reflects
+        subscriber.covered.update(ShipmentStreamEvent.objects.filter(
+            id__gt=subscriber.registered_after, id__lte=newest,
+        ).values_list('id', flat=True))
+        if last_event_id is None or last_event_id > newest:
+            # New client, or an id from another database
+            return None, newest
+        if bounds['oldest'] is not None and last_event_id < bounds['oldest'] - 1:
+            # Pruned since the client saw it
+            return None, newest
+        rows = list(ShipmentStreamEvent.objects.filter(
+            topic_filter(subscriber.topics), id__gt=last_event_id, id__lte=newest,
+        ).order_by('id')[:settings.SHIPMENT_EVENTS_MAX_REPLAY + 1])
+        if len(rows) > settings.SHIPMENT_EVENTS_MAX_REPLAY:
+            return None, newest
+        return [to_event(row) for row in rows], newest
+
+    def encode(self, data):
+        return json.dumps(data, cls=DjangoJSONEncoder)
+
+    def start_tailer(self):
+        with self._lock:
+            if self._tailer is not None:
+                return
+            self._cursor = ShipmentStreamEvent.objects.aggregate(newest=Max('id'))['newest'] or 0
+            self._tailer = threading.Thread(target=self.tail, name='shipment-events', daemon=True)
+            self._tailer.start()
+
+    def tail(self):
+        delivered = set()
+        missing = {}
+        while True:
+            try:
+                rows = list(ShipmentStreamEvent.objects.filter(id__gt=self._cursor).order_by('id')[:TAIL_BATCH_SIZE])
+                for row in rows:
+                    if row.id not in delivered:
+                        delivered.add(row.id)
+                        self.dispatch(to_event(row))
+                self.advance(delivered, missing)
+            except Exception:
+                logger.exception('Reading shipment events failed')
+                connections.close_all()
+                rows = []
+            if len(rows) < TAIL_BATCH_SIZE:
+                time.sleep(self.poll_interval)
+
+    def advance(self, delivered, missing):
+        """Move the cursor past delivered ids, and past missing ones given up on"""
+        if not delivered:
+            return
+        now = time.monotonic()
+        cursor = self._cursor
+        for event_id in range(cursor + 1, max(delivered)):
+            if event_id not in delivered:
+                missing.setdefault(event_id, now)
+        while cursor + 1 in delivered or now - missing.get(cursor + 1, now) >= self.gap_timeout:
+            cursor += 1
+            delivered.discard(cursor)
+            missing.pop(cursor, None)
+        with self._lock:
+            self._cursor = cursor
+
+    def dispatch(self, event):
+        with self._lock:
+            subscribers = [s for s in self._subscribers if s.topics & event.topics]
+        metrics.incr('shipment_events.published')
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscriber)
+
+
+hub = EventHub(
+    poll_interval=settings.SHIPMENT_EVENTS_POLL_INTERVAL,
+    max_pending=settings.SHIPMENT_EVENTS_MAX_PENDING,
+)
+
+
+def shipment_event_data(shipment):
+    data = dict(ShipmentTrackingSerializer(shipment).data)
+    data['booking'] = shipment.booking_id
+    return data
+
+
+def shipment_change_event(shipment):
+    """The unsaved event announcing a new status or location, or None when neither changed"""
+    position = (shipment.status, shipment.current_location)
+    if getattr(shipment, '_stored_position', None) == position:
+        return None
+    shipment._stored_position = position
+    return ShipmentStreamEvent(
+        tracking_number=shipment.tracking_number,
+        booking_id=shipment.booking_id,
+        name='status',
+        data=hub.encode(shipment_event_data(shipment)),
+    )
+
+
+def publish_shipment_change(shipment):
+    """Announce a new status or location to the shipment's streams, in the transaction of the save"""
+    event = shipment_change_event(shipment)
+    if event is not None:
+        event.save()
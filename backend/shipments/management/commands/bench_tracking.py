@@ -0,0 +1,74 @@
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from accounts.tokens import PrincipalRefreshToken
+from core.metrics import percentile
+from shipments.models import Shipment
+
+
+class Command(BaseCommand):
+    help = (
+        'Poll the tracking endpoint the way tracking pages do and report p50/p99 latency, '
+        'next to the full shipment detail for comparison. Start the server first, e.g. '
+        '`manage.py runserver 8000`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the deployment')
+        parser.add_argument('--username', default='admin', help='User whose token the clients send')
+        parser.add_argument('--shipments', type=int, default=20, help='Distinct tracking numbers polled')
+        parser.add_argument('--concurrency', default='8,32,64', help='Comma-separated client counts')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint and client count')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f"No user named {options['username']!r}")
+        shipments = list(Shipment.objects.values_list('id', 'tracking_number')[:options['shipments']])
+        if not shipments:
+            raise CommandError('No shipments to track')
+        token = str(PrincipalRefreshToken.for_user(user).access_token)
+
+        base = options['url']
+        endpoints = (
+            ('track', [
+                f"{base}/api/shipments/track/?{urllib.parse.urlencode({'tracking_number': number})}"
+                for _, number in shipments
+            ]),
+            ('detail', [f"{base}/api/shipments/{pk}/" for pk, _ in shipments]),
+        )
+
+        self.stdout.write(f"{'endpoint':<8} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>6} {'errors':>6}")
+        for concurrency in [int(c) for c in options['concurrency'].split(',')]:
+            for label, urls in endpoints:
+                elapsed, latencies, size, errors = self.run(urls, token, concurrency, options['requests'])
+                self.stdout.write(
+                    f"{label:<8} {concurrency:>7} {options['requests'] / elapsed:>8.1f} "
+                    f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} "
+                    f"{size:>6} {errors:>6}"
+                )
+
+    def run(self, urls, token, concurrency, total):
+        def fetch(i):
+            request = urllib.request.Request(urls[i % len(urls)], headers={'Authorization': f'Bearer {token}'})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    size = len(response.read())
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                size, ok = 0, False
+            return time.perf_counter() - started, size, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(total)))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, _, _ in results)
+        return elapsed, latencies, max(size for _, size, _ in results), sum(not ok for _, _, ok in results)
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from shipments.models import ShipmentStreamEvent
+
+
+class Command(BaseCommand):
+    help = 'Delete shipment stream events older than SHIPMENT_EVENTS_RETENTION seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=int, default=settings.SHIPMENT_EVENTS_RETENTION)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['seconds'])
+        deleted, _ = ShipmentStreamEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} shipment stream events'))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shipments', '0002_shipment_shipments_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShipmentEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ping', 'Location Ping'), ('status', 'Status Update')], default='ping', max_length=10)),
+                ('status', models.CharField(blank=True, choices=[('preparing', 'Preparing'), ('in_transit', 'In Transit'), ('out_for_delivery', 'Out for Delivery'), ('delivered', 'Delivered'), ('delayed', 'Delayed')], max_length=20, null=True)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('recorded_at', models.DateTimeField(help_text='When the device or user observed it')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('shipment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='shipments.shipment')),
+            ],
+            options={
+                'db_table': 'shipment_events',
+                'ordering': ['recorded_at', 'id'],
+                'indexes': [models.Index(fields=['shipment', 'recorded_at'], name='shipment_events_time_idx')],
+            },
+        ),
+    ]
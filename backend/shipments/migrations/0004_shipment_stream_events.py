@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shipments', '0003_shipmentevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShipmentStreamEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tracking_number', models.CharField(max_length=100)),
+                ('booking_id', models.BigIntegerField()),
+                ('name', models.CharField(max_length=20)),
+                ('data', models.TextField(help_text='JSON payload, as sent to streams')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'shipment_stream_events',
+                'indexes': [models.Index(fields=['tracking_number', 'id'], name='stream_events_tracking_idx'), models.Index(fields=['booking_id', 'id'], name='stream_events_booking_idx')],
+            },
+        ),
+    ]
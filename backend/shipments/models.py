@@ -24,6 +24,72 @@ class Shipment(models.Model):
     class Meta:
         db_table = 'shipments'
         ordering = ['-created_at']
+        # Keyset pagination scans (created_at, id); role filters go through the unique booking key
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='shipments_created_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the cache key the tracking payload is stored under
+        if 'tracking_number' in field_names:
+            instance._stored_tracking_number = instance.tracking_number
+        # and the position last announced to event streams
+        if 'status' in field_names and 'current_location' in field_names:
+            instance._stored_position = (instance.status, instance.current_location)
+        return instance
     
     def __str__(self):
         return f"Shipment {self.tracking_number}: {self.status}"
+
+
+class ShipmentEvent(models.Model):
+    """Append-only history of a shipment's position and status"""
+    KIND_CHOICES = [
+        ('ping', 'Location Ping'),
+        ('status', 'Status Update'),
+    ]
+    
+    shipment = models.ForeignKey(Shipment, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='ping')
+    status = models.CharField(max_length=20, choices=Shipment.STATUS_CHOICES, null=True, blank=True)
+    location = models.CharField(max_length=255, null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    recorded_at = models.DateTimeField(help_text='When the device or user observed it')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'shipment_events'
+        ordering = ['recorded_at', 'id']
+        # History reads scan one shipment's time range
+        indexes = [
+            models.Index(fields=['shipment', 'recorded_at'], name='shipment_events_time_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.shipment_id} {self.kind} at {self.recorded_at}"
+
+
+class ShipmentStreamEvent(models.Model):
+    """
+    A change announced to shipment event streams, written in the transaction
+    that made it. Ids are the stream's event ids, shared by every process.
+    """
+    tracking_number = models.CharField(max_length=100)
+    booking_id = models.BigIntegerField()
+    name = models.CharField(max_length=20)
+    data = models.TextField(help_text='JSON payload, as sent to streams')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'shipment_stream_events'
+        # Resuming streams replay one topic's events after an id
+        indexes = [
+            models.Index(fields=['tracking_number', 'id'], name='stream_events_tracking_idx'),
+            models.Index(fields=['booking_id', 'id'], name='stream_events_booking_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.id} {self.name} {self.tracking_number}"
@@ -1,16 +1,49 @@
 from rest_framework import serializers
-from .models import Shipment
+from .models import Shipment, ShipmentEvent
 from bookings.serializers import BookingSerializer
+from core.serializers import ExpandableFieldsMixin
 
 
-class ShipmentSerializer(serializers.ModelSerializer):
-    booking = BookingSerializer(read_only=True)
-    
+class ShipmentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Shipment
         fields = ('id', 'booking', 'tracking_number', 'status', 'current_location', 
                   'estimated_delivery', 'actual_delivery', 'notes', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        expandable_fields = {'booking': BookingSerializer}
+
+    query_plan = BookingSerializer.query_plan.nested('booking')
+
+
+class ShipmentTrackingSerializer(serializers.ModelSerializer):
+    """What a tracking page polls for; no booking, user or provider data"""
+    class Meta:
+        model = Shipment
+        fields = ('tracking_number', 'status', 'current_location',
+                  'estimated_delivery', 'actual_delivery', 'updated_at')
+
+
+class ShipmentPingSerializer(serializers.Serializer):
+    """One telematics reading for a shipment"""
+    tracking_number = serializers.CharField(max_length=100)
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    location = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    status = serializers.ChoiceField(choices=Shipment.STATUS_CHOICES, required=False)
+    recorded_at = serializers.DateTimeField()
+
+
+class ShipmentStatusUpdateSerializer(serializers.Serializer):
+    """One entry of a bulk status update"""
+    tracking_number = serializers.CharField(max_length=100)
+    status = serializers.ChoiceField(choices=Shipment.STATUS_CHOICES)
+    current_location = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+
+
+class ShipmentEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ShipmentEvent
+        fields = ('kind', 'status', 'location', 'latitude', 'longitude', 'recorded_at')
 
 
 class ShipmentCreateSerializer(serializers.ModelSerializer):
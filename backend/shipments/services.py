@@ -0,0 +1,128 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .events import shipment_change_event
+from .models import Shipment, ShipmentEvent, ShipmentStreamEvent
+from .serializers import ShipmentTrackingSerializer
+from .tracking import refresh_tracking
+
+# Columns a shipment must be loaded with for bulk writes and announcements
+STATE_FIELDS = ShipmentTrackingSerializer.Meta.fields + ('booking',)
+
+
+def announce_changes(shipments):
+    """What the post_save signal does, for shipments written with bulk_update or update()"""
+    events = []
+    for shipment in shipments:
+        refresh_tracking(shipment)
+        event = shipment_change_event(shipment)
+        if event is not None:
+            events.append(event)
+    ShipmentStreamEvent.objects.bulk_create(events, batch_size=500)
+
+
+def ingest_pings(pings):
+    """
+    Append ``pings`` (validated ping dicts carrying their ``shipment``) to
+    the event history and move every shipment to its newest reading, in one
+    transaction. Readings older than the shipment's latest recorded event
+    are kept in the history but do not overwrite its current state.
+    """
+    shipments = {ping['shipment'].pk: ping['shipment'] for ping in pings}
+    newest = {}
+    for ping in pings:
+        current = newest.get(ping['shipment'].pk)
+        if current is None or ping['recorded_at'] >= current['recorded_at']:
+            newest[ping['shipment'].pk] = ping
+
+    with transaction.atomic():
+        latest_recorded = dict(
+            ShipmentEvent.objects.filter(shipment_id__in=shipments).values('shipment_id').annotate(
+                latest=Max('recorded_at'),
+            ).values_list('shipment_id', 'latest')
+        )
+        ShipmentEvent.objects.bulk_create([
+            ShipmentEvent(
+                shipment=ping['shipment'],
+                kind='ping',
+                status=ping.get('status'),
+                location=ping.get('location') or None,
+                latitude=ping['latitude'],
+                longitude=ping['longitude'],
+                recorded_at=ping['recorded_at'],
+            )
+            for ping in pings
+        ], batch_size=500)
+
+        now = timezone.now()
+        changed = []
+        for shipment_id, ping in newest.items():
+            latest = latest_recorded.get(shipment_id)
+            if latest is not None and ping['recorded_at'] < latest:
+                continue
+            shipment = shipments[shipment_id]
+            shipment.current_location = ping.get('location') or f"{ping['latitude']:.5f}, {ping['longitude']:.5f}"
+            if ping.get('status'):
+                shipment.status = ping['status']
+            shipment.updated_at = now
+            changed.append(shipment)
+        Shipment.objects.bulk_update(changed, ['status', 'current_location', 'updated_at'], batch_size=500)
+        announce_changes(changed)
+    return changed
+
+
+def downsample(events, interval):
+    """
+    Keep the last reading in each ``interval``-second window, plus every
+    status update. ``events`` must be ordered by ``recorded_at``.
+    """
+    if not interval:
+        yield from events
+        return
+    pending = None
+    pending_bucket = None
+    for event in events:
+        bucket = int(event['recorded_at'].timestamp() // interval)
+        if pending is not None and bucket != pending_bucket:
+            yield pending
+            pending = None
+        if event['kind'] == 'status':
+            if pending is not None:
+                yield pending
+                pending = None
+            yield event
+            continue
+        pending, pending_bucket = event, bucket
+    if pending is not None:
+        yield pending
+
+
+def apply_status_updates(updates):
+    """
+    Apply ``(shipment, status, current_location)`` updates in one
+    transaction: shipments ending in the same state share one UPDATE, and
+    every change is appended to the history as a status event.
+    """
+    now = timezone.now()
+    groups = defaultdict(list)
+    for shipment, status, current_location in updates:
+        shipment.status = status
+        if current_location:
+            shipment.current_location = current_location
+        shipment.updated_at = now
+        groups[(shipment.status, shipment.current_location)].append(shipment.pk)
+
+    with transaction.atomic():
+        for (status, current_location), ids in groups.items():
+            Shipment.objects.filter(pk__in=ids).update(status=status, current_location=current_location, updated_at=now)
+        ShipmentEvent.objects.bulk_create([
+            ShipmentEvent(
+                shipment=shipment, kind='status', status=shipment.status,
+                location=shipment.current_location, recorded_at=now,
+            )
+            for shipment, _, _ in updates
+        ], batch_size=500)
+        announce_changes([shipment for shipment, _, _ in updates])
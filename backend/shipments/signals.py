@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .events import publish_shipment_change
+from .models import Shipment
+from .tracking import invalidate_tracking, refresh_tracking
+
+
+@receiver(post_save, sender=Shipment)
+def shipment_saved(sender, instance, **kwargs):
+    refresh_tracking(instance)
+    publish_shipment_change(instance)
+
+
+@receiver(post_delete, sender=Shipment)
+def shipment_deleted(sender, instance, **kwargs):
+    invalidate_tracking(instance.tracking_number)
@@ -0,0 +1,115 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from accounts.authentication import QueryTokenJWTAuthentication
+from bookings.views import BookingViewSet
+from .events import booking_topic, hub, shipment_event_data, tracking_topic
+from .models import Shipment
+from .tracking import get_tracking
+
+# Milliseconds the browser waits before reconnecting a dropped stream
+RECONNECT_DELAY = 3000
+
+
+def format_event(event_id, name, data):
+    return f'id: {event_id}\nevent: {name}\ndata: {data}\n\n'
+
+
+class ShipmentEventStreamView(View):
+    """
+    Server-Sent Events for shipment status and location changes, served by
+    the ASGI application. Subscribe with ``?tracking_number=`` (anyone who
+    can call ``track``) or ``?booking=`` (anyone who can see the booking).
+    A new stream starts with a ``snapshot`` event; a reconnecting one
+    replays what it missed since ``Last-Event-ID``, on any worker, or gets
+    a fresh snapshot when that is no longer stored.
+    """
+    http_method_names = ['get']
+
+    async def get(self, request):
+        try:
+            topic, snapshot = await sync_to_async(self.authorize)(request)
+        except exceptions.APIException as exc:
+            return self.error_response(exc)
+        response = StreamingHttpResponse(
+            self.stream(topic, snapshot, self.get_last_event_id(request)),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def authorize(self, request):
+        """The topic ``request`` may subscribe to, and a loader for its current state"""
+        drf_request = Request(request, authenticators=[QueryTokenJWTAuthentication()])
+        if not drf_request.user or not drf_request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+
+        tracking_number = request.GET.get('tracking_number')
+        booking_id = request.GET.get('booking')
+        if tracking_number:
+            if get_tracking(tracking_number) is None:
+                raise exceptions.NotFound('Shipment not found')
+            return tracking_topic(tracking_number), lambda: get_tracking(tracking_number)
+        if booking_id:
+            bookings = BookingViewSet(request=drf_request, action='retrieve', format_kwarg=None, kwargs={})
+            if not booking_id.isdigit() or not bookings.get_queryset().filter(pk=booking_id).exists():
+                raise exceptions.NotFound('Booking not found')
+
+            def snapshot():
+                shipment = Shipment.objects.filter(booking_id=booking_id).first()
+                return shipment_event_data(shipment) if shipment is not None else None
+            return booking_topic(booking_id), snapshot
+        raise exceptions.ValidationError({'error': 'tracking_number or booking required'})
+
+    def get_last_event_id(self, request):
+        value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        try:
+            return int(value) if value else None
+        except ValueError:
+            return None
+
+    async def stream(self, topic, snapshot, last_event_id):
+        # Subscribe before reading the snapshot so no change slips in between
+        subscriber = await hub.subscribe([topic])
+        try:
+            backlog, last_id = await sync_to_async(hub.backlog)(subscriber, last_event_id)
+            yield f'retry: {RECONNECT_DELAY}\n\n'
+            if backlog is None:
+                data = await sync_to_async(snapshot)()
+                if data is not None:
+                    yield format_event(last_id, 'snapshot', hub.encode(data))
+            else:
+                for event in backlog:
+                    yield format_event(event.id, event.name, event.data)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.SHIPMENT_EVENTS_MAX_STREAM_SECONDS
+            while True:
+                timeout = min(settings.SHIPMENT_EVENTS_HEARTBEAT, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if event is None:
+                    break
+                yield format_event(event.id, event.name, event.data)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    def error_response(self, exc):
+        data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+        response = JsonResponse(data, status=exc.status_code)
+        if isinstance(exc, exceptions.NotAuthenticated):
+            response['WWW-Authenticate'] = 'Bearer realm="api"'
+        return response
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.metrics import metrics
+
+from .models import Shipment
+from .serializers import ShipmentTrackingSerializer
+
+# Cached for unknown tracking numbers so polling a typo does not hit the database
+NOT_FOUND = 'not-found'
+NOT_FOUND_TIMEOUT = 30
+
+
+def tracking_key(tracking_number):
+    return f'tracking:{tracking_number}'
+
+
+def get_tracking(tracking_number):
+    """
+    The tracking payload for ``tracking_number``, or ``None`` when no shipment
+    has it. Read through the cache; a miss loads only the tracked columns.
+    """
+    key = tracking_key(tracking_number)
+    payload = cache.get(key)
+    if payload is not None:
+        metrics.incr('tracking.cache_hit')
+        return None if payload == NOT_FOUND else payload
+
+    metrics.incr('tracking.cache_miss')
+    shipment = Shipment.objects.only(*ShipmentTrackingSerializer.Meta.fields).filter(
+        tracking_number=tracking_number,
+    ).first()
+    if shipment is None:
+        cache.set(key, NOT_FOUND, NOT_FOUND_TIMEOUT)
+        return None
+    return store_tracking(shipment)
+
+
+def store_tracking(shipment):
+    payload = dict(ShipmentTrackingSerializer(shipment).data)
+    cache.set(tracking_key(shipment.tracking_number), payload, settings.TRACKING_CACHE_TIMEOUT)
+    return payload
+
+
+def refresh_tracking(shipment):
+    """Rewrite the cached payload once the surrounding transaction commits"""
+    previous = getattr(shipment, '_stored_tracking_number', None)
+    if previous and previous != shipment.tracking_number:
+        invalidate_tracking(previous)
+    shipment._stored_tracking_number = shipment.tracking_number
+    transaction.on_commit(lambda: store_tracking(shipment))
+
+
+def invalidate_tracking(tracking_number):
+    transaction.on_commit(lambda: cache.delete(tracking_key(tracking_number)))
@@ -1,10 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .streams import ShipmentEventStreamView
 from .views import ShipmentViewSet
 
 router = DefaultRouter()
 router.register(r'', ShipmentViewSet, basename='shipment')
 
 urlpatterns = [
+    # Ahead of the router, whose detail route would otherwise match 'events'
+    path('events/', ShipmentEventStreamView.as_view(), name='shipment-events'),
     path('', include(router.urls)),
 ]
@@ -1,12 +1,41 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Shipment
-from .serializers import ShipmentSerializer, ShipmentCreateSerializer
+from core.pagination import PaginationModeMixin
+from accounts.permissions import IsServiceProviderOrAdministrator
+from accounts.principal import get_principal
+from core.conditional import ConditionalViewSetMixin
+from core.exports import ExportMixin
+from core.query_plans import QueryPlanMixin
+from .models import Shipment, ShipmentEvent
+from .serializers import (
+    ShipmentSerializer, ShipmentCreateSerializer, ShipmentEventSerializer, ShipmentPingSerializer,
+    ShipmentStatusUpdateSerializer,
+)
+from .services import STATE_FIELDS, apply_status_updates, downsample, ingest_pings
+from .tracking import get_tracking
 
 
-class ShipmentViewSet(viewsets.ModelViewSet):
+class ShipmentViewSet(ConditionalViewSetMixin, QueryPlanMixin, PaginationModeMixin, ExportMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    query_plan = ShipmentSerializer.query_plan
+    export_fields = {
+        'id': 'id',
+        'booking_id': 'booking_id',
+        'tracking_number': 'tracking_number',
+        'customer': 'booking__user__username',
+        'service_provider': 'booking__service_provider__company_name',
+        'status': 'status',
+        'current_location': 'current_location',
+        'estimated_delivery': 'estimated_delivery',
+        'actual_delivery': 'actual_delivery',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -14,18 +43,15 @@ class ShipmentViewSet(viewsets.ModelViewSet):
         return ShipmentSerializer
     
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return Shipment.objects.all()
-        elif user.user_type == 'service_provider':
-            from accounts.models import ServiceProvider
-            try:
-                service_provider = ServiceProvider.objects.get(user=user)
-                return Shipment.objects.filter(booking__service_provider=service_provider)
-            except ServiceProvider.DoesNotExist:
+        elif principal.is_service_provider:
+            if principal.service_provider_id is None:
                 return Shipment.objects.none()
+            return Shipment.objects.filter(booking__service_provider_id=principal.service_provider_id)
         else:
-            return Shipment.objects.filter(booking__user=user)
+            return Shipment.objects.filter(booking__user_id=principal.user_id)
     
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
@@ -38,7 +64,13 @@ class ShipmentViewSet(viewsets.ModelViewSet):
             shipment.status = new_status
             if current_location:
                 shipment.current_location = current_location
-            shipment.save()
+            with transaction.atomic():
+                shipment.save()
+                ShipmentEvent.objects.create(
+                    shipment=shipment, kind='status', status=shipment.status,
+                    location=shipment.current_location, recorded_at=shipment.updated_at,
+                )
+            # The save refreshes the cached tracking payload
             return Response({'message': 'Status updated successfully'})
         return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
     
@@ -47,10 +79,124 @@ class ShipmentViewSet(viewsets.ModelViewSet):
         """Track shipment by tracking number"""
         tracking_number = request.query_params.get('tracking_number')
         if tracking_number:
-            try:
-                shipment = Shipment.objects.get(tracking_number=tracking_number)
-                serializer = self.get_serializer(shipment)
-                return Response(serializer.data)
-            except Shipment.DoesNotExist:
+            payload = get_tracking(tracking_number)
+            if payload is None:
                 return Response({'error': 'Shipment not found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(payload)
         return Response({'error': 'Tracking number required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsServiceProviderOrAdministrator])
+    def pings(self, request):
+        """Ingest a batch of location pings for any number of shipments"""
+        batch = self.resolve_batch(request, 'pings', ShipmentPingSerializer, settings.SHIPMENT_PINGS_MAX_BATCH)
+        if isinstance(batch, Response):
+            return batch
+        accepted, results = batch
+        if accepted:
+            ingest_pings([dict(ping, shipment=shipment) for shipment, ping in accepted])
+        return self.batch_response(accepted, results, status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsServiceProviderOrAdministrator])
+    def bulk_update_status(self, request):
+        """Update the status of many shipments at once (for service providers)"""
+        batch = self.resolve_batch(
+            request, 'updates', ShipmentStatusUpdateSerializer, settings.SHIPMENT_STATUS_MAX_BATCH, unique=True,
+        )
+        if isinstance(batch, Response):
+            return batch
+        accepted, results = batch
+        if accepted:
+            apply_status_updates([
+                (shipment, update['status'], update.get('current_location'))
+                for shipment, update in accepted
+            ])
+        return self.batch_response(accepted, results)
+    
+    def resolve_batch(self, request, key, serializer_class, max_batch, unique=False):
+        """
+        Validate every entry of ``request.data[key]`` and resolve their
+        tracking numbers within the caller's shipments in one query. Returns
+        ``(accepted, results)``, where ``accepted`` pairs each valid entry
+        with its shipment and ``results`` has one outcome per entry.
+        """
+        items = request.data.get(key) if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'error': f'{key} must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > max_batch:
+            return Response({'error': f'At most {max_batch} {key} per request'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = []
+        valid = []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+                results.append({'index': index, 'accepted': True})
+            else:
+                results.append({'index': index, 'accepted': False, 'errors': serializer.errors})
+        
+        numbers = {entry['tracking_number'] for _, entry in valid}
+        shipments = {
+            shipment.tracking_number: shipment
+            for shipment in self.get_queryset().filter(tracking_number__in=numbers).only(*STATE_FIELDS)
+        }
+        accepted = []
+        seen = set()
+        for index, entry in valid:
+            number = entry['tracking_number']
+            if number not in shipments:
+                error = 'Shipment not found'
+            elif unique and number in seen:
+                error = 'Duplicate tracking number in this request'
+            else:
+                seen.add(number)
+                accepted.append((shipments[number], entry))
+                continue
+            results[index] = {'index': index, 'accepted': False, 'errors': {'tracking_number': [error]}}
+        return accepted, results
+    
+    def batch_response(self, accepted, results, success_status=status.HTTP_200_OK):
+        return Response({
+            'accepted': len(accepted),
+            'rejected': len(results) - len(accepted),
+            'results': results,
+        }, status=success_status if accepted else status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Location and status history, one point per interval"""
+        shipment = self.get_object()
+        params = request.query_params
+        try:
+            interval = max(0, int(params.get('interval', settings.SHIPMENT_HISTORY_INTERVAL)))
+        except ValueError:
+            return Response({'error': 'interval must be a number of seconds'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        events = shipment.events.order_by('recorded_at', 'id')
+        for param, lookup in (('since', 'recorded_at__gte'), ('until', 'recorded_at__lt')):
+            if params.get(param):
+                try:
+                    value = parse_datetime(params[param])
+                except ValueError:
+                    # Well formed but impossible, like 2024-02-30T00:00:00
+                    value = None
+                if value is None:
+                    return Response({'error': f'{param} must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+                if timezone.is_naive(value):
+                    value = timezone.make_aware(value)
+                events = events.filter(**{lookup: value})
+        
+        rows = events.values(*ShipmentEventSerializer.Meta.fields).iterator(chunk_size=2000)
+        points = []
+        truncated = False
+        for point in downsample(rows, interval):
+            if len(points) == settings.SHIPMENT_HISTORY_MAX_POINTS:
+                truncated = True
+                break
+            points.append(point)
+        return Response({
+            'tracking_number': shipment.tracking_number,
+            'interval': interval,
+            'truncated': truncated,
+            'points': ShipmentEventSerializer(points, many=True).data,
+        })
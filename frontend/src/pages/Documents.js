@@ -49,6 +49,21 @@ const Documents = () => {
     }
   };
 
+  const viewDocument = async (doc) => {
+    // The download endpoint needs the Authorization header, which a plain link cannot send
+    const viewer = window.open('', '_blank');
+    try {
+      const response = await axios.get(doc.file_url, { responseType: 'blob' });
+      const url = URL.createObjectURL(response.data);
+      viewer.location.href = url;
+      setTimeout(() => URL.revokeObjectURL(url), 60000);
+    } catch (error) {
+      viewer.close();
+      console.error('Error opening document:', error);
+      alert('Error opening document');
+    }
+  };
+
   const handleChange = (e) => {
     if (e.target.name === 'file') {
       setFormData({ ...formData, file: e.target.files[0] });
@@ -140,9 +155,9 @@ const Documents = () => {
                   <td>{new Date(doc.uploaded_at).toLocaleDateString()}</td>
                   <td>
                     {doc.file_url && (
-                      <a href={doc.file_url} target="_blank" rel="noopener noreferrer" className="btn btn-primary btn-sm">
+                      <button onClick={() => viewDocument(doc)} className="btn btn-primary btn-sm">
                         View
-                      </a>
+                      </button>
                     )}
                   </td>
                 </tr>
@@ -64,8 +64,8 @@ const Relocations = () => {
 
   const calculateQuotation = async (relocationId) => {
     try {
-      await axios.post(`/api/relocations/${relocationId}/calculate_quotation/`);
-      toast.success('Quotation calculated!');
+      const response = await axios.post(`/api/relocations/${relocationId}/calculate_quotation/`);
+      toast.success(`Estimated cost: $${response.data.estimated_cost}`);
       fetchRelocations();
     } catch (error) {
       toast.error('Error calculating quotation');